@@ -0,0 +1,132 @@
+"""
+Audit analytics from hourly aggregates.
+
+Every audit record written (see apps.adminpanel.audit) also adds to two
+aggregate tables, one bucket per hour and department: AuditEndpointHour per
+endpoint and AuditUserHour per user. The analytics endpoints sum those
+buckets over the requested range, so a month of traffic is at most a few
+thousand rows per department however many requests it held, and the raw
+AuditLog table is never grouped.
+
+Buckets are incremented with `UPDATE ... SET requests = requests + n`, as
+the task counters are (apps.tasks.stats). The department is the caller's at
+the time of the request; `rebuild()` recomputes a range from the raw rows,
+using the users' current departments.
+"""
+import re
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+
+from .models import AuditEndpointHour, AuditLog, AuditUserHour
+
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_for(action):
+    """Group an action by route: "GET /api/tasks/42/" -> "GET /api/tasks/{id}/"."""
+    return _ID_SEGMENT.sub('/{id}', action)
+
+
+def hour_of(timestamp):
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def record(rows):
+    """Add `rows` of (timestamp, dept id, user id, action, status code, duration ms) to the buckets."""
+    requests, errors, durations, users = Counter(), Counter(), Counter(), Counter()
+    for timestamp, dept_id, user_id, action, status_code, duration_ms in rows:
+        hour, dept = hour_of(timestamp), dept_id or 0
+        key = (hour, dept, endpoint_for(action))
+        requests[key] += 1
+        if status_code is not None and status_code >= 400:
+            errors[key] += 1
+        durations[key] += duration_ms or 0
+        if user_id:
+            users[(hour, dept, user_id)] += 1
+
+    for (hour, dept, endpoint), count in requests.items():
+        _increment(
+            AuditEndpointHour, {'hour': hour, 'dept': dept, 'endpoint': endpoint},
+            requests=count, errors=errors[(hour, dept, endpoint)],
+            total_duration_ms=durations[(hour, dept, endpoint)],
+        )
+    for (hour, dept, user_id), count in users.items():
+        _increment(AuditUserHour, {'hour': hour, 'dept': dept, 'user': user_id}, requests=count)
+
+
+def _increment(model, key, **amounts):
+    bucket = model.objects.filter(**key)
+    if bucket.update(**{name: F(name) + amount for name, amount in amounts.items()}):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **amounts)
+    except IntegrityError:
+        # Another writer created the bucket first
+        bucket.update(**{name: F(name) + amount for name, amount in amounts.items()})
+
+
+def rebuild(start, end, batch_size=5000):
+    """Recompute the buckets of the hours in [start, end) from the raw audit log."""
+    start = hour_of(start)
+    with transaction.atomic():
+        AuditEndpointHour.objects.filter(hour__gte=start, hour__lt=end).delete()
+        AuditUserHour.objects.filter(hour__gte=start, hour__lt=end).delete()
+        rows = (
+            AuditLog.objects.filter(timestamp__gte=start, timestamp__lt=end).order_by()
+            .values_list('timestamp', 'user__department_id', 'user_id', 'action', 'status_code', 'duration_ms')
+        )
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                record(batch)
+                batch = []
+        record(batch)
+
+
+def _buckets(model, start, end, dept=None):
+    buckets = model.objects.filter(hour__gte=hour_of(start), hour__lt=end)
+    if dept is not None:
+        buckets = buckets.filter(dept=dept)
+    return buckets.order_by()
+
+
+def top_endpoints(start, end, dept=None, limit=10):
+    rows = (
+        _buckets(AuditEndpointHour, start, end, dept).values('endpoint')
+        .annotate(requests=Sum('requests'), errors=Sum('errors'), duration=Sum('total_duration_ms'))
+        .order_by('-requests', 'endpoint')[:limit]
+    )
+    return [
+        {
+            'endpoint': row['endpoint'], 'requests': row['requests'], 'errors': row['errors'],
+            'avg_duration_ms': round(row['duration'] / row['requests'], 1),
+        }
+        for row in rows
+    ]
+
+
+def top_users(start, end, dept=None, limit=10):
+    rows = list(
+        _buckets(AuditUserHour, start, end, dept).values('user')
+        .annotate(requests=Sum('requests')).order_by('-requests', 'user')[:limit]
+    )
+    emails = dict(
+        get_user_model().objects.filter(id__in=[row['user'] for row in rows]).values_list('id', 'email')
+    )
+    return [
+        {'user_id': row['user'], 'email': emails.get(row['user']), 'requests': row['requests']}
+        for row in rows
+    ]
+
+
+def requests_per_hour(start, end, dept=None):
+    rows = (
+        _buckets(AuditEndpointHour, start, end, dept).values('hour')
+        .annotate(requests=Sum('requests'), errors=Sum('errors')).order_by('hour')
+    )
+    return [{'hour': row['hour'], 'requests': row['requests'], 'errors': row['errors']} for row in rows]
@@ -0,0 +1,121 @@
+"""
+Buffered AuditLog writes.
+
+`AuditLogMiddleware` hands every record to `writer.append()`, which only adds
+it to an in-memory buffer. A background thread writes the buffer with
+`bulk_create` once AUDIT_LOG_BATCH_SIZE records are waiting or every
+AUDIT_LOG_FLUSH_INTERVAL seconds, and whatever is left is written when the
+process exits. The buffer holds at most AUDIT_LOG_BUFFER_SIZE records; when
+it is full (the database is slow or down) records are written synchronously
+instead, so the log is never silently truncated.
+
+Records are also written synchronously when the caller is inside a
+transaction (ATOMIC_REQUESTS, tests): the flush thread uses its own
+connection and could not see rows, such as a new user, that are not
+committed yet. AUDIT_LOG_BUFFER_SIZE = 0 turns buffering off.
+
+Whichever way a record is written, it is also added to the hourly
+analytics aggregates (apps.adminpanel.analytics).
+"""
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from . import analytics
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+class AuditLogWriter:
+    def __init__(self):
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self.written = 0
+        self.overflowed = 0     # records written synchronously because the buffer was full
+        self.failed = 0
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def append(self, record, dept_id=None):
+        """Queue `record`; `dept_id` is the caller's department, for the analytics."""
+        capacity = settings.AUDIT_LOG_BUFFER_SIZE
+        if capacity <= 0 or self._stopping or connection.in_atomic_block:
+            self._write_now(record, dept_id)
+            return
+        with self._lock:
+            full = len(self._buffer) >= capacity
+            if not full:
+                self._buffer.append((record, dept_id))
+                batch_ready = len(self._buffer) >= settings.AUDIT_LOG_BATCH_SIZE
+        if full:
+            self.overflowed += 1
+            self._write_now(record, dept_id)
+            return
+        self._ensure_thread()
+        if batch_ready:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write everything buffered so far; returns the number of records written."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+        try:
+            AuditLog.objects.bulk_create([record for record, _ in batch], batch_size=settings.AUDIT_LOG_BATCH_SIZE)
+        except Exception:
+            self.failed += len(batch)
+            logger.exception("Dropped %d audit log record(s)", len(batch))
+            return 0
+        self.written += len(batch)
+        self._aggregate(batch)
+        return len(batch)
+
+    def _write_now(self, record, dept_id):
+        record.save()
+        self._aggregate([(record, dept_id)])
+
+    @staticmethod
+    def _aggregate(entries):
+        try:
+            analytics.record(
+                (record.timestamp, dept_id, record.user_id, record.action, record.status_code, record.duration_ms)
+                for record, dept_id in entries
+            )
+        except Exception:
+            logger.exception("Could not add %d audit log record(s) to the analytics", len(entries))
+
+    def stop(self):
+        """Stop the flush thread and write what is left (called at exit)."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(settings.AUDIT_LOG_FLUSH_INTERVAL)
+            self._wakeup.clear()
+            self.flush()
+            close_old_connections()
+
+
+writer = AuditLogWriter()
+atexit.register(writer.stop)
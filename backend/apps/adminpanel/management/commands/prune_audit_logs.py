@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.adminpanel.retention import apply_retention
+
+
+class Command(BaseCommand):
+    help = 'Roll up audit log days past the retention window into daily rollups and remove their raw rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.AUDIT_LOG_RETENTION_DAYS,
+            help='Days of raw audit log to keep (default: AUDIT_LOG_RETENTION_DAYS)',
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1')
+
+        def progress(day, rollups):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Rolled up {day}: {rollups} rollup row(s)')
+
+        result = apply_retention(days=options['days'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rolled up {result['rolled_up_days']} day(s) before {result['cutoff']:%Y-%m-%d}; "
+            f"dropped {len(result['dropped_partitions'])} partition(s), deleted {result['deleted_rows']} row(s), "
+            f"added {len(result['added_partitions'])} partition(s)"
+        ))
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.adminpanel import analytics
+
+
+class Command(BaseCommand):
+    help = 'Recompute the hourly audit analytics aggregates from the raw audit log'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Rebuild the last N days (default 7)')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1')
+        end = timezone.now()
+        start = end - timedelta(days=options['days'])
+        analytics.rebuild(start, end + timedelta(hours=1))
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt audit analytics since {start:%Y-%m-%d %H}:00'))
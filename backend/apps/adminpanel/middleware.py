@@ -1,22 +1,65 @@
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.utils.functional import SimpleLazyObject, empty
+from .audit import writer
 from .models import AuditLog
 
 EXCLUDE_PATHS = ['/admin/', '/static/', '/api/auth/token/', '/api/auth/token/refresh/']
 
 class AuditLogMiddleware:
+    # Async-capable, so under ASGI async views (login, registration) are not
+    # run through Django's single thread for synchronous code
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
         response = self.get_response(request)
         try:
-            path = request.path
-            if any(path.startswith(p) for p in EXCLUDE_PATHS):
-                return response
-            user = getattr(request, 'user', None)
-            if user and user.is_authenticated:
-                action = f"{request.method} {path}"
-                AuditLog.objects.create(action=action, user=user)
+            entry = self._entry(request, getattr(request, 'user', None), response, started)
+            if entry is not None:
+                # Buffered and written in batches (see apps.adminpanel.audit)
+                writer.append(*entry)
         except Exception:
             # Do not break the app on logging failure
             pass
         return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        try:
+            user = getattr(request, 'user', None)
+            if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+                # Not set by DRF's authentication; resolving the session user
+                # here would query from the event loop
+                user = None
+            entry = self._entry(request, user, response, started)
+            if entry is not None:
+                # A short hop to the thread the view's queries ran on, where
+                # append() can tell whether they are still in a transaction
+                await sync_to_async(writer.append)(*entry)
+        except Exception:
+            pass
+        return response
+
+    @staticmethod
+    def _entry(request, user, response, started):
+        path = request.path
+        if any(path.startswith(p) for p in EXCLUDE_PATHS):
+            return None
+        if not (user and user.is_authenticated):
+            return None
+        return AuditLog(
+            action=f"{request.method} {path}",
+            user_id=user.pk,
+            status_code=response.status_code,
+            duration_ms=round((time.perf_counter() - started) * 1000),
+        ), user.department_id
@@ -0,0 +1,91 @@
+# Generated by Django 5.0.6 on 2026-10-17 20:29
+
+from datetime import date, datetime, timezone as dt_timezone
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Frozen copies of the helpers in apps.adminpanel.partitions as they were when
+# this migration was written: migrations must not import application code,
+# which follows the current models.
+TABLE = 'adminpanel_auditlog'
+CATCH_ALL = 'pmax'
+MONTHS_AHEAD = 2
+
+
+def _month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def _next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_auditlog(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'mysql':
+        return
+    table = connection.ops.quote_name(TABLE)
+    today = _month_start(datetime.now(dt_timezone.utc).date())
+    last = today
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(timestamp) FROM {table}")
+        oldest = cursor.fetchone()[0]
+        month = _month_start(oldest) if oldest else today
+        definitions = []
+        while month <= last:
+            definitions.append(
+                f"PARTITION p{month:%Y%m} VALUES LESS THAN (TO_DAYS('{_next_month(month):%Y-%m-%d}'))"
+            )
+            month = _next_month(month)
+        definitions.append(f'PARTITION {CATCH_ALL} VALUES LESS THAN MAXVALUE')
+        cursor.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id, timestamp)")
+        cursor.execute(f"ALTER TABLE {table} PARTITION BY RANGE (TO_DAYS(timestamp)) ({', '.join(definitions)})")
+
+
+def unpartition_auditlog(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'mysql':
+        return
+    table = connection.ops.quote_name(TABLE)
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {table} REMOVE PARTITIONING")
+        cursor.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminpanel', '0004_auditlog_status_duration'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.CreateModel(
+            name='AuditLogRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('endpoint', models.CharField(max_length=255)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('errors', models.PositiveIntegerField(default=0)),
+                ('total_duration_ms', models.PositiveBigIntegerField(default=0)),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['day'], name='auditrollup_day_idx')],
+            },
+        ),
+        # After the foreign key is gone: MySQL cannot partition a table that has one
+        migrations.RunPython(partition_auditlog, unpartition_auditlog),
+    ]
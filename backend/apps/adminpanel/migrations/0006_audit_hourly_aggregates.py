@@ -0,0 +1,50 @@
+# Generated by Django 5.0.6 on 2026-10-17 20:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminpanel', '0005_auditlog_partitions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditUserHour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('dept', models.PositiveBigIntegerField(default=0)),
+                ('user', models.PositiveBigIntegerField()),
+                ('requests', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AuditEndpointHour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('dept', models.PositiveBigIntegerField(default=0)),
+                ('endpoint', models.CharField(max_length=255)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('errors', models.PositiveIntegerField(default=0)),
+                ('total_duration_ms', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dept', 'hour'], name='auditendpoint_dept_hour_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='auditendpointhour',
+            constraint=models.UniqueConstraint(fields=('hour', 'dept', 'endpoint'), name='unique_audit_endpoint_hour'),
+        ),
+        migrations.AddIndex(
+            model_name='audituserhour',
+            index=models.Index(fields=['dept', 'hour'], name='audituser_dept_hour_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='audituserhour',
+            constraint=models.UniqueConstraint(fields=('hour', 'dept', 'user'), name='unique_audit_user_hour'),
+        ),
+    ]
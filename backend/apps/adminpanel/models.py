@@ -1,13 +1,88 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 class AuditLog(models.Model):
     action = models.CharField(max_length=255)
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # No database constraint: MySQL cannot partition tables that have foreign keys
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, db_constraint=False)
+    # Set when the request is handled, not when the buffered row is written
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['timestamp'], name='auditlog_timestamp_idx'),
+        ]
 
     def __str__(self):
         return f"{self.timestamp} - {self.user_id} - {self.action}"
+
+
+class AuditLogRollup(models.Model):
+    """
+    One day of audit log for one user and endpoint, kept after the raw rows
+    expire (see apps.adminpanel.retention).
+    """
+    day = models.DateField()
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='+')
+    endpoint = models.CharField(max_length=255)  # action with ids replaced, e.g. "GET /api/tasks/{id}/"
+    requests = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)  # responses with status >= 400
+    total_duration_ms = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day']
+        indexes = [
+            models.Index(fields=['day'], name='auditrollup_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} - {self.user_id} - {self.endpoint}: {self.requests}"
+
+
+class AuditEndpointHour(models.Model):
+    """
+    Requests per hour, department and endpoint, incremented as audit records
+    are written (see apps.adminpanel.analytics). `dept` is the caller's
+    department id, or 0 for none (as in TaskStats, a nullable column would
+    let MySQL store duplicate buckets despite the unique constraint).
+    """
+    hour = models.DateTimeField()
+    dept = models.PositiveBigIntegerField(default=0)
+    endpoint = models.CharField(max_length=255)
+    requests = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)
+    total_duration_ms = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['hour', 'dept', 'endpoint'], name='unique_audit_endpoint_hour'),
+        ]
+        indexes = [
+            models.Index(fields=['dept', 'hour'], name='auditendpoint_dept_hour_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.hour:%Y-%m-%d %H}:00 {self.dept}/{self.endpoint}: {self.requests}"
+
+
+class AuditUserHour(models.Model):
+    """Requests per hour, department and user id; see AuditEndpointHour."""
+    hour = models.DateTimeField()
+    dept = models.PositiveBigIntegerField(default=0)
+    user = models.PositiveBigIntegerField()
+    requests = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['hour', 'dept', 'user'], name='unique_audit_user_hour'),
+        ]
+        indexes = [
+            models.Index(fields=['dept', 'hour'], name='audituser_dept_hour_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.hour:%Y-%m-%d %H}:00 {self.dept}/{self.user}: {self.requests}"
@@ -0,0 +1,137 @@
+"""
+Monthly partitions of the AuditLog table.
+
+On MySQL the table is RANGE partitioned on TO_DAYS(timestamp), one partition
+per calendar month (UTC) named pYYYYMM, plus a catch-all `pmax`. Expired
+months are removed with DROP PARTITION, which takes constant time whatever
+the number of rows, and queries on a recent time range only read the
+partitions that range covers. Partitioning requires the partition column in
+the primary key, so the key is (id, timestamp).
+
+Other databases keep a plain table: `drop_before()` falls back to deleting
+the expired range in batches through the timestamp index.
+"""
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.db import connection as default_connection
+
+from .models import AuditLog
+
+TABLE = AuditLog._meta.db_table
+CATCH_ALL = 'pmax'
+MONTHS_AHEAD = 2
+DELETE_BATCH_SIZE = 5000
+
+
+def supported(connection=None):
+    return (connection or default_connection).vendor == 'mysql'
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'p{month:%Y%m}'
+
+
+def _definition(month):
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (TO_DAYS('{next_month(month):%Y-%m-%d}'))"
+
+
+def _months(first, last):
+    month = month_start(first)
+    while month <= last:
+        yield month
+        month = next_month(month)
+
+
+def partition_months(connection=None):
+    """Months that currently have a partition, oldest first."""
+    connection = connection or default_connection
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    return [date(int(name[1:5]), int(name[5:7]), 1) for name in names if name != CATCH_ALL]
+
+
+def partition_table(connection, today=None):
+    """Partition the (unpartitioned) table from its oldest row to MONTHS_AHEAD months ahead."""
+    today = today or datetime.now(dt_timezone.utc).date()
+    table = connection.ops.quote_name(TABLE)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(timestamp) FROM {table}")
+        oldest = cursor.fetchone()[0]
+        first = month_start(oldest) if oldest else month_start(today)
+        last = _add_months(month_start(today), MONTHS_AHEAD)
+        definitions = [_definition(month) for month in _months(first, last)]
+        definitions.append(f'PARTITION {CATCH_ALL} VALUES LESS THAN MAXVALUE')
+        cursor.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id, timestamp)")
+        cursor.execute(f"ALTER TABLE {table} PARTITION BY RANGE (TO_DAYS(timestamp)) ({', '.join(definitions)})")
+
+
+def unpartition_table(connection):
+    table = connection.ops.quote_name(TABLE)
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {table} REMOVE PARTITIONING")
+        cursor.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+
+
+def ensure_partitions(today=None, connection=None):
+    """Split partitions for the coming months off `pmax`; returns the months added."""
+    connection = connection or default_connection
+    if not supported(connection):
+        return []
+    today = today or datetime.now(dt_timezone.utc).date()
+    existing = partition_months(connection)
+    first = next_month(existing[-1]) if existing else month_start(today)
+    missing = list(_months(first, _add_months(month_start(today), MONTHS_AHEAD)))
+    if missing:
+        definitions = [_definition(month) for month in missing]
+        definitions.append(f'PARTITION {CATCH_ALL} VALUES LESS THAN MAXVALUE')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {connection.ops.quote_name(TABLE)} REORGANIZE PARTITION {CATCH_ALL} "
+                f"INTO ({', '.join(definitions)})"
+            )
+    return missing
+
+
+def drop_before(cutoff, connection=None):
+    """
+    Remove the rows older than `cutoff` (an aware datetime). On MySQL only
+    whole months are dropped, so up to a month of older rows may remain until
+    its partition expires. Returns (dropped partition names, deleted rows).
+    """
+    connection = connection or default_connection
+    if supported(connection):
+        cutoff_day = cutoff.astimezone(dt_timezone.utc).date()
+        expired = [month for month in partition_months(connection) if next_month(month) <= cutoff_day]
+        if expired:
+            names = ', '.join(partition_name(month) for month in expired)
+            with connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {connection.ops.quote_name(TABLE)} DROP PARTITION {names}")
+        return [partition_name(month) for month in expired], 0
+
+    deleted = 0
+    expired = AuditLog.objects.filter(timestamp__lt=cutoff)
+    while True:
+        ids = list(expired.order_by().values_list('id', flat=True)[:DELETE_BATCH_SIZE])
+        if not ids:
+            return [], deleted
+        deleted += AuditLog.objects.filter(id__in=ids).delete()[0]
+
+
+def _add_months(month, count):
+    for _ in range(count):
+        month = next_month(month)
+    return month
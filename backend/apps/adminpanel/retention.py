@@ -0,0 +1,86 @@
+"""
+Audit log retention: raw rows are kept for AUDIT_LOG_RETENTION_DAYS, then
+folded into AuditLogRollup (one row per day, user and endpoint) and removed
+(whole monthly partitions on MySQL, see apps.adminpanel.partitions).
+
+Days are local calendar days. A day is rolled up once, before its rows can
+be removed; rolling up a day again replaces its rollups, so an interrupted
+run can simply be repeated.
+"""
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from . import partitions
+from .analytics import endpoint_for
+from .models import AuditLog, AuditLogRollup
+
+
+def day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+
+
+def rollup_day(day):
+    """(Re)compute the rollups of `day` from its raw rows; returns the number of rollups."""
+    requests, errors, durations = Counter(), Counter(), Counter()
+    start, end = day_bounds(day)
+    rows = (
+        AuditLog.objects.filter(timestamp__gte=start, timestamp__lt=end)
+        .order_by().values_list('user_id', 'action', 'status_code', 'duration_ms')
+    )
+    for user_id, action, status_code, duration_ms in rows.iterator(chunk_size=5000):
+        key = (user_id, endpoint_for(action))
+        requests[key] += 1
+        if status_code is not None and status_code >= 400:
+            errors[key] += 1
+        durations[key] += duration_ms or 0
+
+    with transaction.atomic():
+        AuditLogRollup.objects.filter(day=day).delete()
+        AuditLogRollup.objects.bulk_create([
+            AuditLogRollup(
+                day=day, user_id=user_id, endpoint=endpoint, requests=count,
+                errors=errors[(user_id, endpoint)], total_duration_ms=durations[(user_id, endpoint)],
+            )
+            for (user_id, endpoint), count in requests.items()
+        ], batch_size=1000)
+    return len(requests)
+
+
+def apply_retention(days=None, now=None, progress=None):
+    """
+    Roll up every expired day not rolled up yet, then remove the expired raw
+    rows and make sure partitions exist for the coming months.
+    `progress(day, rollups)` is called after each day.
+    """
+    days = settings.AUDIT_LOG_RETENTION_DAYS if days is None else days
+    now = now or timezone.now()
+    cutoff_day = timezone.localdate(now) - timedelta(days=days)
+    cutoff = day_bounds(cutoff_day)[0]
+
+    last_rolled_up = AuditLogRollup.objects.aggregate(day=Max('day'))['day']
+    oldest = AuditLog.objects.aggregate(ts=Min('timestamp'))['ts']
+    first_day = timezone.localdate(oldest) if oldest else cutoff_day
+    if last_rolled_up is not None:
+        first_day = max(first_day, last_rolled_up + timedelta(days=1))
+
+    rolled_up = 0
+    day = first_day
+    while day < cutoff_day:
+        rollups = rollup_day(day)
+        rolled_up += 1
+        if progress:
+            progress(day, rollups)
+        day += timedelta(days=1)
+
+    dropped, deleted = partitions.drop_before(cutoff)
+    added = partitions.ensure_partitions(now.date())
+    return {
+        'cutoff': cutoff, 'rolled_up_days': rolled_up, 'dropped_partitions': dropped,
+        'deleted_rows': deleted, 'added_partitions': [partitions.partition_name(month) for month in added],
+    }
@@ -6,7 +6,7 @@ class AuditLogSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = AuditLog
-        fields = ['id','action','user','user_email','timestamp']
+        fields = ['id','action','user','user_email','timestamp','status_code','duration_ms']
 
     def get_user_email(self, obj):
         return getattr(obj.user, 'email', None)
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.users.models import Department, Role
+from . import analytics
+from .audit import AuditLogWriter
+from .models import AuditEndpointHour, AuditLog, AuditUserHour
+
+User = get_user_model()
+
+
+class TestAuditAnalytics(TestCase):
+    def setUp(self):
+        self.engineering = Department.objects.create(name='Engineering')
+        self.sales = Department.objects.create(name='Sales')
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='testpass123',
+            role=Role.objects.create(name='Admin'), department=self.engineering,
+        )
+        self.seller = User.objects.create_user(
+            email='seller@example.com', username='seller', password='testpass123', department=self.sales,
+        )
+        self.start = timezone.make_aware(datetime(2026, 3, 2, 9, 0))
+        writer = AuditLogWriter()  # inside the test transaction every record is written at once
+        for hours, user, action, status_code in [
+            (0, self.seller, 'GET /api/tasks/1/', 200),
+            (0, self.seller, 'GET /api/tasks/2/', 404),
+            (1, self.seller, 'GET /api/tasks/', 200),
+            (1, self.admin, 'GET /api/tasks/3/', 200),
+            (2, self.admin, 'GET /api/adminpanel/logs/', 200),
+        ]:
+            writer.append(AuditLog(
+                user=user, action=action, status_code=status_code, duration_ms=20,
+                timestamp=self.start + timedelta(hours=hours, minutes=15),
+            ), dept_id=user.department_id)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def _get(self, name, **params):
+        params.setdefault('start', self.start.isoformat())
+        params.setdefault('end', (self.start + timedelta(days=1)).isoformat())
+        return self.client.get(f'/api/adminpanel/analytics/{name}/', params)
+
+    def test_top_endpoints(self):
+        response = self._get('endpoints')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0], {
+            'endpoint': 'GET /api/tasks/{id}/', 'requests': 3, 'errors': 1, 'avg_duration_ms': 20.0,
+        })
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(len(self._get('endpoints', limit=1).data), 1)
+
+    def test_department_filter_and_users(self):
+        response = self._get('users', dept=self.sales.id)
+        self.assertEqual(response.data, [{'user_id': self.seller.id, 'email': 'seller@example.com', 'requests': 3}])
+        users = self._get('users').data
+        self.assertEqual([row['user_id'] for row in users], [self.seller.id, self.admin.id])
+
+    def test_requests_per_hour(self):
+        response = self._get('hourly', dept=self.sales.id)
+        self.assertEqual(
+            [(row['hour'], row['requests'], row['errors']) for row in response.data],
+            [(self.start, 2, 1), (self.start + timedelta(hours=1), 1, 0)],
+        )
+
+    def test_reads_aggregates_only(self):
+        with self.assertNumQueries(1):
+            analytics.top_endpoints(self.start, self.start + timedelta(days=30))
+        with self.assertNumQueries(1):
+            analytics.requests_per_hour(self.start, self.start + timedelta(days=30), self.sales.id)
+
+    def test_rebuild_matches_incremental(self):
+        expected = sorted(AuditEndpointHour.objects.values_list('hour', 'dept', 'endpoint', 'requests', 'errors'))
+        AuditUserHour.objects.all().delete()
+        analytics.rebuild(self.start, self.start + timedelta(days=1))
+        self.assertEqual(
+            sorted(AuditEndpointHour.objects.values_list('hour', 'dept', 'endpoint', 'requests', 'errors')), expected
+        )
+        self.assertEqual(AuditUserHour.objects.count(), 4)
+
+    def test_validation_and_permissions(self):
+        self.assertEqual(self._get('endpoints', start='yesterday').status_code, 400)
+        self.assertEqual(self._get('endpoints', start=self.start.isoformat(), end=self.start.isoformat()).status_code, 400)
+        self.assertEqual(self._get('endpoints', limit=0).status_code, 400)
+        self.assertEqual(self._get('endpoints', dept='x').status_code, 400)
+        self.client.force_authenticate(self.seller)
+        self.assertEqual(self._get('endpoints').status_code, 403)
@@ -0,0 +1,71 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from .audit import AuditLogWriter
+from .models import AuditLog
+
+User = get_user_model()
+
+
+class TestAuditLogMiddleware(TestCase):
+    def test_records_status_and_duration(self):
+        user = User.objects.create_user(email='staff@example.com', username='staff', password='testpass123')
+        client = APIClient()
+        client.force_authenticate(user)
+        client.get('/api/notifications/')
+        client.get('/api/adminpanel/logs/')
+
+        logs = {log.action: log for log in AuditLog.objects.all()}
+        self.assertEqual(logs['GET /api/notifications/'].status_code, 200)
+        self.assertEqual(logs['GET /api/adminpanel/logs/'].status_code, 403)
+        self.assertIsNotNone(logs['GET /api/notifications/'].duration_ms)
+        self.assertEqual(logs['GET /api/notifications/'].user_id, user.id)
+
+
+@override_settings(AUDIT_LOG_BUFFER_SIZE=5, AUDIT_LOG_BATCH_SIZE=3, AUDIT_LOG_FLUSH_INTERVAL=60)
+class TestAuditLogWriter(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='staff@example.com', username='staff', password='testpass123')
+        self.writer = AuditLogWriter()
+        self.addCleanup(self.writer.stop)
+
+    def _append(self, count):
+        for i in range(count):
+            self.writer.append(AuditLog(action=f'GET /api/{i}/', user_id=self.user.id, status_code=200))
+
+    def _wait_for_rows(self, count):
+        deadline = time.monotonic() + 5
+        while AuditLog.objects.count() < count and time.monotonic() < deadline:
+            time.sleep(0.02)
+        return AuditLog.objects.count()
+
+    def test_flushes_in_batches(self):
+        self._append(2)
+        self.assertEqual(len(self.writer), 2)
+        self.assertEqual(AuditLog.objects.count(), 0)
+
+        self._append(1)  # a full batch wakes the flush thread
+        self.assertEqual(self._wait_for_rows(3), 3)
+
+        self._append(1)
+        self.writer.stop()  # as at exit
+        self.assertEqual(AuditLog.objects.count(), 4)
+        self.assertEqual(self.writer.written, 4)
+
+    @override_settings(AUDIT_LOG_BUFFER_SIZE=1, AUDIT_LOG_BATCH_SIZE=100)
+    def test_writes_synchronously_when_full(self):
+        self._append(2)
+        self.assertEqual(self.writer.overflowed, 1)
+        self.assertEqual(AuditLog.objects.count(), 1)
+        self.writer.stop()
+        self.assertEqual(AuditLog.objects.count(), 2)
+
+    def test_writes_synchronously_inside_a_transaction(self):
+        with transaction.atomic():
+            self._append(1)
+            self.assertEqual(AuditLog.objects.count(), 1)
+        self.assertEqual(len(self.writer), 0)
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.users.models import Role
+from .models import AuditLog, AuditLogRollup
+from .retention import apply_retention
+
+User = get_user_model()
+
+
+class TestAuditLogRetention(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='testpass123',
+            role=Role.objects.create(name='Admin'),
+        )
+        self.staff = User.objects.create_user(email='staff@example.com', username='staff', password='testpass123')
+        self.now = timezone.make_aware(datetime(2026, 6, 15, 12, 0))
+
+    def _log(self, user, action, days_ago, status_code=200, duration_ms=10):
+        return AuditLog.objects.create(
+            user=user, action=action, status_code=status_code, duration_ms=duration_ms,
+            timestamp=self.now - timedelta(days=days_ago),
+        )
+
+    def test_expired_days_are_rolled_up_and_removed(self):
+        self._log(self.staff, 'GET /api/tasks/1/', 40)
+        self._log(self.staff, 'GET /api/tasks/2/', 40, status_code=404, duration_ms=30)
+        self._log(self.admin, 'GET /api/tasks/1/', 40)
+        self._log(self.staff, 'POST /api/tasks/', 35)
+        recent = self._log(self.staff, 'GET /api/tasks/', 5)
+
+        result = apply_retention(days=30, now=self.now)
+        self.assertEqual(result['rolled_up_days'], 10)  # 40 to 31 days ago
+        self.assertEqual(result['deleted_rows'], 4)
+        self.assertEqual(list(AuditLog.objects.values_list('id', flat=True)), [recent.id])
+
+        day = timezone.localdate(self.now - timedelta(days=40))
+        rollup = AuditLogRollup.objects.get(day=day, user=self.staff)
+        self.assertEqual(
+            (rollup.endpoint, rollup.requests, rollup.errors, rollup.total_duration_ms),
+            ('GET /api/tasks/{id}/', 2, 1, 40),
+        )
+        self.assertEqual(AuditLogRollup.objects.count(), 3)
+
+        # Nothing new has expired: a second run does nothing
+        self.assertEqual(apply_retention(days=30, now=self.now)['rolled_up_days'], 0)
+        self.assertEqual(AuditLogRollup.objects.count(), 3)
+
+    def test_list_reads_the_recent_window(self):
+        old = self._log(self.staff, 'GET /api/old/', 60)
+        old.timestamp = timezone.now() - timedelta(days=60)
+        old.save()
+        for _ in range(5):
+            AuditLog.objects.create(user=self.staff, action='GET /api/tasks/', status_code=200)
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        self.assertEqual(client.get('/api/adminpanel/logs/', {'days': 0}).status_code, 400)
+        # The page (users joined in), then the audit row of the request itself and its two hourly buckets
+        with self.assertNumQueries(4):
+            response = client.get('/api/adminpanel/logs/')
+        self.assertEqual(len(response.data), 6)  # the old row is outside the default window
+        self.assertEqual(response.data[-1]['user_email'], 'staff@example.com')
+
+        self.assertEqual(len(client.get('/api/adminpanel/logs/', {'days': 90}).data), 8)
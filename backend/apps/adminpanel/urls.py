@@ -1,3 +1,11 @@
 from django.urls import path
-from .views import AuditLogListView
-urlpatterns = [ path('logs/', AuditLogListView.as_view(), name='audit-logs') ]
+from .views import (
+    AuditLogListView, AuditLogExportView, TopEndpointsView, TopUsersView, RequestsPerHourView,
+)
+urlpatterns = [
+    path('logs/', AuditLogListView.as_view(), name='audit-logs'),
+    path('logs/export/', AuditLogExportView.as_view(), name='audit-logs-export'),
+    path('analytics/endpoints/', TopEndpointsView.as_view(), name='audit-analytics-endpoints'),
+    path('analytics/users/', TopUsersView.as_view(), name='audit-analytics-users'),
+    path('analytics/hourly/', RequestsPerHourView.as_view(), name='audit-analytics-hourly'),
+]
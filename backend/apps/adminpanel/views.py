@@ -1,11 +1,105 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from . import analytics
 from .models import AuditLog
 from .serializers import AuditLogSerializer
 from apps.users.permissions import IsAdmin
+from apps.exports import export_response
 
 class AuditLogListView(generics.ListAPIView):
+    """
+    Recent audit log, newest first: the last AUDIT_LOG_RECENT_DAYS days, or
+    `?days=N` (up to the retention window). Bounding the time range lets
+    MySQL read only the partitions it covers.
+    """
     serializer_class = AuditLogSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdmin]
 
     def get_queryset(self):
-        return AuditLog.objects.all()
+        days = self.request.query_params.get('days', str(settings.AUDIT_LOG_RECENT_DAYS))
+        if not days.isdigit() or not 1 <= int(days) <= settings.AUDIT_LOG_RETENTION_DAYS:
+            raise ValidationError({'days': [f'Must be between 1 and {settings.AUDIT_LOG_RETENTION_DAYS}.']})
+        since = timezone.now() - timedelta(days=int(days))
+        return AuditLog.objects.filter(timestamp__gte=since).select_related('user')
+
+
+class AuditLogExportView(AuditLogListView):
+    """Streams the whole retained audit log as CSV or NDJSON (see apps.exports)."""
+
+    def get(self, request, *args, **kwargs):
+        return export_response(request, AuditLog.objects.all(), [
+            ('id', 'id'),
+            ('timestamp', 'timestamp'),
+            ('user', 'user__email'),
+            ('action', 'action'),
+            ('status_code', 'status_code'),
+            ('duration_ms', 'duration_ms'),
+        ], filename='audit_logs')
+
+
+class AuditAnalyticsView(APIView):
+    """
+    Base for the audit analytics endpoints, which read the hourly aggregates
+    only (see apps.adminpanel.analytics). Query parameters:
+        start, end   ISO 8601 datetimes (default: the last 7 days); hour granularity
+        dept         department id (default: all departments)
+        limit        number of rows for the "top" endpoints, 1-100 (default 10)
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdmin]
+    DEFAULT_RANGE = timedelta(days=7)
+    MAX_LIMIT = 100
+
+    def get_range(self):
+        end = self._datetime_param('end') or timezone.now()
+        start = self._datetime_param('start') or end - self.DEFAULT_RANGE
+        if start >= end:
+            raise ValidationError({'start': ['Must be before end.']})
+        dept = self.request.query_params.get('dept')
+        if dept is not None and not dept.isdigit():
+            raise ValidationError({'dept': ['Must be a department id.']})
+        return start, end, int(dept) if dept is not None else None
+
+    def get_limit(self):
+        limit = self.request.query_params.get('limit', '10')
+        if not limit.isdigit() or not 1 <= int(limit) <= self.MAX_LIMIT:
+            raise ValidationError({'limit': [f'Must be between 1 and {self.MAX_LIMIT}.']})
+        return int(limit)
+
+    def _datetime_param(self, name):
+        raw = self.request.query_params.get(name)
+        if raw is None:
+            return None
+        try:
+            value = parse_datetime(raw)
+        except ValueError:
+            value = None
+        if value is None:
+            raise ValidationError({name: ['Must be an ISO 8601 datetime.']})
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
+
+
+class TopEndpointsView(AuditAnalyticsView):
+    def get(self, request):
+        start, end, dept = self.get_range()
+        return Response(analytics.top_endpoints(start, end, dept, self.get_limit()))
+
+
+class TopUsersView(AuditAnalyticsView):
+    def get(self, request):
+        start, end, dept = self.get_range()
+        return Response(analytics.top_users(start, end, dept, self.get_limit()))
+
+
+class RequestsPerHourView(AuditAnalyticsView):
+    def get(self, request):
+        start, end, dept = self.get_range()
+        return Response(analytics.requests_per_hour(start, end, dept))
@@ -0,0 +1,102 @@
+"""
+Conditional GET (ETag) for list endpoints.
+
+The ETag comes from a cheap aggregate over the list's scope -- the newest
+modification timestamp plus the row count -- so an unchanged list is
+answered with 304 before the page is fetched or serialized. There is no
+Last-Modified: a timestamp alone misses deletes and writes within the same
+second, which only the count and the full-precision timestamp catch.
+
+Aggregates are cached for `WATERMARK_TIMEOUT` seconds under a generation
+token per label; the save/delete receivers in `apps.signals` call
+`invalidate()`, which replaces the token when the write is made and again
+when it commits (a list read in between would cache the uncommitted
+state). Invalidations reach other worker processes only through a shared
+cache (CACHE=database in settings). A token that was evicted is replaced by
+a new one, never by an earlier value, so eviction cannot revive a stale
+aggregate.
+"""
+import hashlib
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+WATERMARK_TIMEOUT = 30
+
+
+def _generation_key(label):
+    return f'watermark-generation:{label}'
+
+
+def _new_generation(label):
+    cache.set(_generation_key(label), uuid.uuid4().hex, None)
+
+
+def invalidate(label):
+    """Drop every cached aggregate of `label` (e.g. 'tasks'), now and once the write commits."""
+    _new_generation(label)
+    transaction.on_commit(lambda: _new_generation(label))
+
+
+def _generation(label):
+    key = _generation_key(label)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+def watermark(label, scope, queryset, timestamp_field):
+    """Return (latest timestamp or None, row count) for `queryset`, cached per scope."""
+    generation = _generation(label)
+    key = f'watermark:{label}:{scope}:{generation}'
+    cached = cache.get(key)
+    if cached is None:
+        result = queryset.order_by().aggregate(latest=Max(timestamp_field), total=Count('pk'))
+        cached = (result['latest'], result['total'])
+        cache.set(key, cached, WATERMARK_TIMEOUT)
+    return cached
+
+
+class ConditionalListMixin:
+    """
+    Adds an ETag to `list` and answers If-None-Match with 304. Views
+    implement `get_watermark_sources()`.
+    """
+
+    def get_watermark_sources(self):
+        """Return [(label, scope, queryset, timestamp field)] the list's content depends on."""
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        marks = [
+            watermark(label, scope, queryset, field)
+            for label, scope, queryset, field in self.get_watermark_sources()
+        ]
+        fingerprint = repr((
+            marks, request.get_full_path(), request.get_host(), request.accepted_renderer.format,
+        ))
+        etag = quote_etag(hashlib.sha1(fingerprint.encode('utf-8')).hexdigest())
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+        if self._not_modified(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response = super().list(request, *args, **kwargs)
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+    @staticmethod
+    def _not_modified(request, etag):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is None:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
@@ -8,11 +8,13 @@ class DepartmentListView(ListAPIView):
     queryset = Department.objects.all().order_by('name')
     serializer_class = DepartmentSerializer
     permission_classes = [AllowAny]  # Allow public access for registration
+    pagination_class = None  # reference data: the registration form needs every department
 
 class RoleListView(ListAPIView):
     queryset = Role.objects.all().order_by('name')
     serializer_class = RoleSerializer
     permission_classes = [AllowAny]  # Allow public access for registration
+    pagination_class = None
 
 urlpatterns = [
     path('', DepartmentListView.as_view(), name='departments-list'),
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-17 19:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0002_initial'),
+        ('users', '0004_user_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['dept', 'timestamp'], name='message_dept_timestamp_idx'),
+        ),
+    ]
@@ -11,3 +11,6 @@ class Message(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['dept', 'timestamp'], name='message_dept_timestamp_idx'),
+        ]
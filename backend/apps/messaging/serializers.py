@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Message
+from apps.users.principal import get_principal
 from apps.users.serializers import UserSerializer
 
 class DepartmentSerializer(serializers.Serializer):
@@ -18,10 +19,12 @@ class MessageSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         request = self.context['request']
-        validated_data['sender'] = request.user
-        validated_data['dept'] = request.user.department
+        principal = get_principal(request)
+        validated_data['sender_id'] = principal.user_id
+        dept_id = principal.dept_id
+        validated_data['dept_id'] = dept_id
         # Validate receiver department if present
         receiver = validated_data.get('receiver')
-        if receiver and receiver.department_id != request.user.department_id:
+        if receiver and receiver.department_id != dept_id:
             raise serializers.ValidationError('Receiver must be in your department.')
         return super().create(validated_data)
@@ -1,3 +1,6 @@
 from django.urls import path
-from .views import DeptMessagesView
-urlpatterns = [ path('department/', DeptMessagesView.as_view(), name='dept-messages') ]
+from .views import DeptMessagesView, DeptMessagesExportView
+urlpatterns = [
+    path('department/', DeptMessagesView.as_view(), name='dept-messages'),
+    path('department/export/', DeptMessagesExportView.as_view(), name='dept-messages-export'),
+]
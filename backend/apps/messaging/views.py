@@ -1,38 +1,60 @@
 from rest_framework import generics, permissions
+from django.contrib.auth import get_user_model
+from apps.conditional import ConditionalListMixin
+from apps.exports import export_response
+from apps.users.principal import get_principal
 from .models import Message
 from .serializers import MessageSerializer
 
-class DeptMessagesView(generics.ListCreateAPIView):
+class DeptMessagesView(ConditionalListMixin, generics.ListCreateAPIView):
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
-        user = self.request.user
-        
-        # Check if user is admin
-        try:
-            role_name = getattr(user, 'role_name', None) or getattr(getattr(user, 'role', None), 'name', None)
-        except Exception:
-            role_name = None
+    def get_dept_scope(self):
+        """Department id the caller's messages are restricted to, 'all', or None for no access."""
+        principal = get_principal(self.request)
+
+        if principal.is_admin:
+            # Admins can filter by department via ?dept_id=
+            dept_id = self.request.query_params.get('dept_id')
+            return dept_id if dept_id and dept_id != 'all' else 'all'
+        # Non-admins only see their department messages
+        return principal.dept_id
+
+    def get_watermark_sources(self):
+        scope = self.get_dept_scope()
+        messages = Message.objects.all() if scope == 'all' else Message.objects.filter(dept_id=scope)
+        return [
+            ('messages', scope, messages, 'timestamp'),
+            ('users', 'all', get_user_model().objects.all(), 'updated_at'),
+        ]
 
-        is_admin = role_name and role_name.lower() == 'admin'
+    def get_queryset(self):
+        scope = self.get_dept_scope()
+        if scope is None:
+            return Message.objects.none()
 
         # Base queryset with proper relations
         qs = Message.objects.select_related('sender', 'sender__department', 'sender__role', 'receiver', 'dept')
-
-        if is_admin:
-            # Admins can filter by department via ?dept_id=
-            dept_id = self.request.query_params.get('dept_id')
-            if dept_id and dept_id != 'all':
-                qs = qs.filter(dept_id=dept_id)
-            # Otherwise return all messages
-            return qs.order_by('-timestamp')
-        else:
-            # Non-admins only see their department messages
-            if not user.department:
-                return Message.objects.none()
-            return qs.filter(dept=user.department).order_by('-timestamp')
+        if scope != 'all':
+            qs = qs.filter(dept_id=scope)
+        return qs.order_by('-timestamp')
     
     def perform_create(self, serializer):
         # Ensure message is saved with proper context
         serializer.save()
+
+
+class DeptMessagesExportView(DeptMessagesView):
+    """Streams the messages DeptMessagesView would list as CSV or NDJSON (see apps.exports)."""
+    http_method_names = ['get', 'head', 'options']
+
+    def get(self, request, *args, **kwargs):
+        return export_response(request, self.get_queryset(), [
+            ('id', 'id'),
+            ('timestamp', 'timestamp'),
+            ('department', 'dept__name'),
+            ('sender', 'sender__email'),
+            ('receiver', 'receiver__email'),
+            ('message_body', 'message_body'),
+        ], filename='messages')
@@ -1,18 +1,147 @@
+import asyncio
 import json
-from channels.generic.websocket import AsyncWebsocketConsumer
+from urllib.parse import parse_qs
+
 from channels.db import database_sync_to_async
-from django.contrib.auth.models import AnonymousUser
+from channels.generic.http import AsyncHttpConsumer
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from apps.users.authentication import ClaimsJWTAuthentication
+from . import unread
+from .push import dept_group, user_group
+
+# Browsers cannot set headers on a WebSocket: the access token comes either as
+# ?token=<jwt> or as the subprotocol pair "bearer", "<jwt>"
+TOKEN_SUBPROTOCOL = 'bearer'
+# Close code for a socket without a valid token (4000-4999 are free for applications)
+CLOSE_UNAUTHORIZED = 4401
+
+
+def token_from_scope(scope):
+    """The raw token and, if it came as a subprotocol, the subprotocol to accept."""
+    subprotocols = scope.get('subprotocols') or []
+    if TOKEN_SUBPROTOCOL in subprotocols:
+        index = subprotocols.index(TOKEN_SUBPROTOCOL)
+        if index + 1 < len(subprotocols):
+            return subprotocols[index + 1], TOKEN_SUBPROTOCOL
+    tokens = parse_qs(scope.get('query_string', b'').decode('latin-1')).get('token')
+    return (tokens[0] if tokens else None), None
+
+
+def http_token(scope):
+    """The raw token of an HTTP request: `Authorization: Bearer <jwt>`, or ?token= (EventSource sets no headers)."""
+    for name, value in scope.get('headers', []):
+        if name == b'authorization':
+            kind, _, token = value.decode('latin-1').partition(' ')
+            if kind.lower() == 'bearer':
+                return token.strip()
+    return token_from_scope(scope)[0]
+
+
+def authenticate(raw_token):
+    """The claims-backed user of `raw_token`, or None if it is missing, invalid or revoked."""
+    if not raw_token:
+        return None
+    authentication = ClaimsJWTAuthentication()
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+
 
 class NotificationConsumer(AsyncWebsocketConsumer):
+    """
+    Pushes the user's notifications (`user.<id>` group) and department-wide
+    events (`dept.<id>` group) to an authenticated socket; see
+    apps.notifications.push for the sending side.
+    """
+
     async def connect(self):
-        user = self.scope.get('user', None)
-        # For demo, allow unauth but in production you should authenticate the websocket (e.g., JWT in querystring)
-        self.group_name = "notifications"
-        await self.channel_layer.group_add(self.group_name, self.channel_name)
-        await self.accept()
+        raw_token, subprotocol = token_from_scope(self.scope)
+        user = await database_sync_to_async(authenticate)(raw_token)
+        if user is None:
+            # Closing before accept() refuses the handshake with a plain 403;
+            # the close code only reaches the client on an accepted socket.
+            # A browser that offered subprotocols fails a handshake that
+            # picks none, so the offered one is still echoed.
+            await self.accept(subprotocol=subprotocol)
+            await self.close(code=CLOSE_UNAUTHORIZED)
+            return
+        self.scope['user'] = user
+        self.group_names = [user_group(user.pk)]
+        if user.department_id:
+            self.group_names.append(dept_group(user.department_id))
+        for group in self.group_names:
+            await self.channel_layer.group_add(group, self.channel_name)
+        await self.accept(subprotocol=subprotocol)
 
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        for group in getattr(self, 'group_names', []):
+            await self.channel_layer.group_discard(group, self.channel_name)
 
     async def notify(self, event):
         await self.send(text_data=json.dumps(event['data']))
+
+
+class UnreadCountConsumer(AsyncHttpConsumer):
+    """
+    Held requests for the unread notification count, served next to the
+    sockets rather than by Django views so that a waiting request holds no
+    worker thread. Woken by the counts apps.notifications.unread pushes.
+
+    - Long-poll: `?since=<count>` answers once the count differs from
+      `since`, or after NOTIFICATION_WAIT_TIMEOUT seconds with the count
+      unchanged. Without `since` it answers at once.
+    - Server-Sent Events (`Accept: text/event-stream`): the count, then each
+      new count, for NOTIFICATION_STREAM_MAX_AGE seconds; EventSource
+      reconnects by itself.
+    """
+    KEEPALIVE = 15
+
+    async def handle(self, body):
+        user = await database_sync_to_async(authenticate)(http_token(self.scope))
+        if user is None:
+            await self._json(401, {'detail': 'Authentication credentials were not provided or are invalid.'})
+            return
+        accept = dict(self.scope.get('headers', [])).get(b'accept', b'')
+        if b'text/event-stream' in accept:
+            await self._stream(user.pk)
+            return
+
+        since = parse_qs(self.scope.get('query_string', b'').decode('latin-1')).get('since')
+        try:
+            since = int(since[0]) if since else None
+        except ValueError:
+            await self._json(400, {'since': ['Must be an integer.']})
+            return
+        async with unread.CountChanges(user.pk) as changes:
+            count = await database_sync_to_async(unread.count)(user.pk)
+            if count == since:
+                changed = await changes.next(settings.NOTIFICATION_WAIT_TIMEOUT)
+                count = count if changed is None else changed
+        await self._json(200, {'count': count})
+
+    async def _stream(self, user_id):
+        await self.send_headers(headers=[
+            (b'Content-Type', b'text/event-stream'), (b'Cache-Control', b'no-cache'), (b'X-Accel-Buffering', b'no'),
+        ])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.NOTIFICATION_STREAM_MAX_AGE
+        async with unread.CountChanges(user_id) as changes:
+            count = await database_sync_to_async(unread.count)(user_id)
+            await self.send_body(f'retry: 3000\ndata: {json.dumps({"count": count})}\n\n'.encode(), more_body=True)
+            while (remaining := deadline - loop.time()) > 0:
+                changed = await changes.next(min(remaining, self.KEEPALIVE))
+                if changed is None:
+                    # A comment line, so idle proxies keep the connection open
+                    await self.send_body(b': keep-alive\n\n', more_body=True)
+                elif changed != count:
+                    count = changed
+                    await self.send_body(f'data: {json.dumps({"count": count})}\n\n'.encode(), more_body=True)
+        await self.send_body(b'')
+
+    async def _json(self, status, data):
+        await self.send_response(status, json.dumps(data).encode(), headers=[(b'Content-Type', b'application/json')])
@@ -0,0 +1,102 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from volo_africa.channel_layers import SQLiteChannelLayer
+
+
+def _worker(path, socket_dir, index, expected, capacity, ready, results):
+    """
+    One ASGI worker with a socket per item of `expected`, each in group "all"
+    and in a group of its own, reading until it has had `expected` messages.
+    """
+    async def run():
+        layer = SQLiteChannelLayer(path=path, socket_dir=socket_dir, capacity=capacity)
+        names = [await layer.new_channel() for _ in expected]
+        for i, name in enumerate(names):
+            await layer.group_add('all', name)
+            await layer.group_add(f'user.{index}.{i}', name)
+        ready.put(index)
+        received = await asyncio.gather(*(_drain(layer, name, count) for name, count in zip(names, expected)))
+        results.put((sum(received), time.time()))
+
+    async def _drain(layer, name, expected):
+        count = 0
+        while count < expected:
+            await layer.receive(name)
+            count += 1
+        return count
+
+    asyncio.run(run())
+
+
+class Command(BaseCommand):
+    help = 'Measure group_send throughput of the SQLite channel layer across worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, nargs='+', default=[4, 8])
+        parser.add_argument('--channels', type=int, default=250, help='Sockets per worker process')
+        parser.add_argument('--messages', type=int, default=200, help='group_send calls per run')
+
+    def handle(self, *args, **options):
+        if options['messages'] < 1 or options['channels'] < 1:
+            raise CommandError('--messages and --channels must be positive')
+        self.stdout.write(
+            f"{'procs':>5} {'sockets':>7} {'group':>10} {'sends':>6} {'sends/s':>8} "
+            f"{'deliveries':>10} {'deliv/s':>8} {'all in ms':>9}"
+        )
+        for processes in options['processes']:
+            for target in ('all', 'user'):
+                self._run(processes, options['channels'], options['messages'], target)
+
+    def _run(self, processes, channels, messages, target):
+        context = multiprocessing.get_context('spawn')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'channels.sqlite3')
+            # "all" reaches every socket of every worker, "user" one socket, spread over the workers
+            expected = [[messages if target == 'all' else 0] * channels for _ in range(processes)]
+            if target == 'all':
+                group_names = ['all'] * messages
+            else:
+                group_names = []
+                for i in range(messages):
+                    worker, socket = i % processes, (i // processes) % channels
+                    group_names.append(f'user.{worker}.{socket}')
+                    expected[worker][socket] += 1
+
+            ready, results = context.Queue(), context.Queue()
+            workers = [
+                context.Process(target=_worker, args=(path, directory, i, counts, messages + 10, ready, results))
+                for i, counts in enumerate(expected)
+            ]
+            for worker in workers:
+                worker.start()
+            try:
+                for _ in workers:
+                    ready.get(timeout=120)
+                sender = SQLiteChannelLayer(path=path, socket_dir=directory, capacity=messages + 10)
+                started = time.time()
+                asyncio.run(self._send(sender, group_names))
+                sent = time.time() - started
+                received = [results.get(timeout=300) for _ in workers]
+            finally:
+                for worker in workers:
+                    worker.join(timeout=10)
+                    if worker.is_alive():
+                        worker.terminate()
+
+        deliveries = sum(count for count, _ in received)
+        finished = max(at for _, at in received) - started
+        self.stdout.write(
+            f"{processes:>5} {processes * channels:>7} {target:>10} {messages:>6} {messages / sent:>8.0f} "
+            f"{deliveries:>10} {deliveries / finished:>8.0f} {finished * 1000:>9.0f}"
+        )
+
+    @staticmethod
+    async def _send(layer, groups):
+        for group in groups:
+            await layer.group_send(group, {'type': 'notify', 'data': {'group': group}})
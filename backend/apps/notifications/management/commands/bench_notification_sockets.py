@@ -0,0 +1,126 @@
+import asyncio
+import random
+import time
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import path
+
+from apps.notifications.consumers import NotificationConsumer
+from apps.notifications.push import dept_group, user_group
+from apps.users.authentication import EmailTokenObtainPairSerializer
+from apps.users.models import Department
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Connect thousands of simulated notification sockets and measure per-event delivery'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sockets', type=int, default=2000)
+        parser.add_argument('--departments', type=int, default=20)
+        parser.add_argument('--events', type=int, default=200)
+        parser.add_argument(
+            '--broadcast', action='store_true',
+            help='Also send every event to all sockets, as the single "notifications" group did (for comparison)',
+        )
+
+    def handle(self, *args, **options):
+        if options['sockets'] < 2:
+            raise CommandError('--sockets must be at least 2')
+        layer = get_channel_layer()
+        if layer is None:
+            raise CommandError('No channel layer is configured')
+        # Room for every event in each socket's queue, and no group expiry during the run
+        layer.capacity = max(layer.capacity, options['events'] + 10)
+        layer.group_expiry = 3600
+
+        prefix = f'socket-bench-{time.time_ns()}'
+        departments = Department.objects.bulk_create([
+            Department(name=f'{prefix}-{i}') for i in range(options['departments'])
+        ])
+        User.objects.bulk_create([
+            User(
+                email=f'{prefix}-{i}@example.com', username=f'{prefix}-{i}',
+                department=departments[i % len(departments)],
+            )
+            for i in range(options['sockets'])
+        ])
+        users = list(User.objects.filter(email__startswith=prefix).order_by('id'))
+        tokens = [str(EmailTokenObtainPairSerializer.get_token(user).access_token) for user in users]
+        try:
+            async_to_sync(self._run)(layer, users, tokens, options)
+        finally:
+            User.objects.filter(email__startswith=prefix).delete()
+            Department.objects.filter(name__startswith=prefix).delete()
+
+    async def _run(self, layer, users, tokens, options):
+        application = URLRouter([path('ws/notifications/', NotificationConsumer.as_asgi())])
+        started = time.perf_counter()
+        communicators = []
+        for token in tokens:
+            communicator = WebsocketCommunicator(application, f'/ws/notifications/?token={token}')
+            connected, _ = await communicator.connect()
+            if not connected:
+                raise CommandError('A socket was refused')
+            communicators.append(communicator)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'{len(communicators)} sockets connected in {elapsed:.2f}s')
+
+        try:
+            rng = random.Random(0)
+            recipients = [rng.randrange(len(users)) for _ in range(options['events'])]
+            groups = [user_group(users[index].pk) for index in recipients]
+            seconds = await self._deliver(layer, communicators, groups, recipients)
+            self._report('per-user groups', options['events'], seconds)
+
+            dept_id = users[0].department_id
+            members = [index for index, user in enumerate(users) if user.department_id == dept_id]
+            seconds = await self._deliver(layer, communicators, [dept_group(dept_id)], members)
+            self._report(f'department group ({len(members)} sockets)', len(members), seconds, messages=1)
+
+            if options['broadcast']:
+                for user in users:
+                    for channel in layer.groups.get(user_group(user.pk), ()):
+                        await layer.group_add('notifications', channel)
+                events = min(options['events'], 5)
+                started = time.perf_counter()
+                for i in range(events):
+                    await layer.group_send('notifications', {'type': 'notify', 'data': {'event': i}})
+                for communicator in communicators:
+                    for _ in range(events):
+                        await communicator.receive_from(timeout=60)
+                self._report(
+                    'single broadcast group', events * len(communicators), time.perf_counter() - started,
+                    messages=events,
+                )
+        finally:
+            for communicator in communicators:
+                await communicator.disconnect()
+
+    async def _deliver(self, layer, communicators, groups, recipients):
+        """Send to `groups` in turn, then check that exactly `recipients` received."""
+        started = time.perf_counter()
+        for group in groups:
+            await layer.group_send(group, {'type': 'notify', 'data': {'group': group}})
+        for index in recipients:
+            await communicators[index].receive_from()
+        elapsed = time.perf_counter() - started
+        # Nothing else may have arrived anywhere
+        await asyncio.sleep(0.1)
+        strays = sum(1 for communicator in communicators if not communicator.output_queue.empty())
+        if strays:
+            raise CommandError(f'{strays} sockets received an event meant for others')
+        return elapsed
+
+    def _report(self, label, deliveries, seconds, messages=None):
+        messages = deliveries if messages is None else messages
+        self.stdout.write(self.style.SUCCESS(
+            f'{label}: {messages} event(s), {deliveries} deliveries in {seconds * 1000:.0f} ms '
+            f'({seconds / messages * 1e6:.0f} us/event)'
+        ))
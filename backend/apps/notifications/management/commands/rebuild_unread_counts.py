@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.notifications import unread
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the unread notification counters from the notification table and verify them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify-only', action='store_true',
+                            help='Only compare the counters with a full aggregate, do not rebuild')
+
+    def handle(self, *args, **options):
+        if not options['verify_only']:
+            unread.rebuild()
+            self.stdout.write('Rebuilt unread counters')
+
+        expected = unread.aggregate()
+        actual = unread.stored()
+        mismatches = sorted(
+            (user_id, expected.get(user_id, 0), actual.get(user_id, 0))
+            for user_id in expected.keys() | actual.keys()
+            if expected.get(user_id, 0) != actual.get(user_id, 0)
+        )
+        for user_id, want, got in mismatches:
+            self.stdout.write(self.style.ERROR(f'user={user_id}: expected {want}, counter has {got}'))
+        if mismatches:
+            raise CommandError(f'{len(mismatches)} unread counter(s) out of sync')
+        self.stdout.write(self.style.SUCCESS(f'{len(expected)} unread counter(s) verified'))
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.6 on 2026-10-17 20:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_unread_counts(apps, schema_editor):
+    Notification = apps.get_model('notifications', 'Notification')
+    UnreadCount = apps.get_model('notifications', 'UnreadCount')
+    rows = Notification.objects.filter(is_read=False).order_by().values_list('user_id').annotate(total=Count('id'))
+    UnreadCount.objects.bulk_create(
+        [UnreadCount(user_id=user_id, count=total) for user_id, total in rows], batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_alter_notification_type'),
+        ('users', '0005_user_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnreadCount',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='unread_count', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_unread_counts, migrations.RunPython.noop),
+    ]
@@ -5,6 +5,7 @@ class Notification(models.Model):
     NOTIF_TYPES = [
         ('task_assigned','Task Assigned'),
         ('task_completed','Task Completed'),
+        ('task_overdue','Task Overdue'),
         ('message','New Message'),
     ]
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
@@ -15,6 +16,25 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', 'timestamp'], name='notif_user_timestamp_idx'),
+            models.Index(fields=['user', 'is_read', 'timestamp'], name='notif_user_read_ts_idx'),
+        ]
 
     def __str__(self):
         return f"{self.type} -> {self.user_id}: {self.message[:30]}"
+
+
+class UnreadCount(models.Model):
+    """
+    Number of unread notifications per user, kept in step with Notification
+    writes (see apps.notifications.unread) so the unread badge never counts
+    the notification table. A missing row means no unread notifications.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='unread_count'
+    )
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.count}"
@@ -0,0 +1,47 @@
+"""
+Real-time delivery of notifications over WebSockets.
+
+Each NotificationConsumer joins the group of its user (`user.<id>`) and of
+its department (`dept.<id>`). A notification is sent to its recipient's
+group only, so the work per event is proportional to that user's open
+sockets, not to everyone connected. Messages are handed to the channel
+layer once the surrounding transaction commits, so clients never hear of
+rows they cannot read yet.
+"""
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+
+def user_group(user_id):
+    return f'user.{user_id}'
+
+
+def dept_group(dept_id):
+    return f'dept.{dept_id}'
+
+
+def push_notifications(notifications):
+    from .serializers import NotificationSerializer
+    messages = [
+        (user_group(notification.user_id), {'type': 'notify', 'data': NotificationSerializer(notification).data})
+        for notification in notifications
+    ]
+    if messages:
+        transaction.on_commit(lambda: send(messages))
+
+
+def push_to_department(dept_id, data):
+    transaction.on_commit(lambda: send([(dept_group(dept_id), {'type': 'notify', 'data': data})]))
+
+
+def send(messages):
+    """Send [(group, message)] through the channel layer, from synchronous code."""
+    layer = get_channel_layer()
+    if layer is not None:
+        async_to_sync(_group_send_all)(layer, messages)
+
+
+async def _group_send_all(layer, messages):
+    for group, message in messages:
+        await layer.group_send(group, message)
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent after notifications were stored with bulk_create, which bypasses
+# post_save. Argument: `notifications` (list of Notification). On MySQL their
+# primary keys are not set, since it does not return ids from a bulk insert.
+notifications_bulk_created = Signal()
@@ -0,0 +1,82 @@
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase
+from django.urls import path
+
+from apps.messaging.models import Message
+from apps.users import token_versions
+from apps.users.authentication import EmailTokenObtainPairSerializer
+from apps.users.models import Department
+from .consumers import CLOSE_UNAUTHORIZED, NotificationConsumer
+from .models import Notification
+
+User = get_user_model()
+application = URLRouter([path('ws/notifications/', NotificationConsumer.as_asgi())])
+
+
+class TestNotificationConsumer(TransactionTestCase):
+    def setUp(self):
+        token_versions.clear()
+        self.dept = Department.objects.create(name='Engineering')
+        self.alice = User.objects.create_user(
+            email='alice@example.com', username='alice', password='testpass123', department=self.dept,
+        )
+        self.bob = User.objects.create_user(
+            email='bob@example.com', username='bob', password='testpass123', department=self.dept,
+        )
+
+    def _token(self, user):
+        return str(EmailTokenObtainPairSerializer.get_token(user).access_token)
+
+    async def _connect(self, user=None, subprotocol=False):
+        token = self._token(user) if user else ''
+        if subprotocol:
+            communicator = WebsocketCommunicator(application, '/ws/notifications/', subprotocols=['bearer', token])
+        else:
+            communicator = WebsocketCommunicator(application, f'/ws/notifications/?token={token}')
+        connected, accepted = await communicator.connect()
+        return communicator, connected, accepted
+
+    async def _assert_closed_unauthorized(self, communicator):
+        self.assertEqual(await communicator.receive_output(), {'type': 'websocket.close', 'code': CLOSE_UNAUTHORIZED})
+
+    async def test_rejects_missing_and_revoked_tokens(self):
+        communicator, connected, _ = await self._connect()
+        self.assertTrue(connected)
+        await self._assert_closed_unauthorized(communicator)
+
+        token = self._token(self.alice)
+        self.alice.set_password('newpass12345')
+        await database_sync_to_async(self.alice.save)()
+        communicator = WebsocketCommunicator(application, '/ws/notifications/', subprotocols=['bearer', token])
+        connected, accepted = await communicator.connect()
+        self.assertEqual((connected, accepted), (True, 'bearer'))
+        await self._assert_closed_unauthorized(communicator)
+
+    async def test_notification_reaches_its_recipient_only(self):
+        alice, connected, _ = await self._connect(self.alice)
+        self.assertTrue(connected)
+        bob, connected, accepted = await self._connect(self.bob, subprotocol=True)
+        self.assertTrue(connected)
+        self.assertEqual(accepted, 'bearer')
+
+        await database_sync_to_async(Notification.objects.create)(user=self.alice, type='message', message='Hi')
+        event = await alice.receive_json_from()
+        self.assertEqual((event['user'], event['message']), (self.alice.id, 'Hi'))
+        self.assertTrue(await bob.receive_nothing())
+
+        await alice.disconnect()
+        await bob.disconnect()
+
+    async def test_department_messages_reach_the_department(self):
+        alice, _, _ = await self._connect(self.alice)
+        bob, _, _ = await self._connect(self.bob)
+        message = await database_sync_to_async(Message.objects.create)(
+            sender=self.alice, dept=self.dept, message_body='Stand-up in 5',
+        )
+        for communicator in (alice, bob):
+            event = await communicator.receive_json_from()
+            self.assertEqual(event, {'type': 'department_message', 'message_id': message.id, 'sender': self.alice.id})
+            await communicator.disconnect()
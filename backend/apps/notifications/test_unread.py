@@ -0,0 +1,121 @@
+import asyncio
+import json
+
+from channels.db import database_sync_to_async
+from channels.testing import HttpCommunicator
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.users import token_versions
+from apps.users.authentication import EmailTokenObtainPairSerializer
+from . import unread
+from .consumers import UnreadCountConsumer
+from .models import Notification, UnreadCount
+from .signals import notifications_bulk_created
+
+User = get_user_model()
+
+
+def _notify(user, message='Hi'):
+    return Notification.objects.create(user=user, type='message', message=message)
+
+
+class TestUnreadCounter(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(email='alice@example.com', username='alice', password='testpass123')
+        self.bob = User.objects.create_user(email='bob@example.com', username='bob', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def test_counter_follows_creates_reads_and_deletes(self):
+        first, second = _notify(self.alice), _notify(self.alice)
+        _notify(self.bob)
+        notifications = Notification.objects.bulk_create([
+            Notification(user=self.alice, type='task_assigned', message='Task'),
+            Notification(user=self.alice, type='task_assigned', message='Read already', is_read=True),
+        ])
+        notifications_bulk_created.send(sender=Notification, notifications=notifications)
+        self.assertEqual((unread.count(self.alice.pk), unread.count(self.bob.pk)), (3, 1))
+
+        unread.mark_read(self.alice.pk, [first.pk])
+        unread.mark_read(self.alice.pk, [first.pk])   # already read: no change
+        self.assertEqual(unread.count(self.alice.pk), 2)
+        second.delete()
+        self.assertEqual(unread.count(self.alice.pk), 1)
+        self.assertEqual(unread.stored(), unread.aggregate())
+
+        self.bob.delete()
+        self.assertFalse(UnreadCount.objects.filter(user_id=self.bob.pk).exists())
+
+    def test_count_endpoint_reads_the_counter_only(self):
+        _notify(self.alice)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/notifications/unread-count/')
+        self.assertEqual(response.data, {'count': 1})
+        self.assertFalse([q['sql'] for q in queries.captured_queries if 'notifications_notification' in q['sql']])
+
+    def test_mark_read_endpoints(self):
+        mine = [_notify(self.alice, f'n{i}') for i in range(3)]
+        theirs = _notify(self.bob)
+
+        response = self.client.post(f'/api/notifications/{mine[0].pk}/read/')
+        self.assertEqual(response.data, {'count': 2})
+        self.assertEqual(self.client.post(f'/api/notifications/{theirs.pk}/read/').status_code, 404)
+
+        response = self.client.post('/api/notifications/read/', {'ids': [mine[1].pk, theirs.pk]}, format='json')
+        self.assertEqual(response.data, {'marked': 1, 'count': 1})
+        self.assertEqual(self.client.post('/api/notifications/read/', {'ids': 'all'}, format='json').status_code, 400)
+        response = self.client.post('/api/notifications/read/')
+        self.assertEqual(response.data, {'marked': 1, 'count': 0})
+        self.assertFalse(Notification.objects.get(pk=theirs.pk).is_read)
+        self.assertEqual(unread.count(self.bob.pk), 1)
+
+
+class TestUnreadCountWatch(TransactionTestCase):
+    def setUp(self):
+        token_versions.clear()
+        self.alice = User.objects.create_user(email='alice@example.com', username='alice', password='testpass123')
+        self.token = str(EmailTokenObtainPairSerializer.get_token(self.alice).access_token)
+
+    def _communicator(self, query='', headers=None):
+        headers = [(b'authorization', f'Bearer {self.token}'.encode()), *(headers or [])]
+        return HttpCommunicator(
+            UnreadCountConsumer.as_asgi(), 'GET', f'/api/notifications/unread-count/watch/?{query}', headers=headers,
+        )
+
+    async def test_rejects_missing_tokens(self):
+        communicator = HttpCommunicator(UnreadCountConsumer.as_asgi(), 'GET', '/api/notifications/unread-count/watch/')
+        self.assertEqual((await communicator.get_response())['status'], 401)
+
+    async def test_long_poll_answers_when_the_count_changes(self):
+        response = await self._communicator('since=5').get_response()
+        self.assertEqual(json.loads(response['body']), {'count': 0})
+
+        waiting = asyncio.ensure_future(self._communicator('since=0').get_response(timeout=5))
+        await asyncio.sleep(0.2)
+        self.assertFalse(waiting.done())
+        await database_sync_to_async(_notify)(self.alice)
+        response = await waiting
+        self.assertEqual(json.loads(response['body']), {'count': 1})
+
+    @override_settings(NOTIFICATION_WAIT_TIMEOUT=0.2)
+    async def test_long_poll_times_out_with_the_same_count(self):
+        response = await self._communicator('since=0').get_response(timeout=2)
+        self.assertEqual(json.loads(response['body']), {'count': 0})
+
+    async def test_event_stream_sends_each_new_count(self):
+        communicator = self._communicator(headers=[(b'accept', b'text/event-stream')])
+        await communicator.send_input({'type': 'http.request', 'body': b''})
+        start = await communicator.receive_output(2)
+        self.assertIn((b'Content-Type', b'text/event-stream'), start['headers'])
+        self.assertEqual((await communicator.receive_output(2))['body'], b'retry: 3000\ndata: {"count": 0}\n\n')
+
+        notification = await database_sync_to_async(_notify)(self.alice)
+        self.assertEqual((await communicator.receive_output(2))['body'], b'data: {"count": 1}\n\n')
+        await database_sync_to_async(unread.mark_read)(self.alice.pk, [notification.pk])
+        self.assertEqual((await communicator.receive_output(2))['body'], b'data: {"count": 0}\n\n')
+        await communicator.send_input({'type': 'http.disconnect'})
+        communicator.future.cancel()
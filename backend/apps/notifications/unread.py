@@ -0,0 +1,134 @@
+"""
+Per-user unread notification counters.
+
+UnreadCount holds each user's number of unread notifications. The receivers
+in apps.signals add new and deleted notifications, and `mark_read()` takes
+read ones off, with `UPDATE ... SET count = count + n` as the task counters
+do (apps.tasks.stats). Reading the badge is then one primary-key lookup.
+
+After each change commits, the new count is pushed to the user's group as
+{"type": "unread_count", "count": n}: it reaches the user's notification
+sockets and wakes the held unread-count requests (`CountChanges`).
+"""
+import asyncio
+from collections import Counter
+
+from channels.layers import get_channel_layer
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import Notification, UnreadCount
+from .push import send, user_group
+
+
+def count(user_id):
+    return UnreadCount.objects.filter(user_id=user_id).values_list('count', flat=True).first() or 0
+
+
+def deltas_for(notifications, sign=1):
+    deltas = Counter()
+    for notification in notifications:
+        if not notification.is_read:
+            deltas[notification.user_id] += sign
+    return deltas
+
+
+def apply(deltas):
+    """Add {user id: delta} to the counters and push the new counts after commit."""
+    changed = [user_id for user_id, delta in deltas.items() if delta]
+    for user_id in changed:
+        delta = deltas[user_id]
+        counter = UnreadCount.objects.filter(user_id=user_id)
+        if counter.update(count=F('count') + delta) or delta < 0:
+            # A missing counter is zero; taking from it can only come from a
+            # cascade that is deleting the user, so it is not created then
+            continue
+        try:
+            with transaction.atomic():
+                UnreadCount.objects.create(user_id=user_id, count=delta)
+        except IntegrityError:
+            # Another writer created the counter first
+            counter.update(count=F('count') + delta)
+    if changed:
+        transaction.on_commit(lambda: push_counts(changed))
+
+
+def mark_read(user_id, ids=None):
+    """Mark the user's unread notifications (all, or those in `ids`) read; returns how many were."""
+    with transaction.atomic():
+        notifications = Notification.objects.filter(user_id=user_id, is_read=False)
+        if ids is not None:
+            notifications = notifications.filter(id__in=ids)
+        marked = notifications.update(is_read=True)
+        apply({user_id: -marked})
+    return marked
+
+
+def push_counts(user_ids):
+    counts = dict(UnreadCount.objects.filter(user_id__in=user_ids).values_list('user_id', 'count'))
+    send([
+        (user_group(user_id), {'type': 'notify', 'data': {'type': 'unread_count', 'count': counts.get(user_id, 0)}})
+        for user_id in user_ids
+    ])
+
+
+def aggregate():
+    """Counters recomputed from the notification table: {user id: count}."""
+    rows = Notification.objects.filter(is_read=False).order_by().values_list('user_id').annotate(total=Count('id'))
+    return dict(rows.iterator())
+
+
+def stored():
+    return dict(UnreadCount.objects.exclude(count=0).values_list('user_id', 'count').iterator())
+
+
+def rebuild():
+    with transaction.atomic():
+        UnreadCount.objects.all().delete()
+        UnreadCount.objects.bulk_create(
+            [UnreadCount(user_id=user_id, count=total) for user_id, total in aggregate().items()],
+            batch_size=1000,
+        )
+
+
+class CountChanges:
+    """
+    The counts pushed for one user while the block runs:
+
+        async with CountChanges(user_id) as changes:
+            new_count = await changes.next(timeout)   # None if nothing changed in time
+
+    Join before reading the current count, so no change can fall in between.
+    """
+
+    def __init__(self, user_id):
+        self.group = user_group(user_id)
+        self.layer = get_channel_layer()
+        self.channel = None
+
+    async def __aenter__(self):
+        if self.layer is not None:
+            self.channel = await self.layer.new_channel()
+            await self.layer.group_add(self.group, self.channel)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self.channel is not None:
+            await self.layer.group_discard(self.group, self.channel)
+
+    async def next(self, timeout):
+        if self.channel is None:
+            # No channel layer: nothing will ever be pushed
+            await asyncio.sleep(timeout)
+            return None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                message = await asyncio.wait_for(self.layer.receive(self.channel), remaining)
+            except asyncio.TimeoutError:
+                return None
+            data = message.get('data') or {}
+            if data.get('type') == 'unread_count':
+                return data['count']
+        return None
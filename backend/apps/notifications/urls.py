@@ -1,3 +1,8 @@
 from django.urls import path
-from .views import NotificationListView
-urlpatterns = [ path('', NotificationListView.as_view(), name='notifications') ]
+from .views import MarkReadView, NotificationListView, NotificationReadView, UnreadCountView
+urlpatterns = [
+    path('', NotificationListView.as_view(), name='notifications'),
+    path('unread-count/', UnreadCountView.as_view(), name='notifications-unread-count'),
+    path('read/', MarkReadView.as_view(), name='notifications-mark-read'),
+    path('<int:pk>/read/', NotificationReadView.as_view(), name='notification-read'),
+]
@@ -1,4 +1,10 @@
+from django.http import Http404
 from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import unread
 from .models import Notification
 from .serializers import NotificationSerializer
 
@@ -7,4 +13,41 @@ class NotificationListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        queryset = Notification.objects.filter(user_id=self.request.user.pk)
+        # Filter by read state if provided (?is_read=false for unread only)
+        is_read = self.request.query_params.get('is_read', None)
+        if is_read is not None:
+            queryset = queryset.filter(is_read=is_read.lower() in ('1', 'true'))
+        return queryset
+
+
+class UnreadCountView(APIView):
+    """The caller's unread notification count, from its counter (see apps.notifications.unread)."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response({'count': unread.count(request.user.pk)})
+
+
+class MarkReadView(APIView):
+    """Mark the caller's notifications read: those in `ids`, or all of them."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        ids = request.data.get('ids')
+        if ids is not None and (
+            not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids)
+        ):
+            raise ValidationError({'ids': ['Must be a list of notification ids.']})
+        marked = unread.mark_read(request.user.pk, ids)
+        return Response({'marked': marked, 'count': unread.count(request.user.pk)})
+
+
+class NotificationReadView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, pk):
+        if not Notification.objects.filter(pk=pk, user_id=request.user.pk).exists():
+            raise Http404
+        unread.mark_read(request.user.pk, [pk])
+        return Response({'count': unread.count(request.user.pk)})
@@ -0,0 +1,223 @@
+"""
+Keyset (cursor) pagination shared by the API list endpoints.
+
+Pages are addressed by an opaque cursor holding the ordering values of the
+last row seen instead of an OFFSET, so fetching page N costs the same as
+fetching page 1 and no COUNT(*) is ever issued. The response body stays a
+plain JSON list; the next/previous page URLs are sent in a `Link` header.
+"""
+import base64
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder truncates datetimes to milliseconds; keyset values must round-trip exactly."""
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(payload):
+    """Serialize a cursor payload into an opaque URL-safe token."""
+    raw = json.dumps(payload, cls=CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Inverse of `encode_cursor`; returns None for malformed tokens."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (TypeError, ValueError, UnicodeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate on the queryset's ordering with the primary key appended as a
+    tiebreaker, e.g. `-created_at` becomes `(-created_at, -id)`.
+
+    The ordering is taken from the queryset after the filter backends ran, so
+    `?ordering=` from `OrderingFilter` keeps working; otherwise the model's
+    `Meta.ordering` is used.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        self.page_size = api_settings.PAGE_SIZE
+        self.next_values = None
+        self.previous_values = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+        self.keys = [self._resolve_key(queryset.model, name) for name in self.ordering]
+
+        cursor = self.decode_request_cursor(request)
+        reverse = bool(cursor and cursor.get('r'))
+
+        queryset = queryset.order_by(*self._order_by(reverse))
+        if cursor is not None:
+            queryset = queryset.filter(self._beyond(cursor['v'], reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        self.next_values = self._values(results[-1]) if has_next and results else None
+        self.previous_values = self._values(results[0]) if has_previous and results else None
+        return results
+
+    def get_paginated_response(self, data):
+        links = []
+        next_link = self.get_next_link()
+        if next_link:
+            links.append(f'<{next_link}>; rel="next"')
+        previous_link = self.get_previous_link()
+        if previous_link:
+            links.append(f'<{previous_link}>; rel="previous"')
+        headers = {'Link': ', '.join(links)} if links else None
+        return Response(data, headers=headers)
+
+    def get_paginated_response_schema(self, schema):
+        return schema
+
+    def get_page_size(self, request):
+        page_size = self.page_size
+        if self.page_size_query_param in request.query_params:
+            try:
+                page_size = int(request.query_params[self.page_size_query_param])
+            except (TypeError, ValueError):
+                return self.page_size
+            if page_size <= 0:
+                return self.page_size
+        if page_size and self.max_page_size:
+            page_size = min(page_size, self.max_page_size)
+        return page_size
+
+    def get_next_link(self):
+        if self.next_values is None:
+            return None
+        return self._link(self.next_values, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_values is None:
+            return None
+        return self._link(self.previous_values, reverse=True)
+
+    def get_ordering(self, queryset):
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        if not ordering:
+            ordering = ['pk']
+        for name in ordering:
+            if not isinstance(name, str) or name == '?':
+                raise ImproperlyConfigured(
+                    'KeysetPagination only supports ordering by plain field names, got %r.' % (name,)
+                )
+        if not any(name.lstrip('-') in ('pk', queryset.model._meta.pk.name) for name in ordering):
+            ordering.append('-pk' if ordering[0].startswith('-') else 'pk')
+        return ordering
+
+    def decode_request_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        payload = decode_cursor(token)
+        if (
+            payload is None
+            or payload.get('o') != self.ordering
+            or not isinstance(payload.get('v'), list)
+            or len(payload['v']) != len(self.keys)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            payload['v'] = [
+                field.to_python(value) if field is not None and value is not None else value
+                for (_, _, field, _), value in zip(self.keys, payload['v'])
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return payload
+
+    def _resolve_key(self, model, name):
+        """Return (lookup, descending, model field or None, nullable)."""
+        descending = name.startswith('-')
+        lookup = name.lstrip('-')
+        if lookup == 'pk':
+            lookup = model._meta.pk.name
+        try:
+            field = model._meta.get_field(lookup)
+        except FieldDoesNotExist:
+            # Annotations (e.g. a search rank) are compared as plain values.
+            return lookup, descending, None, False
+        if field.is_relation:
+            lookup = field.attname
+        return lookup, descending, field, field.null
+
+    def _order_by(self, reverse):
+        order_by = []
+        for lookup, descending, _, nullable in self.keys:
+            descending = descending != reverse
+            kwargs = {}
+            if nullable:
+                kwargs = {'nulls_first': True} if reverse else {'nulls_last': True}
+            expression = F(lookup)
+            order_by.append(expression.desc(**kwargs) if descending else expression.asc(**kwargs))
+        return order_by
+
+    def _beyond(self, values, reverse):
+        """Build the lexicographic `row > cursor` predicate for the traversal direction."""
+        condition = None
+        for (lookup, descending, _, nullable), value in reversed(list(zip(self.keys, values))):
+            strictly = self._strictly_beyond(lookup, descending != reverse, nullable, reverse, value)
+            if condition is None:
+                condition = strictly
+            else:
+                equal = Q(**{f'{lookup}__isnull': True}) if value is None else Q(**{lookup: value})
+                condition = strictly | (equal & condition)
+        return condition
+
+    @staticmethod
+    def _strictly_beyond(lookup, descending, nullable, reverse, value):
+        # NULLs sort last when walking forward and therefore first when walking back.
+        if value is None:
+            return Q(**{f'{lookup}__isnull': False}) if reverse else Q(pk__in=[])
+        comparison = Q(**{f"{lookup}__{'lt' if descending else 'gt'}": value})
+        if nullable and not reverse:
+            comparison |= Q(**{f'{lookup}__isnull': True})
+        return comparison
+
+    def _values(self, obj):
+        return [getattr(obj, lookup) for lookup, _, _, _ in self.keys]
+
+    def _link(self, values, reverse):
+        payload = {'o': self.ordering, 'v': values}
+        if reverse:
+            payload['r'] = 1
+        url = remove_query_param(self.base_url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, encode_cursor(payload))
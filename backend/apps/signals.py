@@ -1,20 +1,183 @@
-from django.db.models.signals import post_save
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.db import transaction
 from django.dispatch import receiver
-from apps.tasks.models import Task
+from django.utils import timezone
+from apps import conditional
+from apps.users import principal, token_versions
+from apps.users.models import Role
+from apps.tasks.models import Task, Comment, TaskEvent
+from apps.tasks import deadlines, feed, search, stats
+from apps.tasks.signals import tasks_bulk_saved
 from apps.messaging.models import Message
 from apps.notifications.models import Notification
+from apps.notifications import unread
+from apps.notifications.push import push_notifications, push_to_department
+from apps.notifications.signals import notifications_bulk_created
+
+User = get_user_model()
+
+def _task_notifications(task, created):
+    if created:
+        if task.assigned_to_id:
+            return Notification(user_id=task.assigned_to_id, type='task_assigned',
+                                message=f"New task assigned: {task.task_title}")
+    elif task.status == 'completed' and 'status' in task.changed_fields() and task.assigned_by_id:
+        return Notification(user_id=task.assigned_by_id, type='task_completed',
+                            message=f"Task completed: {task.task_title}")
+    return None
 
 @receiver(post_save, sender=Task)
 def task_notification(sender, instance, created, **kwargs):
-    if created:
-        Notification.objects.create(user=instance.assigned_to, type='task_assigned',
-                                    message=f"New task assigned: {instance.task_title}")
-    elif instance.status == 'completed':
-        Notification.objects.create(user=instance.assigned_by, type='task_completed',
-                                    message=f"Task completed: {instance.task_title}")
+    notification = _task_notifications(instance, created)
+    if notification:
+        notification.save()
+
+@receiver(tasks_bulk_saved, sender=Task)
+def bulk_task_notifications(sender, created, updated, **kwargs):
+    notifications = [_task_notifications(task, True) for task in created]
+    notifications += [_task_notifications(task, False) for task in updated]
+    notifications = Notification.objects.bulk_create([n for n in notifications if n is not None])
+    notifications_bulk_created.send(sender=Notification, notifications=notifications)
 
 @receiver(post_save, sender=Message)
 def message_notification(sender, instance, created, **kwargs):
     if created and instance.receiver:
         Notification.objects.create(user=instance.receiver, type='message',
                                     message=f"New message from {instance.sender.username}")
+    elif created and instance.dept_id:
+        # Department-wide message: no notification rows, just a live event for the department
+        push_to_department(instance.dept_id, {
+            'type': 'department_message', 'message_id': instance.id, 'sender': instance.sender_id,
+        })
+
+@receiver(post_save, sender=Notification)
+def notification_push(sender, instance, created, **kwargs):
+    if created:
+        push_notifications([instance])
+
+@receiver(notifications_bulk_created, sender=Notification)
+def bulk_notification_push(sender, notifications, **kwargs):
+    push_notifications(notifications)
+
+@receiver(post_save, sender=Notification)
+def notification_unread_count(sender, instance, created, **kwargs):
+    if created:
+        unread.apply(unread.deltas_for([instance]))
+
+@receiver(notifications_bulk_created, sender=Notification)
+def bulk_notification_unread_count(sender, notifications, **kwargs):
+    unread.apply(unread.deltas_for(notifications))
+
+@receiver(post_delete, sender=Notification)
+def notification_unread_count_deleted(sender, instance, **kwargs):
+    unread.apply(unread.deltas_for([instance], sign=-1))
+
+@receiver(post_save, sender=Task)
+def task_search_index(sender, instance, **kwargs):
+    search.index.task_saved(instance)
+
+@receiver(tasks_bulk_saved, sender=Task)
+def bulk_task_search_index(sender, created, updated, **kwargs):
+    for task in created + updated:
+        search.index.task_saved(task)
+
+@receiver(post_delete, sender=Task)
+def task_search_unindex(sender, instance, **kwargs):
+    search.index.task_deleted(instance.pk)
+
+@receiver(post_save, sender=Comment)
+def comment_search_index(sender, instance, **kwargs):
+    search.index.comment_saved(instance)
+
+@receiver(post_delete, sender=Comment)
+def comment_search_unindex(sender, instance, **kwargs):
+    search.index.comment_deleted(instance)
+
+@receiver(post_save, sender=Task)
+def task_stats_saved(sender, instance, created, **kwargs):
+    if created:
+        stats.apply(stats.task_deltas(created=[instance]))
+    else:
+        stats.apply(stats.task_deltas(updated=[instance]))
+
+@receiver(post_delete, sender=Task)
+def task_stats_deleted(sender, instance, **kwargs):
+    stats.apply(stats.task_deltas(deleted=[instance]))
+
+@receiver(tasks_bulk_saved, sender=Task)
+def bulk_task_stats(sender, created, updated, **kwargs):
+    stats.apply(stats.task_deltas(created=created, updated=updated))
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_touch_task(sender, instance, **kwargs):
+    # comment_count is part of the list representation, so the task counts as
+    # updated: for conditional GETs and in the event feed delta sync follows
+    task = Task.objects.filter(pk=instance.task_id).first()
+    if task is None:
+        return
+    Task.objects.filter(pk=task.pk).update(updated_at=timezone.now())
+    TaskEvent.objects.bulk_create(TaskEvent.for_write(task))
+    feed.publish_on_commit()
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(tasks_bulk_saved, sender=Task)
+def invalidate_task_watermarks(sender, **kwargs):
+    conditional.invalidate('tasks')
+
+@receiver(post_save, sender=Message)
+@receiver(post_delete, sender=Message)
+def invalidate_message_watermarks(sender, **kwargs):
+    conditional.invalidate('messages')
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_watermarks(sender, **kwargs):
+    conditional.invalidate('users')
+
+@receiver(post_save, sender=Task)
+def task_deadline_saved(sender, instance, **kwargs):
+    deadlines.scheduler.task_saved(instance)
+
+@receiver(tasks_bulk_saved, sender=Task)
+def bulk_task_deadlines(sender, created, updated, **kwargs):
+    for task in created + updated:
+        deadlines.scheduler.task_saved(task)
+
+@receiver(post_delete, sender=Task)
+def task_deadline_deleted(sender, instance, **kwargs):
+    deadlines.scheduler.task_deleted(instance.pk)
+
+@receiver(post_save, sender=Task)
+def task_saved_event(sender, instance, created, **kwargs):
+    TaskEvent.objects.bulk_create(TaskEvent.for_write(instance, created=created))
+    feed.publish_on_commit()
+
+@receiver(tasks_bulk_saved, sender=Task)
+def bulk_task_events(sender, created, updated, **kwargs):
+    events = [event for task in created for event in TaskEvent.for_write(task, created=True)]
+    events += [event for task in updated for event in TaskEvent.for_write(task)]
+    TaskEvent.objects.bulk_create(events, batch_size=500)
+    feed.publish_on_commit()
+
+@receiver(post_delete, sender=Task)
+def task_deleted_event(sender, instance, **kwargs):
+    TaskEvent.objects.bulk_create(TaskEvent.for_write(instance, deleted=True))
+    feed.publish_on_commit()
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def role_names_changed(sender, **kwargs):
+    principal.clear_role_names()
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def token_version_changed(sender, instance, **kwargs):
+    # Reload on next use; again after commit, in case another request re-read the old row meanwhile
+    user_id = instance.pk
+    token_versions.forget(user_id)
+    transaction.on_commit(lambda: token_versions.forget(user_id))
@@ -0,0 +1,243 @@
+"""
+Deadline engine: marks tasks overdue, notifies the people involved and
+escalates the priority once a task's due date has passed.
+
+Upcoming deadlines are kept in a min-heap ordered by deadline, so the engine
+sleeps until the next one instead of polling the task table. The heap is
+filled from an indexed `due_date` query when the scheduler starts and once
+per day as the horizon moves forward. The scheduler runs in its own process
+(manage.py run_deadline_scheduler), where no web request saves tasks, so in
+between it follows the task event feed (apps.tasks.feed): every
+FEED_POLL_INTERVAL, and before firing, it reads the events published since
+its last position and reschedules or cancels the tasks whose deadline may
+have changed, from their current rows. The Task receivers in `apps.signals`
+still update the heap directly for saves made in the scheduler's own
+process. The daily load takes every open task due by the end of the horizon
+that is not overdue yet, however far back its due date, so it also repairs
+anything the feed missed.
+
+A task is due by the end of its `due_date` in the project time zone, i.e. its
+deadline is midnight at the start of the following day.
+"""
+import heapq
+import itertools
+import logging
+import threading
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.notifications.models import Notification
+from apps.notifications.signals import notifications_bulk_created
+from .models import Task, TaskEvent, TaskEventSequence
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ('pending', 'in_progress')
+# How far ahead deadlines are loaded
+HORIZON = timedelta(days=7)
+ESCALATION = {'low': 'medium', 'medium': 'high'}
+# How often run_forever reads the task event feed while no deadline is due
+FEED_POLL_INTERVAL = timedelta(seconds=30)
+FEED_BATCH = 1000
+# Events that can add, move or end a task's deadline
+DEADLINE_EVENT_KINDS = (TaskEvent.CREATED, TaskEvent.DELETED, TaskEvent.MOVED_IN)
+DEADLINE_CHANGE_BITS = TaskEvent.CHANGE_BITS['status'] | TaskEvent.CHANGE_BITS['due_date']
+
+
+class SystemClock:
+    def now(self):
+        return timezone.now()
+
+
+class SimulatedClock:
+    """Clock for tests: time only moves when `advance()` is called."""
+
+    def __init__(self, start):
+        self._now = start
+
+    def now(self):
+        return self._now
+
+    def advance(self, delta):
+        self._now += delta
+
+
+def deadline_for(due_date):
+    return timezone.make_aware(datetime.combine(due_date + timedelta(days=1), time.min))
+
+
+class DeadlineScheduler:
+    def __init__(self, clock=None):
+        self.clock = clock or SystemClock()
+        self._heap = []                 # (deadline, sequence, task_id)
+        self._deadlines = {}            # task_id -> deadline of its live heap entry
+        self._sequence = itertools.count()
+        self._wakeup = threading.Condition()
+        self._loaded_day = None         # local date the horizon was last loaded for
+        self._feed_position = 0         # last TaskEvent.seq applied to the schedule
+
+    @property
+    def loaded(self):
+        return self._loaded_day is not None
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    # Schedule maintenance
+
+    def schedule(self, task_id, deadline):
+        with self._wakeup:
+            if self._deadlines.get(task_id) == deadline:
+                return
+            self._deadlines[task_id] = deadline
+            heapq.heappush(self._heap, (deadline, next(self._sequence), task_id))
+            self._wakeup.notify()
+
+    def cancel(self, task_id):
+        # The heap entry is left behind and skipped when it surfaces
+        with self._wakeup:
+            self._deadlines.pop(task_id, None)
+
+    def task_saved(self, task):
+        if self.loaded:
+            self._follow(task.pk, task.due_date, task.status, task.overdue_at)
+
+    def _follow(self, task_id, due_date, status, overdue_at):
+        if due_date and status in OPEN_STATUSES and overdue_at is None:
+            self.schedule(task_id, deadline_for(due_date))
+        else:
+            self.cancel(task_id)
+
+    def task_deleted(self, task_id):
+        if self.loaded:
+            self.cancel(task_id)
+
+    def rebuild(self):
+        """Drop the in-memory schedule and reload it from the database."""
+        with self._wakeup:
+            self._heap.clear()
+            self._deadlines.clear()
+            self._loaded_day = None
+        today = timezone.localdate(self.clock.now())
+        # Read first: events published while loading are applied again, not missed
+        position = TaskEventSequence.objects.filter(pk=1).values_list('value', flat=True).first() or 0
+        self._load(today + HORIZON)
+        self._feed_position = position
+        self._loaded_day = today
+
+    def _load(self, last_day):
+        """Schedule every open task due by `last_day` that is not overdue yet."""
+        tasks = (
+            Task.objects.filter(due_date__lte=last_day, status__in=OPEN_STATUSES, overdue_at__isnull=True)
+            .values_list('id', 'due_date')
+        )
+        for task_id, due_date in tasks.iterator(chunk_size=2000):
+            self.schedule(task_id, deadline_for(due_date))
+
+    def follow_feed(self):
+        """Apply the task events published since the last call; return how many were read."""
+        read = 0
+        while True:
+            events = list(
+                TaskEvent.objects.filter(seq__gt=self._feed_position)
+                .order_by('seq').values_list('seq', 'task_id', 'kind', 'changed')[:FEED_BATCH]
+            )
+            task_ids = {
+                task_id for _, task_id, kind, changed in events
+                if kind in DEADLINE_EVENT_KINDS or changed & DEADLINE_CHANGE_BITS
+            }
+            if task_ids:
+                current = {
+                    row[0]: row for row in
+                    Task.objects.filter(id__in=task_ids).values_list('id', 'due_date', 'status', 'overdue_at')
+                }
+                for task_id in task_ids:
+                    if task_id in current:
+                        self._follow(*current[task_id])
+                    else:
+                        self.cancel(task_id)
+            if events:
+                self._feed_position = events[-1][0]
+            read += len(events)
+            if len(events) < FEED_BATCH:
+                return read
+
+    # Firing
+
+    def next_deadline(self):
+        with self._wakeup:
+            self._discard_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def run_pending(self):
+        """Fire every deadline that has passed; return the ids of the tasks marked overdue."""
+        now = self.clock.now()
+        today = timezone.localdate(now)
+        if self._loaded_day is None:
+            self.rebuild()
+        else:
+            if today > self._loaded_day:
+                # Move the horizon; also catches tasks the feed did not report
+                self._load(today + HORIZON)
+                self._loaded_day = today
+            # Tasks written by the web processes since the last poll
+            self.follow_feed()
+
+        due = []
+        with self._wakeup:
+            self._discard_stale()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, task_id = heapq.heappop(self._heap)
+                del self._deadlines[task_id]
+                due.append(task_id)
+                self._discard_stale()
+        if not due:
+            return []
+        return self.fire(due, now)
+
+    def fire(self, task_ids, now):
+        overdue = []
+        notifications = []
+        with transaction.atomic():
+            tasks = Task.objects.select_for_update().filter(
+                id__in=task_ids, status__in=OPEN_STATUSES, overdue_at__isnull=True,
+                due_date__lt=timezone.localdate(now),
+            )
+            for task in tasks:
+                task.overdue_at = now
+                task.priority = ESCALATION.get(task.priority, task.priority)
+                task.save(update_fields=['overdue_at', 'priority', 'updated_at'])
+                overdue.append(task.id)
+                for user_id in {task.assigned_to_id, task.assigned_by_id} - {None}:
+                    notifications.append(Notification(
+                        user_id=user_id, type='task_overdue',
+                        message=f"Task overdue: {task.task_title}"[:255],
+                    ))
+            Notification.objects.bulk_create(notifications)
+            notifications_bulk_created.send(sender=Notification, notifications=notifications)
+        if overdue:
+            logger.info("Marked %d task(s) overdue", len(overdue))
+        return overdue
+
+    def run_forever(self, stop_event):
+        """Fire deadlines as they pass until `stop_event` is set."""
+        while not stop_event.is_set():
+            self.run_pending()
+            now = self.clock.now()
+            tomorrow = deadline_for(timezone.localdate(now))
+            wake_at = min(filter(None, [self.next_deadline(), tomorrow, now + FEED_POLL_INTERVAL]))
+            with self._wakeup:
+                # schedule() notifies, so an earlier deadline re-plans the wait
+                self._wakeup.wait(max((wake_at - now).total_seconds(), 0))
+
+    def _discard_stale(self):
+        while self._heap:
+            deadline, _, task_id = self._heap[0]
+            if self._deadlines.get(task_id) == deadline:
+                return
+            heapq.heappop(self._heap)
+
+
+scheduler = DeadlineScheduler()
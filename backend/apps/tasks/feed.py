@@ -0,0 +1,67 @@
+"""
+Commit-ordered sequence numbers for the task event feed.
+
+Event ids are allocated when the row is inserted, not when its transaction
+commits: a long transaction (a bulk request, a CSV import batch) can commit
+ids below ones a consumer has already read past. So consumers follow `seq`
+instead, which is only set once the event is committed.
+
+After every transaction that adds events, `publish()` runs (on commit). It
+locks the TaskEventSequence row and numbers every committed event that has
+no `seq` yet, in id order, continuing from the row's value. Numbers are
+handed out and committed under that lock, so a number below one already
+visible can never appear later: the feed has no gaps to skip. Events left
+unnumbered by a process that died between commit and publish are numbered
+by the next publish.
+
+The price is one global lock: publishes from every department queue on the
+TaskEventSequence row, each holding it for one numbering UPDATE per
+PUBLISH_BATCH events. A write's own transaction never holds it (publish
+runs after the commit), but the request that made the write waits its turn
+before responding, so under heavy write load every task write pays for the
+length of that queue.
+"""
+from django.db import IntegrityError, transaction
+
+from .models import TaskEvent, TaskEventSequence
+
+PUBLISH_BATCH = 1000
+
+
+def _lock_sequence():
+    counter = TaskEventSequence.objects.select_for_update().filter(pk=1).first()
+    if counter is not None:
+        return counter
+    try:
+        with transaction.atomic():
+            return TaskEventSequence.objects.create(pk=1, value=0)
+    except IntegrityError:
+        # Another publisher created the row first
+        return TaskEventSequence.objects.select_for_update().get(pk=1)
+
+
+def publish():
+    """Number the committed events that have no `seq` yet; returns how many were."""
+    published = 0
+    while True:
+        with transaction.atomic():
+            counter = _lock_sequence()
+            ids = list(
+                TaskEvent.objects.filter(seq__isnull=True).order_by('id').values_list('id', flat=True)[:PUBLISH_BATCH]
+            )
+            if not ids:
+                return published
+            TaskEvent.objects.bulk_update(
+                [TaskEvent(id=event_id, seq=counter.value + i) for i, event_id in enumerate(ids, start=1)],
+                ['seq'], batch_size=500,
+            )
+            counter.value += len(ids)
+            counter.save(update_fields=['value'])
+        published += len(ids)
+        if len(ids) < PUBLISH_BATCH:
+            return published
+
+
+def publish_on_commit():
+    # robust: a failure is logged, and the events wait for the next publish
+    transaction.on_commit(publish, robust=True)
@@ -0,0 +1,25 @@
+from rest_framework.filters import OrderingFilter
+
+
+class TaskOrderingFilter(OrderingFilter):
+    """
+    `?ordering=` for tasks. `priority` is stored as text ('high' < 'low' <
+    'medium'), so it is sorted on the numeric `priority_rank` instead, with
+    `created_at` in the same direction to follow the
+    (dept, priority_rank, created_at) index: `?ordering=-priority` lists the
+    highest priority, newest first.
+    """
+    field_aliases = {'priority': ('priority_rank', 'created_at')}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        expanded = []
+        for term in ordering:
+            prefix = '-' if term.startswith('-') else ''
+            field = term.lstrip('-')
+            for name in self.field_aliases.get(field, (field,)):
+                if not any(seen.lstrip('-') == name for seen in expanded):
+                    expanded.append(prefix + name)
+        return expanded
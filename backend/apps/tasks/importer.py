@@ -0,0 +1,182 @@
+"""
+Bulk CSV import of tasks into one department.
+
+The file is read row by row and handled in batches: the assignee emails of
+a batch are resolved with a single query, rows are validated against the
+Task choices, and the valid ones are inserted with `Task.objects.bulk_insert`
+in a transaction of their own, followed by `tasks_bulk_saved` so counters,
+search and change feeds see the new tasks. Only one batch is in memory at a
+time; invalid rows are reported with their line number and skipped.
+
+A file that cannot be read any further part way through (bad encoding,
+broken quoting) stops the import there: the batches before it stay
+imported, and the result says which line it stopped at and why.
+
+Expected columns (header row required, only task_title is mandatory):
+    task_title, task_desc, status, priority, due_date (YYYY-MM-DD), assigned_to (email)
+"""
+import csv
+from dataclasses import dataclass, field
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from .models import Task
+from .signals import tasks_bulk_saved
+
+BATCH_SIZE = 1000
+# Errors beyond this are counted but not kept, so a broken file cannot exhaust memory
+MAX_REPORTED_ERRORS = 1000
+
+STATUSES = dict(Task.STATUS_CHOICES)
+PRIORITIES = dict(Task.PRIORITY_CHOICES)
+TITLE_MAX_LENGTH = Task._meta.get_field('task_title').max_length
+
+
+class ImportFormatError(Exception):
+    """The file cannot be imported at all (e.g. missing header)."""
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)  # [{'line': n, 'errors': {column: [message]}}]
+    stopped: dict = None  # {'line': n, 'error': message}: nothing from line n on was read
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'rows': self.rows, 'created': self.created, 'failed': self.failed, 'errors': self.errors,
+            'stopped': self.stopped,
+        }
+
+
+def import_tasks(lines, dept, assigned_by=None, batch_size=None, progress=None):
+    """
+    Import tasks from `lines` (an iterable of CSV text lines, e.g. a file
+    opened in text mode) into `dept`. `progress(result)` is called after
+    every batch. Returns an ImportResult.
+    """
+    batch_size = batch_size or BATCH_SIZE
+    reader = csv.DictReader(lines)
+    try:
+        header = [name.strip() for name in reader.fieldnames or []]
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise ImportFormatError(f'The header row cannot be read: {exc}')
+    if 'task_title' not in header:
+        raise ImportFormatError('The header row must contain a task_title column.')
+    reader.fieldnames = header
+
+    result = ImportResult()
+    batch = []
+    for line, row in _read_rows(reader, result):
+        batch.append((line, row))
+        if len(batch) >= batch_size:
+            _import_batch(batch, dept, assigned_by, result)
+            batch = []
+            if progress:
+                progress(result)
+    if batch:
+        _import_batch(batch, dept, assigned_by, result)
+        if progress:
+            progress(result)
+    return result
+
+
+def _read_rows(reader, result):
+    """(line, row) for each row; a line that cannot be read ends the rows and is recorded in `result`."""
+    while True:
+        line = reader.line_num + 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except (UnicodeDecodeError, csv.Error) as exc:
+            # What was read before it is still imported; earlier batches are committed already
+            result.stopped = {'line': line, 'error': str(exc)}
+            return
+        yield reader.line_num, row
+
+
+def _import_batch(batch, dept, assigned_by, result):
+    emails = {_clean(row.get('assigned_to')) for _, row in batch} - {''}
+    emails |= {email.lower() for email in emails}
+    assignees = {}
+    if emails:
+        assignees = {
+            email.lower(): (user_id, dept_id)
+            for email, user_id, dept_id in get_user_model().objects.filter(email__in=emails)
+            .values_list('email', 'id', 'department_id')
+        }
+
+    tasks = []
+    for line, row in batch:
+        result.rows += 1
+        task, errors = _build_task(row, dept, assigned_by, assignees)
+        if errors:
+            result.add_error(line, errors)
+        else:
+            tasks.append(task)
+
+    if tasks:
+        with transaction.atomic():
+            Task.objects.bulk_insert(tasks)
+            tasks_bulk_saved.send(sender=Task, created=tasks, updated=[])
+        for task in tasks:
+            task.remember_state()
+        result.created += len(tasks)
+
+
+def _build_task(row, dept, assigned_by, assignees):
+    errors = {}
+    title = _clean(row.get('task_title'))
+    if not title:
+        errors['task_title'] = ['This field is required.']
+    elif len(title) > TITLE_MAX_LENGTH:
+        errors['task_title'] = [f'Ensure this field has no more than {TITLE_MAX_LENGTH} characters.']
+
+    status = _clean(row.get('status')) or 'pending'
+    if status not in STATUSES:
+        errors['status'] = [f"Invalid status. Must be one of: {', '.join(STATUSES)}"]
+    priority = _clean(row.get('priority')) or 'medium'
+    if priority not in PRIORITIES:
+        errors['priority'] = [f"Invalid priority. Must be one of: {', '.join(PRIORITIES)}"]
+
+    due_date = None
+    raw_due_date = _clean(row.get('due_date'))
+    if raw_due_date:
+        try:
+            due_date = parse_date(raw_due_date)
+        except ValueError:
+            due_date = None
+        if due_date is None:
+            errors['due_date'] = ['Date has wrong format. Use YYYY-MM-DD.']
+
+    assignee_id = None
+    email = _clean(row.get('assigned_to')).lower()
+    if email:
+        assignee = assignees.get(email)
+        if assignee is None:
+            errors['assigned_to'] = [f'No user with email {email}.']
+        elif assignee[1] != dept.id:
+            errors['assigned_to'] = ['You can only assign tasks within your department.']
+        else:
+            assignee_id = assignee[0]
+
+    if errors:
+        return None, errors
+    return Task(
+        task_title=title, task_desc=_clean(row.get('task_desc')), status=status, priority=priority,
+        due_date=due_date, assigned_to_id=assignee_id, assigned_by=assigned_by, dept=dept,
+    ), None
+
+
+def _clean(value):
+    return (value or '').strip()
@@ -0,0 +1,76 @@
+import csv
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.contrib.auth import get_user_model
+
+from apps.users.models import Department
+from apps.tasks.importer import import_tasks
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measure CSV task import throughput (everything is rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000)
+        parser.add_argument('--assignees', type=int, default=50, help='Distinct assignee emails in the file')
+        parser.add_argument('--batch-size', type=int, nargs='+', default=[1000])
+
+    def handle(self, *args, **options):
+        with tempfile.NamedTemporaryFile('w+', suffix='.csv', newline='', encoding='utf-8') as csv_file:
+            emails = [f'import-bench-{i}-{time.time_ns()}@example.com' for i in range(options['assignees'])]
+            self._write_csv(csv_file, options['rows'], emails)
+            self.stdout.write(f"{'rows':>8} {'batch':>6} {'queries':>8} {'seconds':>8} {'rows/s':>9}")
+            for batch_size in options['batch_size']:
+                try:
+                    with transaction.atomic():
+                        dept = self._seed(emails)
+                        csv_file.seek(0)
+                        queries = []
+                        with connection.execute_wrapper(self._count(queries)):
+                            started = time.perf_counter()
+                            result = import_tasks(csv_file, dept, batch_size=batch_size)
+                            elapsed = time.perf_counter() - started
+                        self.stdout.write(
+                            f'{result.created:>8} {batch_size:>6} {len(queries):>8} '
+                            f'{elapsed:>8.2f} {result.created / elapsed:>9.0f}'
+                        )
+                        raise _Rollback
+                except _Rollback:
+                    pass
+
+    @staticmethod
+    def _count(queries):
+        def wrapper(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+        return wrapper
+
+    @staticmethod
+    def _write_csv(csv_file, rows, emails):
+        writer = csv.writer(csv_file)
+        writer.writerow(['task_title', 'task_desc', 'status', 'priority', 'due_date', 'assigned_to'])
+        statuses = ['pending', 'in_progress', 'completed']
+        priorities = ['low', 'medium', 'high']
+        for i in range(rows):
+            writer.writerow([
+                f'Imported task {i}', 'Migrated from the backlog spreadsheet',
+                statuses[i % 3], priorities[i % 3], f'2030-01-{i % 28 + 1:02d}', emails[i % len(emails)],
+            ])
+        csv_file.flush()
+
+    @staticmethod
+    def _seed(emails):
+        dept = Department.objects.create(name=f'import-bench-{time.time_ns()}')
+        User.objects.bulk_create([
+            User(email=email, username=email.split('@')[0], department=dept) for email in emails
+        ])
+        return dept
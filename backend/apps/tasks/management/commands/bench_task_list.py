@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.contrib.auth import get_user_model
+
+from apps.users.models import Department
+from apps.tasks.models import Task, Comment
+from apps.tasks.serializers import TaskSerializer, TaskListSerializer
+from apps.tasks.views import TaskViewSet
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare query count and latency of the full vs. lean task list representation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000],
+                            help='Tasks per department to benchmark')
+        parser.add_argument('--comments', type=int, default=3, help='Comments per task')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'tasks':>8} {'variant':<8} {'queries':>8} {'ms':>10}")
+        for size in options['sizes']:
+            try:
+                with transaction.atomic():
+                    dept, user = self._seed(size, options['comments'])
+                    for variant, run in (('full', self._full), ('lean', self._lean)):
+                        queries = []
+                        with connection.execute_wrapper(self._count(queries)):
+                            started = time.perf_counter()
+                            run(dept, user)
+                            elapsed = (time.perf_counter() - started) * 1000
+                        self.stdout.write(f'{size:>8} {variant:<8} {len(queries):>8} {elapsed:>10.1f}')
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+    @staticmethod
+    def _count(queries):
+        def wrapper(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+        return wrapper
+
+    def _seed(self, size, comments):
+        dept = Department.objects.create(name=f'bench-{time.time_ns()}')
+        user = User.objects.create_user(
+            email=f'bench-{time.time_ns()}@example.com', username=f'bench-{time.time_ns()}',
+            password=None, department=dept,
+        )
+        Task.objects.bulk_create(
+            [Task(task_title=f'Bench task {i}', dept=dept, assigned_to=user, assigned_by=user)
+             for i in range(size)],
+            batch_size=1000,
+        )
+        task_ids = Task.objects.filter(dept=dept).values_list('id', flat=True)
+        Comment.objects.bulk_create(
+            [Comment(task_id=task_id, user=user, content='Bench comment')
+             for task_id in task_ids for _ in range(comments)],
+            batch_size=1000,
+        )
+        return dept, user
+
+    def _full(self, dept, user):
+        # The list payload before the split: every comment embedded per task
+        queryset = Task.objects.filter(dept=dept).select_related('assigned_to', 'assigned_by', 'dept')
+        return TaskSerializer(queryset, many=True).data
+
+    def _lean(self, dept, user):
+        view = TaskViewSet(action='list')
+        view.request = type('BenchRequest', (), {'user': user, 'query_params': {}})()
+        return TaskListSerializer(view.get_queryset(), many=True).data
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+
+from apps.users.models import Department
+from apps.tasks.importer import ImportFormatError, import_tasks
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Import tasks into a department from a CSV file (see apps/tasks/importer.py for the columns)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to import')
+        parser.add_argument('--department', required=True, help='Target department id or name')
+        parser.add_argument('--assigned-by', help='Email of the user recorded as assigner')
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        department = options['department']
+        lookup = {'id': department} if department.isdigit() else {'name': department}
+        dept = Department.objects.filter(**lookup).first()
+        if dept is None:
+            raise CommandError(f'Department {department!r} not found')
+        assigned_by = None
+        if options['assigned_by']:
+            assigned_by = User.objects.filter(email=options['assigned_by']).first()
+            if assigned_by is None:
+                raise CommandError(f"User {options['assigned_by']!r} not found")
+
+        def progress(result):
+            self.stdout.write(f'{result.rows} rows read, {result.created} created, {result.failed} failed')
+
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as lines:
+                result = import_tasks(
+                    lines, dept, assigned_by=assigned_by, batch_size=options['batch_size'], progress=progress
+                )
+        except (OSError, ImportFormatError) as exc:
+            raise CommandError(str(exc))
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        if result.failed > len(result.errors):
+            self.stderr.write(f'... {result.failed - len(result.errors)} more invalid row(s)')
+        if result.stopped:
+            self.stderr.write(f"stopped at line {result.stopped['line']}: {result.stopped['error']}")
+        style = self.style.SUCCESS if not (result.failed or result.stopped) else self.style.WARNING
+        self.stdout.write(style(f'Imported {result.created} of {result.rows} row(s) into {dept.name}'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks import stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the TaskStats counters from the task table and verify them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify-only', action='store_true',
+                            help='Only compare the counters with a full aggregate, do not rebuild')
+
+    def handle(self, *args, **options):
+        if not options['verify_only']:
+            stats.rebuild()
+            self.stdout.write('Rebuilt task counters')
+
+        expected = stats.aggregate()
+        actual = stats.stored()
+        mismatches = sorted(
+            (bucket, expected.get(bucket, 0), actual.get(bucket, 0))
+            for bucket in expected.keys() | actual.keys()
+            if expected.get(bucket, 0) != actual.get(bucket, 0)
+        )
+        for (dept_id, status, priority, assignee), want, got in mismatches:
+            self.stdout.write(self.style.ERROR(
+                f'dept={dept_id} status={status} priority={priority} assignee={assignee or None}: '
+                f'expected {want}, counter has {got}'
+            ))
+        if mismatches:
+            raise CommandError(f'{len(mismatches)} task counter bucket(s) out of sync')
+        self.stdout.write(self.style.SUCCESS(f'{len(expected)} task counter bucket(s) verified'))
@@ -0,0 +1,31 @@
+import threading
+
+from django.core.management.base import BaseCommand
+
+from apps.tasks import deadlines
+
+
+class Command(BaseCommand):
+    help = 'Mark tasks overdue and escalate them as their due dates pass'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Load the schedule, fire the deadlines that already passed and exit (for cron)',
+        )
+
+    def handle(self, *args, **options):
+        scheduler = deadlines.scheduler
+        scheduler.rebuild()
+        self.stdout.write(f'Loaded {len(scheduler)} upcoming deadline(s)')
+        if options['once']:
+            overdue = scheduler.run_pending()
+            self.stdout.write(self.style.SUCCESS(f'Marked {len(overdue)} task(s) overdue'))
+            return
+
+        stop = threading.Event()
+        try:
+            scheduler.run_forever(stop)
+        except KeyboardInterrupt:
+            stop.set()
+            self.stdout.write('Stopped')
@@ -0,0 +1,33 @@
+# FULLTEXT indexes backing apps.tasks.search on MySQL; other backends use
+# the in-process inverted index instead.
+
+from django.db import migrations
+
+
+def create_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(
+        'CREATE FULLTEXT INDEX tasks_task_fulltext ON tasks_task (task_title, task_desc)'
+    )
+    schema_editor.execute(
+        'CREATE FULLTEXT INDEX tasks_comment_fulltext ON tasks_comment (content)'
+    )
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute('DROP INDEX tasks_task_fulltext ON tasks_task')
+    schema_editor.execute('DROP INDEX tasks_comment_fulltext ON tasks_comment')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_alter_task_assigned_to_task_desc'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_indexes, drop_fulltext_indexes),
+    ]
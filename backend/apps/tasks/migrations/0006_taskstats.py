@@ -0,0 +1,47 @@
+# Generated by Django 5.0.6 on 2026-10-17 19:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_task_stats(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskStats = apps.get_model('tasks', 'TaskStats')
+    rows = (
+        Task.objects.order_by()
+        .values_list('dept_id', 'status', 'priority', 'assigned_to_id')
+        .annotate(total=Count('id'))
+    )
+    TaskStats.objects.bulk_create(
+        [TaskStats(dept_id=dept_id, status=status, priority=priority, assignee=assignee or 0, count=total)
+         for dept_id, status, priority, assignee, total in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_comment_fulltext'),
+        ('users', '0003_user_profile_picture'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], max_length=10)),
+                ('assignee', models.PositiveBigIntegerField(default=0)),
+                ('count', models.IntegerField(default=0)),
+                ('dept', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_stats', to='users.department')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='taskstats',
+            constraint=models.UniqueConstraint(fields=('dept', 'status', 'priority', 'assignee'), name='unique_task_stats_bucket'),
+        ),
+        migrations.RunPython(backfill_task_stats, migrations.RunPython.noop),
+    ]
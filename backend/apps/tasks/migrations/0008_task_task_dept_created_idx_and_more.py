@@ -0,0 +1,32 @@
+# Generated by Django 5.0.6 on 2026-10-17 19:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_delta_sync'),
+        ('users', '0004_user_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['dept', 'created_at'], name='task_dept_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['dept', 'status', 'created_at'], name='task_dept_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['dept', 'assigned_to', 'created_at'], name='task_dept_assignee_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['dept', 'priority', 'created_at'], name='task_dept_priority_created_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.6 on 2026-10-17 19:59
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+PRIORITY_RANKS = {'low': 1, 'medium': 2, 'high': 3}
+
+
+def backfill_priority_rank(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.update(priority_rank=Case(
+        *[When(priority=priority, then=Value(rank)) for priority, rank in PRIORITY_RANKS.items()],
+        default=Value(0),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_task_dept_created_idx_and_more'),
+        ('users', '0004_user_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='priority_rank',
+            field=models.PositiveSmallIntegerField(default=2, editable=False),
+        ),
+        migrations.RunPython(backfill_priority_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['dept', 'priority_rank', 'created_at'], name='task_dept_prank_created_idx'),
+        ),
+    ]
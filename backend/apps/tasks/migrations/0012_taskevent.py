@@ -0,0 +1,36 @@
+# Generated by Django 5.0.6 on 2026-10-17 20:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_task_overdue_at_task_task_due_date_idx'),
+        ('users', '0004_user_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'created'), (2, 'updated'), (3, 'deleted'), (4, 'moved_in'), (5, 'moved_out')])),
+                ('changed', models.PositiveSmallIntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('previous_status', models.CharField(blank=True, choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], default='', max_length=20)),
+                ('assigned_to_id', models.BigIntegerField(null=True)),
+                ('previous_assigned_to_id', models.BigIntegerField(null=True)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], max_length=10)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('dept', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='task_events', to='users.department')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['dept', 'id'], name='taskevent_dept_id_idx')],
+            },
+        ),
+    ]
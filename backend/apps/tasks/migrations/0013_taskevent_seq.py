@@ -0,0 +1,43 @@
+# Generated by Django 5.0.6 on 2026-10-17 21:26
+
+from django.db import migrations, models
+from django.db.models import F, Max
+
+
+def number_existing_events(apps, schema_editor):
+    # Everything already in the table is committed: number it in id order
+    TaskEvent = apps.get_model('tasks', 'TaskEvent')
+    TaskEventSequence = apps.get_model('tasks', 'TaskEventSequence')
+    TaskEvent.objects.update(seq=F('id'))
+    TaskEventSequence.objects.create(pk=1, value=TaskEvent.objects.aggregate(last=Max('id'))['last'] or 0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0012_taskevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskEventSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='taskevent',
+            name='taskevent_dept_id_idx',
+        ),
+        migrations.AddField(
+            model_name='taskevent',
+            name='seq',
+            field=models.BigIntegerField(null=True, unique=True),
+        ),
+        migrations.RunPython(number_existing_events, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='taskevent',
+            index=models.Index(fields=['dept', 'seq'], name='taskevent_dept_seq_idx'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.0.6 on 2026-10-17 21:56
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0013_taskevent_seq'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='TaskTombstone',
+        ),
+    ]
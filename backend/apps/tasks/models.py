@@ -1,8 +1,57 @@
-from django.db import models
+from django.db import models, connections, router, transaction
 from django.conf import settings
 from django.utils import timezone
 from apps.users.models import Department
 
+class TaskManager(models.Manager):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for task in objs:
+            task.sync_priority_rank()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if 'priority' in fields:
+            objs = list(objs)
+            for task in objs:
+                task.sync_priority_rank()
+            fields = [*fields, 'priority_rank']
+        if 'due_date' in fields:
+            objs = list(objs)
+            for task in objs:
+                task.clear_moved_deadline()
+            fields = [*fields, 'overdue_at'] if 'overdue_at' not in fields else fields
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def bulk_insert(self, tasks, batch_size=500):
+        """
+        Insert `tasks` with bulk_create and make sure each one has its primary
+        key set.
+
+        Backends that support INSERT ... RETURNING report the new ids. MySQL
+        does not, so each batch is inserted as one multi-row INSERT and the
+        ids are recovered from LAST_INSERT_ID(), the id of its first row:
+        InnoDB allocates the ids of a single multi-row INSERT consecutively
+        (auto_increment_increment apart) in every innodb_autoinc_lock_mode,
+        since the row count is known up front.
+        """
+        connection = connections[self.db]
+        if connection.features.can_return_rows_from_bulk_insert:
+            return self.bulk_create(tasks, batch_size=batch_size)
+        tasks = list(tasks)
+        with transaction.atomic(using=self.db), connection.cursor() as cursor:
+            cursor.execute('SELECT @@auto_increment_increment')
+            (step,) = cursor.fetchone()
+            for start in range(0, len(tasks), batch_size):
+                batch = tasks[start:start + batch_size]
+                self.bulk_create(batch, batch_size=len(batch))
+                cursor.execute('SELECT LAST_INSERT_ID()')
+                (first_id,) = cursor.fetchone()
+                for offset, task in enumerate(batch):
+                    task.pk = first_id + offset * step
+        return tasks
+
+
 class Task(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -16,6 +65,9 @@ class Task(models.Model):
         ('medium', 'Medium'),
         ('high', 'High'),
     ]
+    # Numeric sort key for `priority`, so ordering by it is correct and index-backed
+    PRIORITY_RANKS = {'low': 1, 'medium': 2, 'high': 3}
+
     task_title = models.CharField(max_length=200)
     task_desc = models.TextField(blank=True, default='')
     assigned_to = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='assigned_tasks', null=True, blank=True)
@@ -23,15 +75,100 @@ class Task(models.Model):
     dept = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='tasks')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium')
+    priority_rank = models.PositiveSmallIntegerField(default=2, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     due_date = models.DateField(null=True, blank=True)
+    # Set by the deadline engine (apps.tasks.deadlines) once the due date has passed
+    overdue_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = TaskManager()
+
+    # Fields whose previous value receivers need (notifications, counters, change feeds)
+    TRACKED_FIELDS = ('dept_id', 'assigned_to_id', 'status', 'priority', 'due_date')
 
     def __str__(self):
         return f"{self.task_title} [{self.status}]"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_state()
+        return instance
+
+    def remember_state(self):
+        """Record the tracked field values as the ones currently stored in the database."""
+        self._loaded_values = {
+            field: self.__dict__[field] for field in self.TRACKED_FIELDS if field in self.__dict__
+        }
+
+    def loaded_value(self, field, default=None):
+        """Value of a tracked field as last read from or written to the database."""
+        return getattr(self, '_loaded_values', {}).get(field, default)
+
+    def changed_fields(self):
+        """Tracked fields that differ from the stored row; every field for unsaved tasks."""
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return set(self.TRACKED_FIELDS)
+        return {field for field, value in loaded.items() if getattr(self, field) != value}
+
+    def sync_priority_rank(self):
+        self.priority_rank = self.PRIORITY_RANKS.get(self.priority, 0)
+
+    def clear_moved_deadline(self):
+        if self.overdue_at is not None and 'due_date' in self.changed_fields():
+            # A moved deadline is a new deadline
+            self.overdue_at = None
+
+    def save(self, *args, **kwargs):
+        self.sync_priority_rank()
+        self.clear_moved_deadline()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            if 'priority' in update_fields:
+                update_fields = {*update_fields, 'priority_rank'}
+            if 'due_date' in update_fields:
+                update_fields = {*update_fields, 'overdue_at'}
+            kwargs['update_fields'] = update_fields
+        # post_save receivers maintain derived tables (e.g. TaskStats) and must
+        # commit or roll back together with the row itself.
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            if not self._state.adding and not kwargs.get('force_insert'):
+                self._lock_stored_state(using)
+            super().save(*args, **kwargs)
+        self.remember_state()
+
+    def delete(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            self._lock_stored_state(using)
+            return super().delete(*args, **kwargs)
+
+    def _lock_stored_state(self, using):
+        """Re-read the tracked columns under a row lock, so receivers diff against the committed row."""
+        stored = (
+            type(self)._base_manager.using(using).select_for_update()
+            .filter(pk=self.pk).values(*self.TRACKED_FIELDS).first()
+        )
+        if stored is not None:
+            self._loaded_values = stored
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Delta sync scans a department's tasks by modification time
+            models.Index(fields=['dept', 'updated_at'], name='task_dept_updated_idx'),
+            # List filters, each ordered by -created_at (the pk tiebreaker rides along in the index)
+            models.Index(fields=['dept', 'created_at'], name='task_dept_created_idx'),
+            models.Index(fields=['dept', 'status', 'created_at'], name='task_dept_status_created_idx'),
+            models.Index(fields=['dept', 'assigned_to', 'created_at'], name='task_dept_assignee_created_idx'),
+            models.Index(fields=['dept', 'priority', 'created_at'], name='task_dept_priority_created_idx'),
+            models.Index(fields=['dept', 'priority_rank', 'created_at'], name='task_dept_prank_created_idx'),
+            # The deadline engine rebuilds its schedule from a due_date range
+            models.Index(fields=['due_date'], name='task_due_date_idx'),
+        ]
 
 
 class Comment(models.Model):
@@ -47,3 +184,111 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of a task's comments on (created_at, id)
+            models.Index(fields=['task', 'created_at'], name='comment_task_created_idx'),
+        ]
+
+
+class TaskStats(models.Model):
+    """
+    Task counters per department, status, priority and assignee, kept in step
+    with Task writes by the receivers in `apps.signals` so the dashboard
+    breakdowns never aggregate the task table. `assignee` is the assigned
+    user's id, or 0 for unassigned tasks (a nullable column would let MySQL
+    store duplicate unassigned buckets despite the unique constraint).
+    """
+    dept = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='task_stats')
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    priority = models.CharField(max_length=10, choices=Task.PRIORITY_CHOICES)
+    assignee = models.PositiveBigIntegerField(default=0)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.dept_id}/{self.status}/{self.priority}/{self.assignee}: {self.count}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dept', 'status', 'priority', 'assignee'], name='unique_task_stats_bucket'),
+        ]
+
+
+class TaskEvent(models.Model):
+    """
+    Append-only change feed of task writes, inserted in the same transaction
+    as the write by the receivers in `apps.signals`. Once that transaction
+    has committed, `seq` is set (apps.tasks.feed) in commit order; consumers
+    tail a department's feed by `seq` (see `TaskViewSet.events`).
+
+    `changed` is a bitmask of the tracked fields the write changed (see
+    CHANGE_BITS); updates touching only other fields (title, description)
+    have `changed == 0`. Status and assignee are stored before and after.
+    """
+    CREATED, UPDATED, DELETED, MOVED_IN, MOVED_OUT = 1, 2, 3, 4, 5
+    KIND_CHOICES = [
+        (CREATED, 'created'),
+        (UPDATED, 'updated'),
+        (DELETED, 'deleted'),
+        (MOVED_IN, 'moved_in'),
+        (MOVED_OUT, 'moved_out'),
+    ]
+    CHANGE_BITS = {'dept_id': 1, 'assigned_to_id': 2, 'status': 4, 'priority': 8, 'due_date': 16}
+
+    dept = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='task_events', db_index=False)
+    task_id = models.BigIntegerField()
+    kind = models.PositiveSmallIntegerField(choices=KIND_CHOICES)
+    changed = models.PositiveSmallIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    previous_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES, blank=True, default='')
+    assigned_to_id = models.BigIntegerField(null=True)
+    previous_assigned_to_id = models.BigIntegerField(null=True)
+    priority = models.CharField(max_length=10, choices=Task.PRIORITY_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+    seq = models.BigIntegerField(null=True, unique=True)
+
+    def __str__(self):
+        return f"#{self.pk} task {self.task_id} {self.get_kind_display()}"
+
+    @classmethod
+    def for_write(cls, task, created=False, deleted=False):
+        """Events describing a save/delete of `task` (two for a department move)."""
+        if created:
+            return [cls._build(task, cls.CREATED, task.dept_id, set(cls.CHANGE_BITS))]
+        if deleted:
+            return [cls._build(task, cls.DELETED, task.loaded_value('dept_id', task.dept_id), set())]
+        changed = task.changed_fields()
+        old_dept_id = task.loaded_value('dept_id', task.dept_id)
+        if old_dept_id != task.dept_id:
+            return [
+                cls._build(task, cls.MOVED_OUT, old_dept_id, changed),
+                cls._build(task, cls.MOVED_IN, task.dept_id, changed),
+            ]
+        return [cls._build(task, cls.UPDATED, task.dept_id, changed)]
+
+    @classmethod
+    def _build(cls, task, kind, dept_id, changed):
+        return cls(
+            dept_id=dept_id,
+            task_id=task.pk,
+            kind=kind,
+            changed=sum(bit for field, bit in cls.CHANGE_BITS.items() if field in changed),
+            status=task.status,
+            previous_status=task.loaded_value('status', '') if kind != cls.CREATED else '',
+            assigned_to_id=task.assigned_to_id,
+            previous_assigned_to_id=task.loaded_value('assigned_to_id') if kind != cls.CREATED else None,
+            priority=task.priority,
+        )
+
+    def changed_fields(self):
+        return [field for field, bit in self.CHANGE_BITS.items() if self.changed & bit]
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['dept', 'seq'], name='taskevent_dept_seq_idx'),
+        ]
+
+
+class TaskEventSequence(models.Model):
+    """The last TaskEvent.seq handed out; a single row, locked while events are published."""
+    value = models.BigIntegerField(default=0)
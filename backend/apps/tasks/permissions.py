@@ -1,4 +1,5 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
+from apps.users.principal import get_principal
 
 class IsDeptManagerOrAssignee(BasePermission):
     """
@@ -6,16 +7,17 @@ class IsDeptManagerOrAssignee(BasePermission):
     assignees to update their own tasks, and read access to department members.
     """
     def has_object_permission(self, request, view, obj):
+        principal = get_principal(request)
         # Allow read access to anyone in the department
         if request.method in SAFE_METHODS:
-            return obj.dept_id == getattr(request.user.department, 'id', None)
+            return principal.in_department(obj.dept_id)
             
         # Managers can modify any task in their department
-        if request.user.role and request.user.role.name in ['Admin', 'Department Manager']:
-            return obj.dept_id == getattr(request.user.department, 'id', None)
+        if principal.is_manager:
+            return principal.in_department(obj.dept_id)
             
         # Assignee can update their own task
-        if obj.assigned_to_id == request.user.id:
+        if obj.assigned_to_id == principal.user_id:
             return True
             
         return False
@@ -29,21 +31,21 @@ class IsTaskParticipant(BasePermission):
     def has_object_permission(self, request, view, obj):
         # Allow read access to task participants
         if request.method in SAFE_METHODS:
-            return self._is_task_participant(request.user, obj)
+            return self._is_task_participant(get_principal(request), obj)
             
         # Allow POST for comments to task participants
         if request.method == 'POST':
-            return self._is_task_participant(request.user, obj)
+            return self._is_task_participant(get_principal(request), obj)
             
         return False
     
-    def _is_task_participant(self, user, task):
+    def _is_task_participant(self, principal, task):
         """Check if the user is a participant in the task."""
         # User is in the same department
-        if not hasattr(user, 'department') or user.department_id != task.dept_id:
+        if not principal.in_department(task.dept_id):
             return False
             
-        # User is the assignee, creator, or a manager
-        return (user == task.assigned_to or 
-                user == task.assigned_by or 
-                (hasattr(user, 'role') and user.role.name in ['Admin', 'Department Manager']))
+        # User is the assignee, creator, or a manager (ids only, no User rows are loaded)
+        return (task.assigned_to_id == principal.user_id or
+                task.assigned_by_id == principal.user_id or
+                principal.is_manager)
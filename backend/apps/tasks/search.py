@@ -0,0 +1,228 @@
+"""
+Ranked full-text search over tasks and their comments.
+
+On MySQL the FULLTEXT indexes created by migration 0005 are queried with
+MATCH ... AGAINST. Other backends (SQLite in development and tests) use an
+in-process inverted index with BM25 ranking. The inverted index is loaded
+lazily per department on the first search and then kept current by the
+Task/Comment save and delete receivers in `apps.signals`; it only sees
+writes made by its own process.
+"""
+import math
+import re
+import threading
+from collections import Counter
+
+from django.db import connection
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+from apps.users.principal import get_principal
+from .models import Task, Comment
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+# Title terms count more than description/comment terms
+TITLE_WEIGHT = 2
+MAX_RESULTS = 500
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall((text or '').lower()) if len(token) > 1]
+
+
+def uses_fulltext():
+    return connection.vendor == 'mysql'
+
+
+class InvertedIndex:
+    """Per-department postings lists (token -> {task_id: term frequency})."""
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = set()
+        self._postings = {}   # dept_id -> {token: {task_id: tf}}
+        self._lengths = {}    # dept_id -> {task_id: document length}
+        self._docs = {}       # task_id -> {'dept': id, 'task': Counter, 'comments': {id: Counter}}
+
+    def clear(self):
+        with self._lock:
+            self._loaded.clear()
+            self._postings.clear()
+            self._lengths.clear()
+            self._docs.clear()
+
+    def ensure_loaded(self, dept_id):
+        with self._lock:
+            if dept_id in self._loaded:
+                return
+            self._postings[dept_id] = {}
+            self._lengths[dept_id] = {}
+            self._loaded.add(dept_id)
+            tasks = Task.objects.filter(dept_id=dept_id).values_list('id', 'task_title', 'task_desc')
+            for task_id, title, desc in tasks.iterator(chunk_size=2000):
+                self._set_task_terms(task_id, dept_id, title, desc)
+            comments = Comment.objects.filter(task__dept_id=dept_id).values_list('id', 'task_id', 'content')
+            for comment_id, task_id, content in comments.iterator(chunk_size=2000):
+                self._set_comment_terms(task_id, comment_id, content)
+
+    # Incremental maintenance; departments that were never searched are skipped.
+
+    def task_saved(self, task):
+        with self._lock:
+            doc = self._docs.get(task.pk)
+            if doc is not None and doc['dept'] != task.dept_id:
+                self._remove(task.pk)
+            if task.dept_id in self._loaded:
+                self._set_task_terms(task.pk, task.dept_id, task.task_title, task.task_desc)
+
+    def task_deleted(self, task_id):
+        with self._lock:
+            self._remove(task_id)
+
+    def comment_saved(self, comment):
+        with self._lock:
+            if comment.task_id in self._docs:
+                self._set_comment_terms(comment.task_id, comment.pk, comment.content)
+
+    def comment_deleted(self, comment):
+        with self._lock:
+            doc = self._docs.get(comment.task_id)
+            if doc is not None and comment.pk in doc['comments']:
+                self._replace(comment.task_id, lambda d: d['comments'].pop(comment.pk, None))
+
+    def search(self, dept_id, query, limit=MAX_RESULTS):
+        """Return [(task_id, score)] best first."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        self.ensure_loaded(dept_id)
+        with self._lock:
+            postings = self._postings[dept_id]
+            lengths = self._lengths[dept_id]
+            total = len(lengths)
+            if not total:
+                return []
+            average = sum(lengths.values()) / total
+            scores = Counter()
+            for term in terms:
+                matches = postings.get(term)
+                if not matches:
+                    continue
+                idf = math.log(1 + (total - len(matches) + 0.5) / (len(matches) + 0.5))
+                for task_id, tf in matches.items():
+                    norm = self.k1 * (1 - self.b + self.b * lengths[task_id] / average)
+                    scores[task_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores.most_common(limit)
+
+    def _set_task_terms(self, task_id, dept_id, title, desc):
+        terms = Counter(tokenize(desc))
+        for token in tokenize(title):
+            terms[token] += TITLE_WEIGHT
+        if task_id not in self._docs:
+            self._docs[task_id] = {'dept': dept_id, 'task': Counter(), 'comments': {}}
+        self._replace(task_id, lambda d: d.update(task=terms))
+
+    def _set_comment_terms(self, task_id, comment_id, content):
+        terms = Counter(tokenize(content))
+        self._replace(task_id, lambda d: d['comments'].__setitem__(comment_id, terms))
+
+    def _replace(self, task_id, mutate):
+        doc = self._docs[task_id]
+        old = self._terms(doc)
+        mutate(doc)
+        new = self._terms(doc)
+        postings = self._postings[doc['dept']]
+        for token in old.keys() - new.keys():
+            postings[token].pop(task_id, None)
+            if not postings[token]:
+                del postings[token]
+        for token, tf in new.items():
+            if old.get(token) != tf:
+                postings.setdefault(token, {})[task_id] = tf
+        self._lengths[doc['dept']][task_id] = sum(new.values())
+
+    def _remove(self, task_id):
+        doc = self._docs.get(task_id)
+        if doc is None:
+            return
+        self._replace(task_id, lambda d: (d.update(task=Counter()), d['comments'].clear()))
+        self._lengths[doc['dept']].pop(task_id, None)
+        del self._docs[task_id]
+
+    @staticmethod
+    def _terms(doc):
+        terms = Counter(doc['task'])
+        for comment_terms in doc['comments'].values():
+            terms.update(comment_terms)
+        return terms
+
+
+index = InvertedIndex()
+
+
+def search_tasks(queryset, dept_id, query):
+    """
+    Restrict `queryset` to tasks matching `query` and annotate each row with
+    `search_rank` (higher is better).
+    """
+    if uses_fulltext():
+        return _fulltext_search(queryset, query)
+    ranked = index.search(dept_id, query)
+    if not ranked:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+    return queryset.filter(id__in=[task_id for task_id, _ in ranked]).annotate(
+        search_rank=Case(
+            *[When(id=task_id, then=Value(score)) for task_id, score in ranked],
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    )
+
+
+def _fulltext_search(queryset, query):
+    quote = connection.ops.quote_name
+    task_table = quote(Task._meta.db_table)
+    comment_table = quote(Comment._meta.db_table)
+    task_match = (
+        f'MATCH ({task_table}.{quote("task_title")}, {task_table}.{quote("task_desc")}) '
+        f'AGAINST (%s IN NATURAL LANGUAGE MODE)'
+    )
+    comment_match = f'MATCH ({quote("content")}) AGAINST (%s IN NATURAL LANGUAGE MODE)'
+    comment_rank = (
+        f'(SELECT COALESCE(SUM({comment_match}), 0) FROM {comment_table} '
+        f'WHERE {comment_table}.{quote("task_id")} = {task_table}.{quote("id")} AND {comment_match} > 0)'
+    )
+    matching_comments = (
+        Comment.objects.annotate(match=RawSQL(comment_match, [query], output_field=FloatField()))
+        .filter(match__gt=0)
+        .values('task_id')
+    )
+    return (
+        queryset.annotate(task_match=RawSQL(task_match, [query], output_field=FloatField()))
+        .filter(Q(task_match__gt=0) | Q(id__in=matching_comments))
+        .annotate(search_rank=RawSQL(
+            f'{task_match} + {comment_rank}', [query, query, query], output_field=FloatField()
+        ))
+    )
+
+
+class TaskSearchFilter(BaseFilterBackend):
+    """
+    `?search=` backend for TaskViewSet. Results are ranked by relevance
+    unless the client asked for an explicit `?ordering=`, so it must run
+    after `OrderingFilter`.
+    """
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        queryset = search_tasks(queryset, get_principal(request).dept_id, query)
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by('-search_rank', '-created_at')
+        return queryset
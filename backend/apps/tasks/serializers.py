@@ -1,6 +1,7 @@
 from rest_framework import serializers
-from .models import Task, Comment
-from apps.users.serializers import UserSerializer
+from .models import Task, Comment, TaskEvent
+from apps.users.principal import get_principal
+from apps.users.serializers import UserSerializer, UserSummarySerializer
 
 class CommentSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
@@ -11,11 +12,53 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
     
     def create(self, validated_data):
-        validated_data['user'] = self.context['request'].user
+        validated_data['user_id'] = get_principal(self.context['request']).user_id
         validated_data['task_id'] = self.context['task_id']
         return super().create(validated_data)
 
 
+class CommentListSerializer(serializers.ModelSerializer):
+    """
+    Paginated comment listing. Authors are looked up and serialized once per
+    page by the view and passed in as `context['authors']` ({user id: data}).
+    """
+    user = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Comment
+        fields = ['id', 'user', 'content', 'created_at', 'updated_at']
+        read_only_fields = fields
+
+    def get_user(self, obj):
+        return self.context['authors'].get(obj.user_id)
+
+
+class TaskListSerializer(serializers.ModelSerializer):
+    """
+    Lean representation used by `TaskViewSet.list`: no embedded comments,
+    compact user references and a `comment_count` read from the queryset
+    annotation instead of one COUNT query per task.
+    """
+    assigned_to = UserSummarySerializer(read_only=True)
+    assigned_by = UserSummarySerializer(read_only=True)
+    department = serializers.SerializerMethodField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Task
+        fields = [
+            'id', 'task_title', 'task_desc', 'assigned_to', 'assigned_by',
+            'dept', 'department', 'status', 'priority', 'created_at', 'updated_at', 'due_date',
+            'overdue_at', 'comment_count'
+        ]
+        read_only_fields = fields
+
+    def get_department(self, obj):
+        if obj.dept:
+            return {'id': obj.dept.id, 'name': obj.dept.name}
+        return None
+
+
 class TaskSerializer(serializers.ModelSerializer):
     assigned_to = UserSerializer(read_only=True)
     assigned_by = UserSerializer(read_only=True)
@@ -31,10 +74,10 @@ class TaskSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'task_title', 'task_desc', 'assigned_to', 'assigned_to_id', 'assigned_by', 
             'dept', 'department', 'status', 'priority', 'created_at', 'updated_at', 'due_date', 
-            'comments', 'comment_count'
+            'overdue_at', 'comments', 'comment_count'
         ]
         read_only_fields = [
-            'id', 'created_at', 'updated_at', 'assigned_by', 'dept', 'department', 'comments', 'comment_count'
+            'id', 'created_at', 'updated_at', 'assigned_by', 'dept', 'department', 'overdue_at', 'comments', 'comment_count'
         ]
     
     def get_department(self, obj):
@@ -50,24 +93,35 @@ class TaskSerializer(serializers.ModelSerializer):
         # Handle assigned_to_id
         assigned_to_id = attrs.pop('assigned_to_id', None)
         if assigned_to_id:
-            from apps.users.models import User
-            try:
-                assigned_to = User.objects.get(id=assigned_to_id)
-                # Admins can assign tasks to anyone, others only within their department
-                if request.user.role.name.lower() != 'admin':
-                    if request.user.department and assigned_to.department_id != request.user.department_id:
-                        raise serializers.ValidationError('You can only assign tasks within your department.')
-                attrs['assigned_to'] = assigned_to
-            except User.DoesNotExist:
+            assigned_to = self.get_assignee(assigned_to_id)
+            if assigned_to is None:
                 raise serializers.ValidationError('Assigned user does not exist.')
+            # Admins can assign tasks to anyone, others only within their department
+            principal = get_principal(request)
+            if not principal.is_admin:
+                if principal.dept_id and assigned_to.department_id != principal.dept_id:
+                    raise serializers.ValidationError('You can only assign tasks within your department.')
+            attrs['assigned_to'] = assigned_to
         
         return attrs
 
+    def get_assignee(self, user_id):
+        """
+        Resolve an assignee id. Batch callers pass the users they already
+        fetched as `context['assignees']` ({id: User}) to avoid a query per item.
+        """
+        assignees = self.context.get('assignees')
+        if assignees is not None:
+            return assignees.get(user_id)
+        from apps.users.models import User
+        return User.objects.filter(id=user_id).first()
+
     def create(self, validated_data):
         request = self.context.get('request')
         if request:
-            validated_data['assigned_by'] = request.user
-            validated_data['dept'] = request.user.department
+            principal = get_principal(request)
+            validated_data['assigned_by_id'] = principal.user_id
+            validated_data['dept_id'] = principal.dept_id
         return super().create(validated_data)
         
     def update(self, instance, validated_data):
@@ -75,3 +129,16 @@ class TaskSerializer(serializers.ModelSerializer):
         for field in ['assigned_by', 'dept']:
             validated_data.pop(field, None)
         return super().update(instance, validated_data)
+
+
+class TaskEventSerializer(serializers.ModelSerializer):
+    kind = serializers.CharField(source='get_kind_display', read_only=True)
+    changed = serializers.ListField(source='changed_fields', read_only=True)
+
+    class Meta:
+        model = TaskEvent
+        fields = [
+            'id', 'seq', 'task_id', 'kind', 'changed', 'status', 'previous_status',
+            'assigned_to_id', 'previous_assigned_to_id', 'priority', 'created_at'
+        ]
+        read_only_fields = fields
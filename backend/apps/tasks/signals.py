@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+# Sent after TaskViewSet.bulk (or any other batched writer) stored tasks with
+# bulk_create/bulk_update, which bypass post_save. Arguments: `created` and
+# `updated` (lists of Task). Updated tasks still report their previous values
+# through `Task.loaded_value()` / `Task.changed_fields()` while receivers run.
+tasks_bulk_saved = Signal()
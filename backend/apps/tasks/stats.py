@@ -0,0 +1,104 @@
+"""
+Incremental maintenance of the TaskStats counters.
+
+Each Task write turns into +1/-1 deltas on the (dept, status, priority,
+assignee) buckets it leaves and enters; the deltas are applied with
+`UPDATE ... SET count = count + n` inside the transaction of the write.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import Task, TaskStats
+
+BUCKET_FIELDS = ('dept_id', 'status', 'priority', 'assigned_to_id')
+
+
+def _bucket(values):
+    dept_id, status, priority, assigned_to_id = values
+    return dept_id, status, priority, assigned_to_id or 0
+
+
+def current_bucket(task):
+    return _bucket([getattr(task, field) for field in BUCKET_FIELDS])
+
+
+def stored_bucket(task):
+    """Bucket of the row as it is in the database (falls back to current values for unloaded fields)."""
+    return _bucket([task.loaded_value(field, getattr(task, field)) for field in BUCKET_FIELDS])
+
+
+def task_deltas(created=(), updated=(), deleted=()):
+    deltas = Counter()
+    for task in created:
+        deltas[current_bucket(task)] += 1
+    for task in updated:
+        old, new = stored_bucket(task), current_bucket(task)
+        if old != new:
+            deltas[old] -= 1
+            deltas[new] += 1
+    for task in deleted:
+        deltas[stored_bucket(task)] -= 1
+    return deltas
+
+
+def apply(deltas):
+    for (dept_id, status, priority, assignee), delta in deltas.items():
+        if not delta:
+            continue
+        bucket = TaskStats.objects.filter(dept_id=dept_id, status=status, priority=priority, assignee=assignee)
+        if bucket.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                TaskStats.objects.create(
+                    dept_id=dept_id, status=status, priority=priority, assignee=assignee, count=delta
+                )
+        except IntegrityError:
+            # Another writer created the bucket first
+            bucket.update(count=F('count') + delta)
+
+
+def aggregate():
+    """Counters recomputed from the task table: {bucket: count}."""
+    rows = Task.objects.order_by().values_list(*BUCKET_FIELDS).annotate(total=Count('id'))
+    return {_bucket(row[:4]): row[4] for row in rows.iterator()}
+
+
+def stored():
+    rows = TaskStats.objects.exclude(count=0).values_list('dept_id', 'status', 'priority', 'assignee', 'count')
+    return {row[:4]: row[4] for row in rows.iterator()}
+
+
+def rebuild():
+    with transaction.atomic():
+        TaskStats.objects.all().delete()
+        TaskStats.objects.bulk_create(
+            [TaskStats(dept_id=dept_id, status=status, priority=priority, assignee=assignee, count=count)
+             for (dept_id, status, priority, assignee), count in aggregate().items()],
+            batch_size=1000,
+        )
+
+
+def summary(dept_id):
+    """Breakdowns for one department, read from the counters only."""
+    by_status = Counter({key: 0 for key, _ in Task.STATUS_CHOICES})
+    by_priority = Counter({key: 0 for key, _ in Task.PRIORITY_CHOICES})
+    by_assignee = Counter()
+    rows = TaskStats.objects.filter(dept_id=dept_id).exclude(count=0).values_list(
+        'status', 'priority', 'assignee', 'count'
+    )
+    for status, priority, assignee, count in rows:
+        by_status[status] += count
+        by_priority[priority] += count
+        by_assignee[assignee or None] += count
+    return {
+        'total': sum(by_status.values()),
+        'by_status': dict(by_status),
+        'by_priority': dict(by_priority),
+        'by_assignee': [
+            {'assigned_to': assignee, 'count': count}
+            for assignee, count in by_assignee.most_common()
+        ],
+    }
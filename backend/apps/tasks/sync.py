@@ -0,0 +1,84 @@
+"""
+Delta sync for task lists: everything that changed in a department after
+a cursor, and the tasks that left it.
+
+The cursor is a position in the TaskEvent feed (`seq`), which is numbered
+in commit order (see apps.tasks.feed): a transaction that commits late
+still gets a number above every position already handed out, however long
+it stayed open. The feed records deletions and moves out of a department
+in that department, so it also says which tasks left.
+
+A full sync reads the feed position first and then pages through the
+department's tasks by id, carrying that position; anything written while
+the pages are read is sent again by the first incremental sync (clients
+upsert). An incremental sync reads the next events and reports each task
+they touch once, as it is now: changed if it is still in the department,
+removed otherwise.
+"""
+from apps.pagination import decode_cursor, encode_cursor
+from .models import Task, TaskEvent, TaskEventSequence
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class ExpiredCursor(Exception):
+    pass
+
+
+def parse_cursor(token):
+    """Return (seq, last task id of a full sync in progress, or None); (None, None) starts a full sync."""
+    if not token:
+        return None, None
+    payload = decode_cursor(token)
+    if not isinstance(payload, dict):
+        raise InvalidCursor
+    if 's' not in payload and {'t', 'd'} <= payload.keys():
+        # A timestamp cursor from before sync followed the event feed
+        raise ExpiredCursor
+    try:
+        seq = int(payload['s'])
+        after_id = int(payload['i']) if 'i' in payload else None
+    except (TypeError, KeyError, ValueError):
+        raise InvalidCursor
+    if seq < 0 or seq > _published_seq():
+        raise InvalidCursor
+    return seq, after_id
+
+
+def _published_seq():
+    return TaskEventSequence.objects.filter(pk=1).values_list('value', flat=True).first() or 0
+
+
+def _full(dept_id, seq, after_id, limit):
+    ids = list(
+        Task.objects.filter(dept_id=dept_id, id__gt=after_id or 0)
+        .order_by('id').values_list('id', flat=True)[:limit + 1]
+    )
+    if len(ids) > limit:
+        ids = ids[:limit]
+        return ids, encode_cursor({'s': seq, 'i': ids[-1]}), True
+    return ids, encode_cursor({'s': seq}), False
+
+
+def changes(dept_id, token, limit):
+    """
+    Tasks touched after the cursor. Returns (task ids, next cursor,
+    has_more); callers report the ids still visible to them as changed and
+    the rest as removed.
+    """
+    seq, after_id = parse_cursor(token)
+    if seq is None:
+        return _full(dept_id, _published_seq(), None, limit)
+    if after_id is not None:
+        return _full(dept_id, seq, after_id, limit)
+
+    events = list(
+        TaskEvent.objects.filter(dept_id=dept_id, seq__gt=seq)
+        .order_by('seq').values_list('seq', 'task_id')[:limit + 1]
+    )
+    has_more = len(events) > limit
+    events = events[:limit]
+    task_ids = list(dict.fromkeys(task_id for _, task_id in events))
+    return task_ids, encode_cursor({'s': events[-1][0] if events else seq}), has_more
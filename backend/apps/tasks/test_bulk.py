@@ -0,0 +1,107 @@
+from datetime import date
+
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.notifications.models import Notification
+from apps.users.models import Department, Role
+from .models import Task
+
+User = get_user_model()
+
+
+class TestBulkTasks(TestCase):
+    def setUp(self):
+        self.dept = Department.objects.create(name='Engineering')
+        manager_role = Role.objects.create(name='Department Manager')
+        staff_role = Role.objects.create(name='Staff')
+        self.manager = User.objects.create_user(
+            email='manager@example.com', username='manager', password='testpass123',
+            role=manager_role, department=self.dept,
+        )
+        self.staff = User.objects.create_user(
+            email='staff@example.com', username='staff', password='testpass123',
+            role=staff_role, department=self.dept,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def test_mixed_batch_reports_per_item_results(self):
+        existing = Task.objects.create(task_title='Existing', dept=self.dept, assigned_by=self.manager)
+        doomed = Task.objects.create(task_title='Doomed', dept=self.dept, assigned_by=self.manager)
+
+        response = self.client.post('/api/tasks/bulk/', {
+            'create': [
+                {'task_title': 'Sprint item 1', 'assigned_to_id': self.staff.id},
+                {'task_title': 'Sprint item 2', 'assigned_to_id': self.staff.id, 'priority': 'high'},
+                {'task_desc': 'missing title'},
+            ],
+            'update': [{'id': existing.id, 'status': 'completed'}, {'id': 999999, 'status': 'completed'}],
+            'delete': [doomed.id],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([r['status'] for r in response.data['create']], [201, 201, 400])
+        self.assertEqual([r['status'] for r in response.data['update']], [200, 404])
+        self.assertEqual([r['status'] for r in response.data['delete']], [204])
+
+        created = Task.objects.filter(task_title__startswith='Sprint item')
+        self.assertEqual(created.count(), 2)
+        self.assertTrue(all(task.dept_id == self.dept.id for task in created))
+        existing.refresh_from_db()
+        self.assertEqual(existing.status, 'completed')
+        self.assertFalse(Task.objects.filter(id=doomed.id).exists())
+
+        self.assertEqual(Notification.objects.filter(user=self.staff, type='task_assigned').count(), 2)
+        self.assertEqual(Notification.objects.filter(user=self.manager, type='task_completed').count(), 1)
+
+    def test_staff_cannot_update_tasks_they_do_not_own(self):
+        task = Task.objects.create(task_title='Not yours', dept=self.dept, assigned_by=self.manager)
+        self.client.force_authenticate(self.staff)
+        response = self.client.post('/api/tasks/bulk/', {'update': [{'id': task.id, 'status': 'completed'}]}, format='json')
+        self.assertEqual(response.data['update'][0]['status'], 403)
+
+    def test_string_assignee_ids_and_moved_deadlines(self):
+        overdue = Task.objects.create(
+            task_title='Late', dept=self.dept, assigned_by=self.manager, due_date=date(2026, 1, 5),
+        )
+        Task.objects.filter(pk=overdue.pk).update(overdue_at=timezone.now())
+
+        response = self.client.post('/api/tasks/bulk/', {
+            'create': [{'task_title': 'From a form', 'assigned_to_id': str(self.staff.id)}],
+            'update': [{'id': overdue.id, 'assigned_to_id': str(self.staff.id), 'due_date': '2026-02-05'}],
+        }, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+
+        created = Task.objects.get(pk=response.data['create'][0]['id'])
+        overdue.refresh_from_db()
+        self.assertEqual((created.assigned_to_id, overdue.assigned_to_id), (self.staff.id, self.staff.id))
+        self.assertEqual(overdue.due_date, date(2026, 2, 5))
+        self.assertIsNone(overdue.overdue_at)
+
+    def test_task_ids_are_read_as_integers(self):
+        first = Task.objects.create(id=1, task_title='First', dept=self.dept, assigned_by=self.manager)
+        other = Task.objects.create(task_title='Other', dept=self.dept, assigned_by=self.manager)
+
+        response = self.client.post('/api/tasks/bulk/', {
+            'update': [{'id': str(other.id), 'status': 'completed'}, {'id': {}, 'status': 'completed'}, 'nope'],
+            'delete': [True, [1], str(first.id)],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 207, response.data)
+        self.assertEqual([r['status'] for r in response.data['update']], [200, 400, 400])
+        self.assertEqual([r['status'] for r in response.data['delete']], [400, 400, 204])
+        self.assertEqual(response.data['delete'][2]['id'], first.id)
+        self.assertFalse(Task.objects.filter(id=first.id).exists())
+        other.refresh_from_db()
+        self.assertEqual(other.status, 'completed')
+
+    def test_bulk_insert_sets_the_stored_ids(self):
+        tasks = Task.objects.bulk_insert(
+            [Task(task_title=f'Batch {i}', dept=self.dept, assigned_by=self.manager) for i in range(5)],
+            batch_size=2,
+        )
+        stored = dict(Task.objects.filter(task_title__startswith='Batch ').values_list('id', 'task_title'))
+        self.assertEqual({task.pk: task.task_title for task in tasks}, stored)
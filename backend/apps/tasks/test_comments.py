@@ -0,0 +1,52 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from rest_framework.test import APIClient
+
+from apps.users.models import Department, Role
+from .models import Task, Comment
+
+User = get_user_model()
+
+
+class TestTaskComments(TestCase):
+    def setUp(self):
+        dept = Department.objects.create(name='Engineering')
+        role = Role.objects.create(name='Staff')
+        self.user = User.objects.create_user(
+            email='staff@example.com', username='staff', password='testpass123',
+            role=role, department=dept,
+        )
+        self.other = User.objects.create_user(
+            email='other@example.com', username='other', password='testpass123',
+            role=role, department=dept,
+        )
+        self.task = Task.objects.create(task_title='Incident', dept=dept, assigned_to=self.user)
+        self.comments = [
+            Comment.objects.create(task=self.task, user=(self.user, self.other)[i % 2], content=f'Update {i}')
+            for i in range(7)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/tasks/{self.task.id}/comments/'
+
+    def test_pages_newest_first_with_compact_authors(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'page_size': 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c['id'] for c in response.data], [c.id for c in reversed(self.comments)][:5])
+        self.assertEqual(set(response.data[0]['user']), {'id', 'username', 'first_name', 'last_name', 'email'})
+        user_table = connection.ops.quote_name(User._meta.db_table)
+        author_queries = [q for q in queries.captured_queries if f'FROM {user_table}' in q['sql']]
+        self.assertEqual(len(author_queries), 1)
+
+        next_url = response['Link'].split(';')[0].strip('<>')
+        rest = self.client.get(next_url)
+        self.assertEqual([c['id'] for c in rest.data], [c.id for c in reversed(self.comments)][5:])
+
+    def test_since_id_returns_newer_comments_oldest_first(self):
+        response = self.client.get(self.url, {'since_id': self.comments[4].id})
+        self.assertEqual([c['id'] for c in response.data], [self.comments[5].id, self.comments[6].id])
+
+        self.assertEqual(self.client.get(self.url, {'since_id': 'abc'}).status_code, 400)
@@ -0,0 +1,100 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps import conditional
+from apps.users.models import Department, Role
+from apps.messaging.models import Message
+from .models import Task, Comment
+from .serializers import TaskListSerializer
+
+User = get_user_model()
+
+
+class TestConditionalGet(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.dept = Department.objects.create(name='Engineering')
+        role = Role.objects.create(name='Department Manager')
+        self.user = User.objects.create_user(
+            email='manager@example.com', username='manager', password='testpass123',
+            role=role, department=self.dept,
+        )
+        self.task = Task.objects.create(task_title='First', dept=self.dept, assigned_to=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_list_is_not_modified_without_serializing(self):
+        first = self.client.get('/api/tasks/')
+        self.assertEqual(first.status_code, 200)
+
+        with mock.patch.object(TaskListSerializer, 'to_representation') as to_representation:
+            response = self._revalidate('/api/tasks/', first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        to_representation.assert_not_called()
+
+        # Other query strings are different representations
+        self.assertEqual(self._revalidate('/api/tasks/?status=pending', first['ETag']).status_code, 200)
+
+    def test_writes_change_the_validator(self):
+        etag = self.client.get('/api/tasks/')['ETag']
+
+        self.task.status = 'completed'
+        self.task.save()
+        response = self._revalidate('/api/tasks/', etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        Comment.objects.create(task=self.task, user=self.user, content='Done')
+        response = self._revalidate('/api/tasks/', etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['comment_count'], 1)
+
+        etag = response['ETag']
+        self.user.first_name = 'Renamed'
+        self.user.save()
+        self.assertEqual(self._revalidate('/api/tasks/', etag).status_code, 200)
+
+    def test_same_second_delete_changes_the_validator(self):
+        Task.objects.create(task_title='Second', dept=self.dept)
+        first = self.client.get('/api/tasks/')
+        self.assertNotIn('Last-Modified', first)
+        Task.objects.filter(task_title='Second').delete()
+        self.assertEqual(self._revalidate('/api/tasks/', first['ETag']).status_code, 200)
+        self.assertEqual(
+            self.client.get('/api/tasks/', HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT').status_code, 200
+        )
+
+    def test_evicted_generation_does_not_revive_a_stale_watermark(self):
+        etag = self.client.get('/api/tasks/')['ETag']
+        # A write in another worker: its invalidation replaced the shared
+        # generation, which this cache then lost
+        Task.objects.filter(pk=self.task.pk).update(status='completed', updated_at=timezone.now())
+        conditional.invalidate('tasks')
+        cache.delete('watermark-generation:tasks')
+        self.assertEqual(self._revalidate('/api/tasks/', etag).status_code, 200)
+
+    def test_invalidated_again_when_the_write_commits(self):
+        # Other connections still read the old rows until the commit, so what
+        # they cache meanwhile must not outlive it
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.save()
+            during = cache.get('watermark-generation:tasks')
+        self.assertNotEqual(cache.get('watermark-generation:tasks'), during)
+
+    def test_messages_and_users(self):
+        Message.objects.create(sender=self.user, dept=self.dept, message_body='Hello')
+        for url in ('/api/messaging/department/', '/api/users/manage/'):
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self._revalidate(url, etag).status_code, 304)
+
+        etag = self.client.get('/api/messaging/department/')['ETag']
+        Message.objects.all().delete()
+        self.assertEqual(self._revalidate('/api/messaging/department/', etag).status_code, 200)
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.notifications.models import Notification
+from apps.users.models import Department, Role
+from . import deadlines, feed
+from .deadlines import DeadlineScheduler, SimulatedClock, deadline_for
+from .models import Task
+
+User = get_user_model()
+
+
+class TestDeadlineScheduler(TestCase):
+    def setUp(self):
+        self.dept = Department.objects.create(name='Engineering')
+        role = Role.objects.create(name='Staff')
+        self.manager = User.objects.create_user(
+            email='manager@example.com', username='manager', password='testpass123',
+            role=role, department=self.dept,
+        )
+        self.staff = User.objects.create_user(
+            email='staff@example.com', username='staff', password='testpass123',
+            role=role, department=self.dept,
+        )
+        self.clock = SimulatedClock(timezone.make_aware(datetime(2026, 3, 2, 9, 0)))
+        self.today = timezone.localdate(self.clock.now())
+        self.scheduler = DeadlineScheduler(self.clock)
+        patcher = mock.patch.object(deadlines, 'scheduler', self.scheduler)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _task(self, title, **fields):
+        return Task.objects.create(
+            task_title=title, dept=self.dept, assigned_to=self.staff, assigned_by=self.manager, **fields
+        )
+
+    def test_rebuild_then_fire_when_deadline_passes(self):
+        due_today = self._task('Report', due_date=self.today, priority='low')
+        due_later = self._task('Review', due_date=self.today + timedelta(days=3))
+        self._task('Done', due_date=self.today, status='completed')
+        self._task('Someday')
+
+        self.scheduler.rebuild()
+        self.assertEqual(len(self.scheduler), 2)
+        # Nothing due: only the poll of the event feed
+        with self.assertNumQueries(1):
+            self.assertEqual(self.scheduler.run_pending(), [])
+
+        self.clock.advance(timedelta(hours=15, minutes=1))
+        self.assertEqual(self.scheduler.run_pending(), [due_today.id])
+        due_today.refresh_from_db()
+        self.assertEqual(due_today.overdue_at, self.clock.now())
+        self.assertEqual(due_today.priority, 'medium')
+        self.assertEqual(
+            set(Notification.objects.filter(type='task_overdue').values_list('user_id', flat=True)),
+            {self.staff.id, self.manager.id},
+        )
+        self.assertEqual(self.scheduler.next_deadline(), deadline_for(due_later.due_date))
+
+        # Already handled: restarting does not fire it again
+        self.scheduler.rebuild()
+        self.assertEqual(self.scheduler.run_pending(), [])
+
+    def test_follows_task_saves(self):
+        self.scheduler.rebuild()
+        task = self._task('Patch', due_date=self.today)
+        self.assertEqual(self.scheduler.next_deadline(), deadline_for(self.today))
+
+        task.due_date = self.today + timedelta(days=1)
+        task.save()
+        self.assertEqual(self.scheduler.next_deadline(), deadline_for(task.due_date))
+
+        task.status = 'completed'
+        task.save()
+        self.assertIsNone(self.scheduler.next_deadline())
+
+    def test_moved_deadline_fires_again(self):
+        self.scheduler.rebuild()
+        task = self._task('Audit', due_date=self.today, priority='high')
+        self.clock.advance(timedelta(days=1))
+        self.assertEqual(self.scheduler.run_pending(), [task.id])
+
+        task.refresh_from_db()
+        task.due_date = self.today + timedelta(days=2)
+        task.save()
+        task.refresh_from_db()
+        self.assertIsNone(task.overdue_at)
+
+        self.clock.advance(timedelta(days=2))
+        self.assertEqual(self.scheduler.run_pending(), [task.id])
+        self.assertEqual(Task.objects.get(pk=task.pk).priority, 'high')
+
+    def test_daily_load_catches_past_due_dates_written_elsewhere(self):
+        self.scheduler.rebuild()
+        task = self._task('Backdated')
+        recent = self._task('Yesterday')
+        # Written by another process: this scheduler is not told
+        Task.objects.filter(pk=task.pk).update(due_date=self.today - timedelta(days=90))
+        Task.objects.filter(pk=recent.pk).update(due_date=self.today - timedelta(days=1))
+        self.assertEqual(self.scheduler.run_pending(), [])
+
+        self.clock.advance(timedelta(days=1))
+        self.assertEqual(sorted(self.scheduler.run_pending()), [task.id, recent.id])
+
+    def test_follows_writes_of_other_processes_through_the_feed(self):
+        self.scheduler.rebuild()
+        done = self._task('Finished elsewhere', due_date=self.today)
+        feed.publish()
+        self.scheduler.run_pending()
+        self.assertEqual(len(self.scheduler), 1)
+
+        # The web process's scheduler is never loaded, so its hooks do nothing
+        with mock.patch.object(deadlines, 'scheduler', DeadlineScheduler(self.clock)):
+            backdated = self._task('Backdated', due_date=self.today - timedelta(days=3))
+            done.status = 'completed'
+            done.save()
+            title_only = self._task('Renamed later')
+            title_only.task_title = 'Renamed'
+            title_only.save()
+        feed.publish()
+
+        self.assertEqual(self.scheduler.run_pending(), [backdated.id])
+        self.assertEqual(len(self.scheduler), 0)
@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.users.models import Department, Role
+from . import importer, stats
+from .models import Task
+
+User = get_user_model()
+
+CSV = """task_title,task_desc,status,priority,due_date,assigned_to
+Migrate wiki,,pending,high,2030-01-31,Staff@Example.com
+Close tickets,Old queue,in_progress,,,
+,Missing title,pending,low,,
+Bad values,,done,urgent,31/01/2030,nobody@example.com
+"""
+
+
+class TestTaskImport(TestCase):
+    def setUp(self):
+        self.dept = Department.objects.create(name='Engineering')
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='testpass123',
+            role=Role.objects.create(name='Admin'), department=self.dept,
+        )
+        self.staff = User.objects.create_user(
+            email='staff@example.com', username='staff', password='testpass123',
+            role=Role.objects.create(name='Staff'), department=self.dept,
+        )
+        self.client = APIClient()
+
+    def _upload(self, user, content=CSV):
+        self.client.force_authenticate(user)
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        upload = SimpleUploadedFile('tasks.csv', content, content_type='text/csv')
+        return self.client.post('/api/tasks/import/', {'file': upload}, format='multipart')
+
+    def test_imports_valid_rows_and_reports_the_rest(self):
+        response = self._upload(self.admin)
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['rows'], response.data['created'], response.data['failed']), (4, 2, 2))
+        self.assertEqual([error['line'] for error in response.data['errors']], [4, 5])
+        self.assertEqual(
+            set(response.data['errors'][1]['errors']), {'status', 'priority', 'due_date', 'assigned_to'}
+        )
+
+        task = Task.objects.get(task_title='Migrate wiki')
+        self.assertEqual((task.assigned_to, task.assigned_by, task.priority_rank), (self.staff, self.admin, 3))
+        self.assertEqual(stats.summary(self.dept.id)['total'], 2)
+
+    def test_admin_only_and_header_required(self):
+        self.assertEqual(self._upload(self.staff).status_code, 403)
+        self.assertEqual(self._upload(self.admin, 'title,status\nx,pending\n').status_code, 400)
+
+    @mock.patch.object(importer, 'BATCH_SIZE', 50)
+    def test_unreadable_line_stops_the_import_after_the_committed_batches(self):
+        # The text layer decodes in 8 KB chunks, so the bad bytes are met after several batches
+        rows = ''.join(f'Task {i:04},,pending,low,,\n' for i in range(600))
+        response = self._upload(self.admin, b'task_title,task_desc,status,priority,due_date,assigned_to\n'
+                                + rows.encode() + b'Broken \xff title,,,,,\n')
+        self.assertEqual(response.status_code, 207)
+        read = response.data['rows']
+        self.assertGreater(read, 100)
+        self.assertEqual((response.data['created'], response.data['failed']), (read, 0))
+        self.assertEqual(response.data['stopped']['line'], read + 2)
+        self.assertIn("can't decode", response.data['stopped']['error'])
+        self.assertEqual(Task.objects.count(), read)
+
+        response = self._upload(self.admin, f'task_title\nFirst\n"{"x" * 200000}"\nNever read\n')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['created'], response.data['stopped']['line']), (1, 3))
+        self.assertEqual(self._upload(self.admin, b'task_title\xff\nx\n').status_code, 400)
@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.test import TestCase, modify_settings
+from rest_framework.test import APIClient
+
+from apps.users import principal
+from apps.users.models import Department, Role
+from .models import Comment, Task
+
+User = get_user_model()
+
+
+# The audit log rows written per request are not part of what is measured here
+@modify_settings(MIDDLEWARE={'remove': 'apps.adminpanel.middleware.AuditLogMiddleware'})
+class TestTaskListQueries(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dept = Department.objects.create(name='Engineering')
+        other = Department.objects.create(name='Finance')
+        role = Role.objects.create(name='Department Manager')
+        cls.manager = User.objects.create_user(
+            email='manager@example.com', username='manager', password='testpass123',
+            role=role, department=cls.dept,
+        )
+        cls.staff = User.objects.create_user(
+            email='staff@example.com', username='staff', password='testpass123', department=cls.dept,
+        )
+        cls.expected = {}
+        for i in range(6):
+            task = Task.objects.create(
+                task_title=f'Task {i}', dept=cls.dept, assigned_by=cls.manager,
+                assigned_to=cls.staff if i % 2 else None,
+            )
+            for j in range(i):
+                Comment.objects.create(task=task, user=(cls.manager, cls.staff)[j % 2], content=f'Comment {j}')
+            cls.expected[task.id] = i
+        elsewhere = Task.objects.create(task_title='Elsewhere', dept=other)
+        Comment.objects.create(task=elsewhere, user=cls.manager, content='Not counted')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def test_list_query_count_does_not_grow_with_tasks_or_comments(self):
+        # Role names, the task and user watermarks (conditional GET), then one page
+        # query carrying the users, department and comment counts
+        principal.clear_role_names()
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({task['id']: task['comment_count'] for task in response.data}, self.expected)
+        self.assertEqual(
+            {task['id']: task['assigned_to'] and task['assigned_to']['id'] for task in response.data},
+            {task_id: self.staff.id if count % 2 else None for task_id, count in self.expected.items()},
+        )
+
+        task_id = next(iter(self.expected))
+        for i in range(3):
+            Comment.objects.create(task_id=task_id, user=self.staff, content=f'More {i}')
+        Task.objects.create(task_title='Newest', dept=self.dept, assigned_by=self.manager, assigned_to=self.staff)
+        cache.clear()
+        principal.clear_role_names()
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/tasks/')
+        counts = {task['id']: task['comment_count'] for task in response.data}
+        self.assertEqual(len(counts), 7)
+        self.assertEqual(counts[task_id], self.expected[task_id] + 3)
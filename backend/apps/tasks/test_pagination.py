@@ -0,0 +1,80 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.users.models import Department, Role
+from .models import Task
+
+User = get_user_model()
+
+
+class TestKeysetPagination(TestCase):
+    def setUp(self):
+        self.dept = Department.objects.create(name='Engineering')
+        role = Role.objects.create(name='Staff')
+        self.user = User.objects.create_user(
+            email='staff@example.com',
+            username='staff',
+            password='testpass123',
+            role=role,
+            department=self.dept,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Task.objects.bulk_create([
+            Task(task_title=f'Task {i}', dept=self.dept, assigned_by=self.user)
+            for i in range(25)
+        ])
+
+    def _links(self, response):
+        links = {}
+        for part in response.headers.get('Link', '').split(','):
+            if part.strip():
+                url, rel = part.split(';')
+                links[rel.strip()[5:-1]] = url.strip()[1:-1]
+        return links
+
+    def test_walks_every_task_once_without_count(self):
+        seen = []
+        url = '/api/tasks/?page_size=10'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data), 10)
+            seen.extend(task['id'] for task in response.data)
+            url = self._links(response).get('next')
+        expected = list(Task.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get('/api/tasks/?page_size=10')
+        second = self.client.get(self._links(first)['next'])
+        back = self.client.get(self._links(second)['previous'])
+        self.assertEqual(
+            [task['id'] for task in back.data],
+            [task['id'] for task in first.data],
+        )
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/tasks/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+    def test_priority_ordering_uses_rank(self):
+        for task, priority in zip(Task.objects.order_by('id')[:6], ['low', 'high', 'medium', 'high', 'low', 'medium']):
+            task.priority = priority
+            task.save()
+        seen = []
+        url = '/api/tasks/?ordering=-priority&page_size=4'
+        while url:
+            response = self.client.get(url)
+            seen.extend(task['priority'] for task in response.data)
+            url = self._links(response).get('next')
+        ranks = [Task.PRIORITY_RANKS[priority] for priority in seen]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+        self.assertEqual(seen[:2], ['high', 'high'])
+
+    def test_reference_lists_are_not_paginated(self):
+        Department.objects.bulk_create([Department(name=f'Dept {i}') for i in range(5)])
+        response = self.client.get('/api/departments/?page_size=2')
+        self.assertEqual(len(response.data), Department.objects.count())
+        self.assertNotIn('Link', response.headers)
@@ -0,0 +1,49 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.users.models import Department, Role
+from . import search
+from .models import Task, Comment
+
+User = get_user_model()
+
+
+class TestTaskSearch(TestCase):
+    def setUp(self):
+        search.index.clear()
+        self.dept = Department.objects.create(name='Engineering')
+        self.other_dept = Department.objects.create(name='Finance')
+        role = Role.objects.create(name='Staff')
+        self.user = User.objects.create_user(
+            email='staff@example.com', username='staff', password='testpass123',
+            role=role, department=self.dept,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _search(self, query):
+        response = self.client.get('/api/tasks/', {'search': query})
+        self.assertEqual(response.status_code, 200)
+        return [task['task_title'] for task in response.data]
+
+    def test_ranks_title_matches_first_and_scopes_to_department(self):
+        Task.objects.create(task_title='Quarterly invoice run', dept=self.dept)
+        Task.objects.create(task_title='Update wiki', task_desc='mention the invoice template', dept=self.dept)
+        Task.objects.create(task_title='Invoice audit', dept=self.other_dept)
+        self.assertEqual(self._search('invoice'), ['Quarterly invoice run', 'Update wiki'])
+
+    def test_index_follows_task_and_comment_writes(self):
+        task = Task.objects.create(task_title='Server migration', dept=self.dept)
+        self.assertEqual(self._search('kubernetes'), [])
+
+        comment = Comment.objects.create(task=task, user=self.user, content='Move to kubernetes')
+        self.assertEqual(self._search('kubernetes'), ['Server migration'])
+
+        comment.delete()
+        self.assertEqual(self._search('kubernetes'), [])
+
+        task.task_title = 'Database migration'
+        task.save()
+        self.assertEqual(self._search('server'), [])
+        self.assertEqual(self._search('database'), ['Database migration'])
@@ -0,0 +1,61 @@
+import io
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.users.models import Department, Role
+from .models import Task, TaskStats
+
+User = get_user_model()
+
+
+class TestTaskStats(TestCase):
+    def setUp(self):
+        self.dept = Department.objects.create(name='Engineering')
+        role = Role.objects.create(name='Department Manager')
+        self.user = User.objects.create_user(
+            email='manager@example.com', username='manager', password='testpass123',
+            role=role, department=self.dept,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _stats(self):
+        response = self.client.get('/api/tasks/stats/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_counters_follow_task_writes(self):
+        task = Task.objects.create(task_title='One', dept=self.dept, assigned_to=self.user)
+        Task.objects.create(task_title='Two', dept=self.dept, priority='high')
+        self.client.post(f'/api/tasks/{task.id}/change_status/', {'status': 'completed'}, format='json')
+        self.client.post('/api/tasks/bulk/', {'create': [{'task_title': 'Three', 'priority': 'low'}]}, format='json')
+
+        data = self._stats()
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(data['by_status']['completed'], 1)
+        self.assertEqual(data['by_status']['pending'], 2)
+        self.assertEqual(data['by_priority'], {'low': 1, 'medium': 1, 'high': 1})
+        self.assertIn({'assigned_to': self.user.id, 'count': 1}, data['by_assignee'])
+
+        task.delete()
+        self.assertEqual(self._stats()['by_status']['completed'], 0)
+        out = io.StringIO()
+        call_command('rebuild_task_stats', '--verify-only', stdout=out)
+        self.assertIn('bucket(s) verified', out.getvalue())
+        self.assertNotIn('Rebuilt', out.getvalue())
+
+    def test_rebuild_repairs_drift(self):
+        Task.objects.create(task_title='One', dept=self.dept)
+        TaskStats.objects.update(count=42)
+        out = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command('rebuild_task_stats', '--verify-only', stdout=out)
+        self.assertIn('expected 1, counter has 42', out.getvalue())
+
+        out = io.StringIO()
+        call_command('rebuild_task_stats', stdout=out)
+        self.assertIn('Rebuilt task counters', out.getvalue())
+        self.assertEqual(self._stats()['total'], 1)
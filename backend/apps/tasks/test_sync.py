@@ -0,0 +1,211 @@
+import threading
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.pagination import encode_cursor
+from apps.users.models import Department, Role
+from . import feed
+from .models import Task
+
+User = get_user_model()
+
+
+class TestTaskChanges(TestCase):
+    def setUp(self):
+        self.dept = Department.objects.create(name='Engineering')
+        role = Role.objects.create(name='Department Manager')
+        self.user = User.objects.create_user(
+            email='manager@example.com', username='manager', password='testpass123',
+            role=role, department=self.dept,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _changes(self, **params):
+        # TestCase never commits, so stand in for the commit hooks that number events
+        feed.publish()
+        response = self.client.get('/api/tasks/changes/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_returns_only_the_diff_since_the_cursor(self):
+        first = Task.objects.create(task_title='First', dept=self.dept)
+        second = Task.objects.create(task_title='Second', dept=self.dept, assigned_to=self.user)
+        Task.objects.create(task_title='Elsewhere', dept=Department.objects.create(name='Finance'))
+
+        initial = self._changes()
+        self.assertEqual([task['id'] for task in initial['changed']], [first.id, second.id])
+        self.assertFalse(initial['has_more'])
+
+        self.assertEqual(self._changes(since=initial['cursor'])['changed'], [])
+
+        first.status = 'completed'
+        first.save()
+        second_id = second.id
+        second.delete()
+        delta = self._changes(since=initial['cursor'])
+        self.assertEqual([task['id'] for task in delta['changed']], [first.id])
+        self.assertEqual(delta['removed'], [second_id])
+
+    def test_tasks_leaving_the_filter_are_reported_removed(self):
+        task = Task.objects.create(task_title='Mine', dept=self.dept, assigned_to=self.user)
+        initial = self._changes(assigned_to=self.user.id)
+        self.assertEqual(len(initial['changed']), 1)
+
+        task.assigned_to = None
+        task.save()
+        delta = self._changes(assigned_to=self.user.id, since=initial['cursor'])
+        self.assertEqual(delta['changed'], [])
+        self.assertEqual(delta['removed'], [task.id])
+
+    def test_pages_with_has_more(self):
+        for i in range(5):
+            Task.objects.create(task_title=f'Task {i}', dept=self.dept)
+        page = self._changes(page_size=2)
+        seen = [task['id'] for task in page['changed']]
+        while page['has_more']:
+            page = self._changes(page_size=2, since=page['cursor'])
+            seen += [task['id'] for task in page['changed']]
+        self.assertEqual(sorted(seen), sorted(Task.objects.values_list('id', flat=True)))
+
+    def test_task_that_leaves_and_returns_is_sent_once(self):
+        task = Task.objects.create(task_title='Roaming', dept=self.dept)
+        cursor = self._changes()['cursor']
+        finance = Department.objects.create(name='Finance')
+        for dept in (finance, self.dept):
+            task.dept = dept
+            task.save()
+        delta = self._changes(since=cursor)
+        self.assertEqual([item['id'] for item in delta['changed']], [task.id])
+        self.assertEqual(delta['removed'], [])
+
+        task.dept = finance
+        task.save()
+        delta = self._changes(since=delta['cursor'])
+        self.assertEqual((delta['changed'], delta['removed']), ([], [task.id]))
+
+    def test_comments_count_as_changes(self):
+        task = Task.objects.create(task_title='Discussed', dept=self.dept)
+        cursor = self._changes()['cursor']
+        task.comments.create(user=self.user, content='Looks good')
+        self.assertEqual([item['id'] for item in self._changes(since=cursor)['changed']], [task.id])
+
+    def test_timestamp_cursor_has_expired(self):
+        cursor = encode_cursor({'t': ['2026-01-01T00:00:00+00:00', 1], 'd': ['2026-01-01T00:00:00+00:00', 1]})
+        self.assertEqual(self.client.get('/api/tasks/changes/', {'since': cursor}).status_code, 410)
+
+    def test_cursor_ahead_of_the_feed_is_rejected(self):
+        cursor = encode_cursor({'s': 10 ** 9})
+        self.assertEqual(self.client.get('/api/tasks/changes/', {'since': cursor}).status_code, 400)
+
+
+class TestTaskEvents(TestCase):
+    def setUp(self):
+        self.dept = Department.objects.create(name='Engineering')
+        role = Role.objects.create(name='Department Manager')
+        self.user = User.objects.create_user(
+            email='manager@example.com', username='manager', password='testpass123',
+            role=role, department=self.dept,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _events(self, **params):
+        # TestCase never commits, so stand in for the commit hooks that number events
+        feed.publish()
+        response = self.client.get('/api/tasks/events/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_feed_records_each_write_in_order(self):
+        task = Task.objects.create(task_title='Deploy', dept=self.dept)
+        start = self._events()['last_seq']
+
+        task.assigned_to = self.user
+        task.save()
+        response = self.client.post(f'/api/tasks/{task.id}/change_status/', {'status': 'completed'})
+        self.assertEqual(response.status_code, 200)
+        task.refresh_from_db()
+        finance = Department.objects.create(name='Finance')
+        task.dept = finance
+        task.save()
+
+        feed = self._events(after=start)
+        self.assertEqual(
+            [(event['kind'], event['changed']) for event in feed['events']],
+            [('updated', ['assigned_to_id']), ('updated', ['status']), ('moved_out', ['dept_id'])],
+        )
+        self.assertEqual(feed['events'][1]['previous_status'], 'pending')
+        self.assertEqual(feed['events'][1]['status'], 'completed')
+        self.assertEqual(self._events(after=feed['last_seq'])['events'], [])
+
+    def test_bulk_writes_are_recorded(self):
+        response = self.client.post('/api/tasks/bulk/', {
+            'create': [{'task_title': 'One'}, {'task_title': 'Two'}],
+        }, format='json')
+        ids = [result['id'] for result in response.data['create']]
+        self.client.post('/api/tasks/bulk/', {'delete': ids[:1]}, format='json')
+
+        kinds = [(event['task_id'], event['kind']) for event in self._events()['events']]
+        self.assertEqual(kinds, [(ids[0], 'created'), (ids[1], 'created'), (ids[0], 'deleted')])
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class TestTaskEventsCommitOrder(TransactionTestCase):
+    """Needs a database with concurrent writers (MySQL); SQLite serialises them."""
+
+    def setUp(self):
+        self.dept = Department.objects.create(name='Engineering')
+        self.user = User.objects.create_user(
+            email='manager@example.com', username='manager', password='testpass123', department=self.dept,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # Create both writers' TaskStats rows up front, so they lock different rows
+        for priority in ('low', 'high'):
+            Task.objects.create(task_title='Existing', dept=self.dept, priority=priority)
+
+    def _events(self, **params):
+        response = self.client.get('/api/tasks/events/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def _changes(self, **params):
+        response = self.client.get('/api/tasks/changes/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_transaction_committing_late_is_not_skipped(self):
+        start = self._events()['last_seq']
+        since = self._changes()['cursor']
+        inserted, release = threading.Event(), threading.Event()
+
+        def slow_writer():
+            try:
+                with transaction.atomic():
+                    Task.objects.create(task_title='Slow import', dept=self.dept, priority='low')
+                    inserted.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        writer = threading.Thread(target=slow_writer)
+        writer.start()
+        try:
+            self.assertTrue(inserted.wait(10))
+            fast = Task.objects.create(task_title='Quick edit', dept=self.dept, priority='high')
+            first = self._events(after=start)
+            synced = self._changes(since=since)
+        finally:
+            release.set()
+            writer.join()
+
+        self.assertEqual([event['task_id'] for event in first['events']], [fast.id])
+        slow = Task.objects.get(task_title='Slow import')
+        self.assertLess(slow.id, fast.id)
+        self.assertEqual([event['task_id'] for event in self._events(after=first['last_seq'])['events']], [slow.id])
+        self.assertEqual([task['id'] for task in synced['changed']], [fast.id])
+        self.assertEqual([task['id'] for task in self._changes(since=synced['cursor'])['changed']], [slow.id])
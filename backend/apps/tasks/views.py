@@ -1,28 +1,65 @@
-from rest_framework import viewsets, permissions, filters, status
+import io
+
+from rest_framework import serializers, viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.parsers import MultiPartParser, FormParser
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
-from .models import Task, Comment
-from .serializers import TaskSerializer, CommentSerializer
+from apps.conditional import ConditionalListMixin
+from apps.exports import export_response
+from apps.users.models import Department
+from apps.users.permissions import IsAdmin
+from apps.users.principal import get_principal
+from apps.users.serializers import UserSummarySerializer
+from .models import Task, Comment, TaskEvent
+from .serializers import (
+    TaskSerializer, TaskListSerializer, CommentSerializer, CommentListSerializer, TaskEventSerializer
+)
 from .permissions import IsDeptManagerOrAssignee, IsTaskParticipant
+from . import stats as task_stats
+from . import sync
+from .importer import ImportFormatError, import_tasks
+from .filters import TaskOrderingFilter
+from .search import TaskSearchFilter
+from .signals import tasks_bulk_saved
+
+
+def _integer(value):
+    """`value` as TaskSerializer's IntegerFields read it (3, "3", "3.0"), or None."""
+    try:
+        return serializers.IntegerField().to_internal_value(value)
+    except serializers.ValidationError:
+        return None
+
 
-class TaskViewSet(viewsets.ModelViewSet):
+def _task_id(value):
+    """A bulk item's task id as an int, or None; booleans are not ids."""
+    return None if isinstance(value, bool) else _integer(value)
+
+
+class TaskViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows tasks to be viewed or edited.
     """
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated, IsDeptManagerOrAssignee]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['task_title', 'task_desc', 'status', 'priority']
+    # TaskSearchFilter ranks ?search= results, so it runs after the ordering filter
+    filter_backends = [TaskOrderingFilter, TaskSearchFilter]
     ordering_fields = ['created_at', 'due_date', 'priority', 'status']
     ordering = ['-created_at']
+    max_bulk_items = 1000
 
     def get_queryset(self):
         """
         This view should return a list of all tasks for the user's department.
         """
-        queryset = Task.objects.filter(dept=self.request.user.department)
+        queryset = Task.objects.filter(dept_id=get_principal(self.request).dept_id)
         
         # Filter by status if provided
         status = self.request.query_params.get('status', None)
@@ -38,27 +75,190 @@ class TaskViewSet(viewsets.ModelViewSet):
         priority = self.request.query_params.get('priority', None)
         if priority is not None:
             queryset = queryset.filter(priority=priority)
-            
-        return queryset.select_related('assigned_to', 'assigned_by', 'dept')
-        
+
+        queryset = queryset.select_related('assigned_to', 'assigned_by', 'dept')
+        if self.action in ('list', 'changes'):
+            # Correlated count: only the rows of the current page get counted
+            comment_counts = (
+                Comment.objects.filter(task=OuterRef('pk'))
+                .order_by()
+                .values('task')
+                .annotate(count=Count('pk'))
+                .values('count')
+            )
+            queryset = queryset.annotate(
+                comment_count=Coalesce(Subquery(comment_counts, output_field=IntegerField()), Value(0))
+            )
+        elif self.action in ('retrieve', 'update', 'partial_update', 'change_status'):
+            queryset = queryset.select_related(
+                'assigned_to__role', 'assigned_to__department',
+                'assigned_by__role', 'assigned_by__department',
+            ).prefetch_related('comments__user__role', 'comments__user__department')
+        return queryset
+
+    def get_watermark_sources(self):
+        dept_id = get_principal(self.request).dept_id
+        return [
+            ('tasks', dept_id, Task.objects.filter(dept_id=dept_id), 'updated_at'),
+            ('users', 'all', get_user_model().objects.all(), 'updated_at'),
+        ]
+
+    def get_serializer_class(self):
+        if self.action in ('list', 'changes'):
+            return TaskListSerializer
+        return TaskSerializer
+
     def perform_create(self, serializer):
         """Set the assigned_by and department fields to the current user's values."""
         serializer.save(
-            assigned_by=self.request.user,
-            dept=self.request.user.department
+            assigned_by_id=get_principal(self.request).user_id,
+            dept_id=get_principal(self.request).dept_id
         )
     
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        Task breakdowns by status, priority and assignee for the user's department,
+        read from the incrementally maintained TaskStats counters.
+        """
+        return Response(task_stats.summary(get_principal(request).dept_id))
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Delta sync: tasks created or updated after `?since=<cursor>` plus the ids
+        of tasks that left the caller's view (deleted, moved, or no longer
+        matching the list filters). Omit `since` for an initial full sync and
+        keep calling with the returned cursor while `has_more` is true.
+        """
+        limit = self.paginator.get_page_size(request)
+        try:
+            task_ids, cursor, has_more = sync.changes(
+                get_principal(request).dept_id, request.query_params.get('since'), limit
+            )
+        except sync.InvalidCursor:
+            return Response({"since": ["Invalid cursor."]}, status=status.HTTP_400_BAD_REQUEST)
+        except sync.ExpiredCursor:
+            return Response(
+                {"since": ["Cursor expired, run a full sync without `since`."]},
+                status=status.HTTP_410_GONE
+            )
+
+        visible = list(self.get_queryset().filter(id__in=task_ids).order_by('updated_at', 'id'))
+        visible_ids = {task.id for task in visible}
+        return Response({
+            'changed': self.get_serializer(visible, many=True).data,
+            'removed': [task_id for task_id in task_ids if task_id not in visible_ids],
+            'cursor': cursor,
+            'has_more': has_more,
+        })
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream the user's department tasks (same filters as the list) as CSV or
+        NDJSON; see `apps.exports` for `output`, `compress` and `after`.
+        """
+        return export_response(request, self.get_queryset(), [
+            ('id', 'id'),
+            ('task_title', 'task_title'),
+            ('task_desc', 'task_desc'),
+            ('status', 'status'),
+            ('priority', 'priority'),
+            ('due_date', 'due_date'),
+            ('overdue_at', 'overdue_at'),
+            ('assigned_to', 'assigned_to__email'),
+            ('assigned_by', 'assigned_by__email'),
+            ('department', 'dept__name'),
+            ('created_at', 'created_at'),
+            ('updated_at', 'updated_at'),
+        ], filename='tasks')
+
+    @action(detail=False, methods=['post'], url_path='import', permission_classes=[IsAdmin],
+            parser_classes=[MultiPartParser, FormParser])
+    def import_csv(self, request):
+        """
+        Import tasks from an uploaded CSV (`file`) into `dept_id` (default: the
+        admin's own department). See `apps.tasks.importer` for the columns.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"file": ["This field is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        dept_id = request.data.get('dept_id') or get_principal(request).dept_id
+        dept = Department.objects.filter(id=dept_id).first() if str(dept_id).isdigit() else None
+        if dept is None:
+            return Response({"dept_id": ["Department not found."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Uploads above FILE_UPLOAD_MAX_MEMORY_SIZE are spooled to disk, so this stays streaming
+        lines = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        try:
+            result = import_tasks(lines, dept, assigned_by=request.user)
+        except ImportFormatError as exc:
+            return Response({"file": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            lines.detach()
+        return Response(
+            result.as_dict(),
+            status=status.HTTP_207_MULTI_STATUS if result.failed or result.stopped else status.HTTP_200_OK
+        )
+
+    @action(detail=False, methods=['get'])
+    def events(self, request):
+        """
+        Task change events of the user's department after `?after=<seq>`
+        (default 0), in commit order. Keep calling with `after` set to the
+        returned `last_seq` while `has_more` is true.
+
+        The commit order has a write-side cost: every transaction that writes
+        tasks then takes the single TaskEventSequence row lock to number its
+        events (apps.tasks.feed), so publishing is serialised across all
+        departments: it is held only for the numbering, after the write has
+        committed, but every writing request waits for its turn.
+        """
+        after = request.query_params.get('after', '0')
+        if not after.isdigit():
+            return Response({"after": ["Must be an event sequence number."]}, status=status.HTTP_400_BAD_REQUEST)
+        limit = self.paginator.get_page_size(request)
+        # `seq` is only set once an event has committed, in commit order (see apps.tasks.feed)
+        events = list(
+            TaskEvent.objects.filter(dept_id=get_principal(request).dept_id, seq__gt=int(after))
+            .order_by('seq')[:limit + 1]
+        )
+        has_more = len(events) > limit
+        events = events[:limit]
+        return Response({
+            'events': TaskEventSerializer(events, many=True).data,
+            'last_seq': events[-1].seq if events else int(after),
+            'has_more': has_more,
+        })
+
     @action(detail=True, methods=['get', 'post'], permission_classes=[IsTaskParticipant])
     def comments(self, request, pk=None):
         """
-        List all comments for a task or create a new comment.
+        List a task's comments (newest first, cursor paginated) or create a new comment.
+        `?since_id=<comment id>` returns the comments posted after that one,
+        oldest first, for live views.
         """
         task = self.get_object()
         
         if request.method == 'GET':
-            comments = task.comments.all().select_related('user')
-            serializer = CommentSerializer(comments, many=True)
-            return Response(serializer.data)
+            comments = task.comments.all()
+            since_id = request.query_params.get('since_id')
+            if since_id is not None:
+                anchor = comments.filter(pk=since_id).values('created_at', 'id').first() if since_id.isdigit() else None
+                if anchor is None:
+                    return Response({"since_id": ["Unknown comment."]}, status=status.HTTP_400_BAD_REQUEST)
+                comments = comments.filter(
+                    Q(created_at__gt=anchor['created_at']) | Q(created_at=anchor['created_at'], id__gt=anchor['id'])
+                ).order_by('created_at', 'id')
+
+            page = self.paginate_queryset(comments)
+            # Each author is fetched and serialized once per page
+            authors = get_user_model().objects.in_bulk({comment.user_id for comment in page})
+            context = self.get_serializer_context()
+            context['authors'] = {user_id: UserSummarySerializer(user).data for user_id, user in authors.items()}
+            serializer = CommentListSerializer(page, many=True, context=context)
+            return self.get_paginated_response(serializer.data)
             
         elif request.method == 'POST':
             serializer = CommentSerializer(
@@ -96,3 +296,115 @@ class TaskViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(task)
         return Response(serializer.data)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Create, update and delete many tasks in one transaction.
+        Expected payload: {"create": [{...}], "update": [{"id": 1, ...}], "delete": [2, 3]}
+        Every item gets its own result; invalid items are reported and skipped.
+        """
+        create_items = request.data.get('create') or []
+        update_items = request.data.get('update') or []
+        delete_ids = request.data.get('delete') or []
+        if not all(isinstance(items, list) for items in (create_items, update_items, delete_ids)):
+            return Response(
+                {"detail": "create, update and delete must be lists."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(create_items) + len(update_items) + len(delete_ids) > self.max_bulk_items:
+            return Response(
+                {"detail": f"At most {self.max_bulk_items} items can be sent at once."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # One query for every assignee referenced by the batch, ids read as the serializer will
+        assignee_ids = {
+            _integer(item.get('assigned_to_id')) for item in create_items + update_items if isinstance(item, dict)
+        } - {None}
+        context = self.get_serializer_context()
+        context['assignees'] = get_user_model().objects.in_bulk(assignee_ids)
+
+        results = {'create': [], 'update': [], 'delete': []}
+        to_create = []
+        for index, item in enumerate(create_items):
+            serializer = TaskSerializer(data=item, context=context)
+            if not serializer.is_valid():
+                results['create'].append({'index': index, 'status': 400, 'errors': serializer.errors})
+                continue
+            principal = get_principal(request)
+            task = Task(**serializer.validated_data, assigned_by_id=principal.user_id, dept_id=principal.dept_id)
+            to_create.append((index, task))
+
+        update_ids = [_task_id(item.get('id')) if isinstance(item, dict) else None for item in update_items]
+        delete_ids = [(task_id, _task_id(task_id)) for task_id in delete_ids]
+        targets = self.get_queryset().in_bulk(
+            {task_id for task_id in update_ids if task_id is not None}
+            | {task_id for _, task_id in delete_ids if task_id is not None}
+        )
+        permission = IsDeptManagerOrAssignee()
+
+        to_update = {}
+        update_fields = set()
+        for index, (item, task_id) in enumerate(zip(update_items, update_ids)):
+            if task_id is None:
+                results['update'].append({
+                    'index': index, 'id': item.get('id') if isinstance(item, dict) else None, **self._bulk_id_error
+                })
+                continue
+            error = self._bulk_target_error(request, permission, targets.get(task_id))
+            if error:
+                results['update'].append({'index': index, 'id': task_id, **error})
+                continue
+            task = targets[task_id]
+            serializer = TaskSerializer(task, data=item, partial=True, context=context)
+            if not serializer.is_valid():
+                results['update'].append({'index': index, 'id': task.id, 'status': 400, 'errors': serializer.errors})
+                continue
+            for field, value in serializer.validated_data.items():
+                setattr(task, field, value)
+                update_fields.add(field)
+            to_update[task.id] = task
+            results['update'].append({'index': index, 'id': task.id, 'status': 200})
+
+        to_delete = []
+        for raw_id, task_id in delete_ids:
+            if task_id is None:
+                results['delete'].append({'id': raw_id, **self._bulk_id_error})
+                continue
+            error = self._bulk_target_error(request, permission, targets.get(task_id))
+            if error:
+                results['delete'].append({'id': task_id, **error})
+                continue
+            to_delete.append(task_id)
+            results['delete'].append({'id': task_id, 'status': 204})
+
+        with transaction.atomic():
+            created = Task.objects.bulk_insert([task for _, task in to_create])
+            updated = list(to_update.values())
+            if updated:
+                now = timezone.now()
+                for task in updated:
+                    task.updated_at = now
+                Task.objects.bulk_update(updated, sorted(update_fields | {'updated_at'}), batch_size=500)
+            if to_delete:
+                Task.objects.filter(id__in=to_delete).delete()
+            tasks_bulk_saved.send(sender=Task, created=created, updated=updated)
+        for task in created + updated:
+            task.remember_state()
+
+        for index, task in to_create:
+            results['create'].append({'index': index, 'id': task.id, 'status': 201})
+        results['create'].sort(key=lambda result: result['index'])
+
+        failed = any(result['status'] >= 400 for items in results.values() for result in items)
+        return Response(results, status=status.HTTP_207_MULTI_STATUS if failed else status.HTTP_200_OK)
+
+    _bulk_id_error = {'status': 400, 'errors': {'id': ['A valid integer is required.']}}
+
+    def _bulk_target_error(self, request, permission, task):
+        if task is None:
+            return {'status': 404, 'errors': {'id': ['Task not found.']}}
+        if not permission.has_object_permission(request, self, task):
+            return {'status': 403, 'errors': {'detail': 'You do not have permission to modify this task.'}}
+        return None
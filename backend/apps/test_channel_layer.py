@@ -0,0 +1,83 @@
+import asyncio
+import os
+import tempfile
+import time
+
+from channels.exceptions import ChannelFull
+from django.test import SimpleTestCase
+
+from volo_africa.channel_layers import SQLiteChannelLayer
+
+
+class TestSQLiteChannelLayer(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'channels.sqlite3')
+        self.socket_dir = directory.name
+
+    def _layer(self, **config):
+        # Long polls: anything delivered quickly came through a wakeup
+        config.setdefault('poll_interval', 30)
+        return SQLiteChannelLayer(path=self.path, socket_dir=self.socket_dir, **config)
+
+    async def test_group_send_reaches_channels_of_other_processes(self):
+        sender, worker_a, worker_b = self._layer(), self._layer(), self._layer()
+        a = await worker_a.new_channel()
+        b = await worker_b.new_channel()
+        for worker, channel in ((worker_a, a), (worker_b, b)):
+            await worker.group_add('dept.1', channel)
+        await worker_b.group_add('user.2', b)
+
+        await sender.group_send('dept.1', {'type': 'notify', 'data': 1})
+        await sender.group_send('user.2', {'type': 'notify', 'data': 2})
+        self.assertEqual(await asyncio.wait_for(worker_a.receive(a), 2), {'type': 'notify', 'data': 1})
+        received = [await asyncio.wait_for(worker_b.receive(b), 2) for _ in range(2)]
+        self.assertEqual([message['data'] for message in received], [1, 2])
+
+        await worker_a.group_discard('dept.1', a)
+        await sender.group_send('dept.1', {'type': 'notify', 'data': 3})
+        self.assertEqual((await asyncio.wait_for(worker_b.receive(b), 2))['data'], 3)
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(worker_a.receive(a), 0.3)
+
+    async def test_capacity(self):
+        layer = self._layer(capacity=2, channel_capacity={'busy.*': 3})
+        for _ in range(2):
+            await layer.send('worker', {'type': 'work'})
+        with self.assertRaises(ChannelFull):
+            await layer.send('worker', {'type': 'work'})
+        for _ in range(3):
+            await layer.send('busy.worker', {'type': 'work'})
+
+        # Full channels are skipped by group_send, the others still get the message
+        await layer.group_add('all', 'worker')
+        await layer.group_add('all', 'other')
+        await layer.group_send('all', {'type': 'hello'})
+        self.assertEqual((await layer.receive('other'))['type'], 'hello')
+        self.assertEqual([(await layer.receive('worker'))['type'] for _ in range(2)], ['work', 'work'])
+
+    async def test_expired_messages_are_dropped_with_their_channels_group_membership(self):
+        layer = self._layer(expiry=0.2, group_expiry=60)
+        dead = await layer.new_channel()
+        await layer.group_add('dept.1', dead)
+        await layer.group_send('dept.1', {'type': 'notify'})
+        await asyncio.sleep(0.3)
+        await layer._call(layer._sweep)
+        self.assertEqual(await layer._call(layer._group_send, 'dept.1', b''), [])
+
+        stale = self._layer(group_expiry=0)
+        await stale.group_add('dept.2', 'worker')
+        time.sleep(0.01)
+        await stale.group_send('dept.2', {'type': 'notify'})
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(stale.receive('worker'), 0.3)
+
+    async def test_flush(self):
+        layer = self._layer()
+        await layer.group_add('dept.1', 'worker')
+        await layer.send('worker', {'type': 'work'})
+        await layer.flush()
+        await layer.group_send('dept.1', {'type': 'notify'})
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(layer.receive('worker'), 0.3)
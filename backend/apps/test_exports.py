@@ -0,0 +1,82 @@
+import csv
+import gzip
+import io
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase
+from rest_framework.test import APIClient
+
+from apps import exports
+from apps.adminpanel.models import AuditLog
+from apps.tasks.models import Task
+from apps.users.authentication import EmailTokenObtainPairSerializer
+from apps.users.models import Department, Role
+
+User = get_user_model()
+
+
+class TestStreamingExports(TestCase):
+    def setUp(self):
+        self.dept = Department.objects.create(name='Engineering')
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='testpass123',
+            role=Role.objects.create(name='Admin'), department=self.dept,
+        )
+        self.tasks = [Task.objects.create(task_title=f'Task {i}', dept=self.dept) for i in range(5)]
+        Task.objects.create(task_title='Elsewhere', dept=Department.objects.create(name='Finance'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def _body(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    @mock.patch.object(exports, 'BATCH_SIZE', 2)
+    def test_csv_streams_the_scoped_queryset_in_batches(self):
+        response = self.client.get('/api/tasks/export/')
+        self.assertIn('tasks.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(self._body(response).decode('utf-8'))))
+        self.assertEqual([int(row['id']) for row in rows], [task.id for task in self.tasks])
+        self.assertEqual(rows[0]['department'], 'Engineering')
+
+    def test_ndjson_resumes_after_an_id(self):
+        response = self.client.get('/api/tasks/export/', {'output': 'ndjson', 'after': self.tasks[2].id})
+        lines = self._body(response).decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [task.id for task in self.tasks[3:]])
+
+    def test_gzip_variant(self):
+        AuditLog.objects.create(action='GET /api/tasks/', user=self.admin)
+        response = self.client.get('/api/adminpanel/logs/export/', {'compress': 'gzip'})
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        rows = list(csv.reader(io.StringIO(gzip.decompress(self._body(response)).decode('utf-8'))))
+        self.assertEqual(rows[0], ['id', 'timestamp', 'user', 'action', 'status_code', 'duration_ms'])
+        self.assertIn(['admin@example.com', 'GET /api/tasks/'], [row[2:4] for row in rows[1:]])
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(self.client.get('/api/messaging/department/export/', {'output': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/tasks/export/', {'after': 'x'}).status_code, 400)
+
+    @mock.patch.object(exports, 'BATCH_SIZE', 2)
+    async def test_asgi_streams_batch_by_batch(self):
+        token = EmailTokenObtainPairSerializer.get_token(self.admin).access_token
+        fetched = []
+        fetch = exports._fetch
+
+        def counting_fetch(*args):
+            fetched.append(args[2])
+            return fetch(*args)
+
+        with mock.patch.object(exports, '_fetch', counting_fetch):
+            response = await AsyncClient().get('/api/tasks/export/', headers={'Authorization': f'Bearer {token}'})
+            self.assertEqual(response.status_code, 200)
+            chunks = aiter(response.streaming_content)
+            header = await anext(chunks)
+            first = await anext(chunks)
+            # Sent as soon as the first batch was read, not after the whole export
+            self.assertEqual(len(fetched), 1)
+            rest = [chunk async for chunk in chunks]
+        rows = list(csv.DictReader(io.StringIO(b''.join([header, first, *rest]).decode('utf-8'))))
+        self.assertEqual([int(row['id']) for row in rows], [task.id for task in self.tasks])
+        self.assertEqual(len(fetched), 3)
@@ -0,0 +1,58 @@
+import logging
+
+from django.test import SimpleTestCase
+
+from volo_africa.log_handlers import QueueingHandler, SamplingFilter
+
+
+class _Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+
+class TestLoggingPipeline(SimpleTestCase):
+    def _logger(self, name, handler):
+        logger = logging.getLogger(name)
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        return logger
+
+    def test_records_are_written_by_the_listener(self):
+        target = _Collect()
+        handler = QueueingHandler([target])
+        self.addCleanup(handler.close)
+        logger = self._logger('volo_test.queue', handler)
+
+        values = ['first']
+        logger.info('value %s', values)
+        values.append('changed')  # the message keeps the arguments as they were when logged
+        handler.stop_listener()
+        self.assertEqual(target.messages, ["value ['first']"])
+
+    def test_full_queue_drops_records(self):
+        target = _Collect()
+        handler = QueueingHandler([target], maxsize=1)
+        handler.stop_listener()  # nothing drains the queue any more
+        self.addCleanup(handler.close)
+        logger = self._logger('volo_test.full', handler)
+        logger.info('kept')
+        logger.info('dropped')
+        self.assertEqual(handler.dropped, 1)
+
+    def test_sampling_keeps_one_in_n_below_warning(self):
+        target = _Collect()
+        target.addFilter(SamplingFilter({'volo_test.sql': 5}))
+        sql = self._logger('volo_test.sql.queries', target)
+        other = self._logger('volo_test.other', target)
+
+        for i in range(10):
+            sql.debug('query %d', i)
+        sql.warning('slow query')
+        other.debug('unsampled')
+        self.assertEqual(target.messages, ['query 0', 'query 5', 'slow query', 'unsampled'])
@@ -0,0 +1,108 @@
+"""
+Plan regression suite: every hot list endpoint must be answered from an
+index, without a full table scan or a sort step. The page query each
+endpoint issues is captured and run through EXPLAIN on the active backend.
+"""
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.adminpanel.models import AuditLog
+from apps.messaging.models import Message
+from apps.notifications.models import Notification
+from apps.tasks.models import Task
+from apps.users.models import Department, Role
+
+User = get_user_model()
+
+
+class TestQueryPlans(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        departments = [Department.objects.create(name=f'Department {i}') for i in range(10)]
+        admin_role = Role.objects.create(name='Admin')
+        staff_role = Role.objects.create(name='Staff')
+        cls.dept = departments[0]
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='testpass123',
+            role=admin_role, department=cls.dept,
+        )
+        cls.user = User.objects.create_user(
+            email='staff@example.com', username='staff', password='testpass123',
+            role=staff_role, department=cls.dept,
+        )
+        users = [cls.admin, cls.user]
+        statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+        priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+        Task.objects.bulk_create([
+            Task(
+                task_title=f'Task {i}', dept=departments[i % 10], assigned_to=users[i % 2],
+                status=statuses[i % len(statuses)], priority=priorities[i % len(priorities)],
+            )
+            for i in range(3000)
+        ], batch_size=500)
+        Message.objects.bulk_create([
+            Message(sender=users[i % 2], dept=departments[i % 10], message_body=f'Message {i}')
+            for i in range(1000)
+        ])
+        Notification.objects.bulk_create([
+            Notification(user=users[i % 2], type='message', message=f'Notification {i}', is_read=bool(i % 3))
+            for i in range(1000)
+        ])
+        AuditLog.objects.bulk_create([AuditLog(action=f'GET /api/{i}/', user=cls.admin) for i in range(1000)])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assertIndexedPlan(self, url, model, user=None):
+        client = APIClient()
+        client.force_authenticate(user or self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+
+        table = connection.ops.quote_name(model._meta.db_table)
+        page_queries = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and f'FROM {table}' in query['sql'] and 'ORDER BY' in query['sql']
+        ]
+        self.assertTrue(page_queries, f'No page query on {model._meta.db_table} for {url}')
+        problems = self._plan_problems(page_queries[-1], model._meta.db_table)
+        self.assertEqual(problems, [], f'{url} regressed:\n{page_queries[-1]}')
+
+    def _plan_problems(self, sql, table):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                details = [row[3] for row in cursor.fetchall()]
+                return [
+                    detail for detail in details
+                    if 'USE TEMP B-TREE' in detail or re.fullmatch(rf'SCAN {table}', detail)
+                ]
+            if connection.vendor == 'mysql':
+                cursor.execute(f'EXPLAIN {sql}')
+                columns = [column[0].lower() for column in cursor.description]
+                rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                return [
+                    row for row in rows
+                    if row['table'] == table and (row['type'] == 'ALL' or 'filesort' in (row['extra'] or ''))
+                ]
+        self.skipTest(f'No plan checks for {connection.vendor}')
+
+    def test_task_list_filters(self):
+        for params in ('', '?status=pending', f'?assigned_to={self.user.id}', '?priority=high', '?ordering=-priority'):
+            with self.subTest(params=params):
+                self.assertIndexedPlan(f'/api/tasks/{params}', Task)
+
+    def test_department_messages(self):
+        self.assertIndexedPlan('/api/messaging/department/', Message)
+
+    def test_notifications(self):
+        self.assertIndexedPlan('/api/notifications/', Notification)
+        self.assertIndexedPlan('/api/notifications/?is_read=false', Notification)
+
+    def test_audit_logs(self):
+        self.assertIndexedPlan('/api/adminpanel/logs/', AuditLog, user=self.admin)
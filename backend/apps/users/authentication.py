@@ -1,66 +1,55 @@
 import logging
+from asgiref.sync import sync_to_async
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import get_user_model
-from rest_framework import serializers
-from django.conf import settings
+from django.contrib.auth.models import update_last_login
+from . import token_versions
+from .services.auth_service import aauthenticate_user, authenticate_user
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+# Access-control claims written by EmailTokenObtainPairSerializer.get_token
+ROLE_CLAIM = 'role_id'
+DEPARTMENT_CLAIM = 'dept_id'
+VERSION_CLAIM = 'token_version'
+
 class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
     username_field = 'email'  # Use email as the username field
     
     def validate(self, attrs):
-        # Get email from the request
-        email = attrs.get('email', '').strip()
-        password = attrs.get('password', '')
-        
-        logger.info(f"Authentication attempt for email: {email}")
-        
-        if not email or not password:
-            error_msg = 'Email and password are required'
-            logger.warning(error_msg)
-            raise serializers.ValidationError(error_msg)
-        
-        try:
-            # Get user by email
-            user = User.objects.get(email=email)
-            logger.info(f"User found: {user.email}, is_active: {user.is_active}")
-            
-            # Verify password
-            if not user.check_password(password):
-                logger.warning(f"Invalid password for user: {email}")
-                raise serializers.ValidationError('Invalid email or password')
-            
-            # Check if user is active
-            if not user.is_active:
-                logger.warning(f"Login attempt for inactive user: {email}")
-                raise serializers.ValidationError('User account is disabled')
-            
-            # Generate tokens with the user object
-            refresh = self.get_token(user)
-            logger.info(f"Token generated successfully for user: {email}")
-            
-            # Return token and user data
-            return {
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-                'user_id': user.id,
-                'email': user.email,
-                'username': user.username or user.email.split('@')[0]
-            }
-            
-        except User.DoesNotExist:
-            logger.warning(f"No user found with email: {email}")
-            raise serializers.ValidationError('Invalid email or password')
-            
-        except Exception as e:
-            logger.error(f"Unexpected error during authentication for {email}: {str(e)}", 
-                        exc_info=True)
-            raise serializers.ValidationError(
-                'An error occurred during authentication. Please try again.'
-            )
-    
+        # The one lookup and password check of a login (see authenticate_user)
+        return self.login(authenticate_user(attrs.get('email', '').strip(), attrs.get('password', '')))
+
+    async def alogin(self):
+        """
+        `is_valid()` and `validated_data` in one, for the async token view:
+        the fields are checked here and the password hash is awaited.
+        """
+        attrs = self.to_internal_value(self.initial_data)
+        user = await aauthenticate_user(attrs.get('email', '').strip(), attrs.get('password', ''))
+        return await sync_to_async(self.login)(user)
+
+    def login(self, user):
+        if user is None:
+            raise AuthenticationFailed('Invalid email or password', code='invalid_credentials')
+
+        refresh = self.get_token(user)
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        logger.info("Token generated for user %s", user.pk)
+
+        return {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            'user_id': user.id,
+            'email': user.email,
+            'username': user.username or user.email.split('@')[0]
+        }
+
     @classmethod
     def get_token(cls, user):
         # Get the token from the parent class
@@ -85,6 +74,55 @@ class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
             
         # Add any additional claims needed by your application
         token['type'] = 'access'
+
+        # Claims trusted by ClaimsJWTAuthentication instead of loading the user
+        token[ROLE_CLAIM] = user.role_id
+        token[DEPARTMENT_CLAIM] = user.department_id
+        token[VERSION_CLAIM] = user.token_version
         
-        logger.debug(f"Generated token with claims: {token}")
-        return token
\ No newline at end of file
+        return token
+
+
+def claims_user(user_id, token):
+    """
+    A User built from the token's claims, without a query. Only the fields
+    carried by the token are set; views that need the whole row (profile
+    edits, for instance) must load it. Saving one raises ValueError.
+    """
+    user = User(
+        id=user_id,
+        email=token.get('email', ''),
+        username=token.get('username', ''),
+        first_name=token.get('first_name', ''),
+        last_name=token.get('last_name', ''),
+        role_id=token.get(ROLE_CLAIM),
+        department_id=token.get(DEPARTMENT_CLAIM),
+        is_active=True,
+    )
+    user._state.adding = False
+    user.from_claims = True
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the signed role/department claims of the
+    token instead of selecting the user on every request. Revocation is
+    checked against the per-process token version cache (`token_versions`),
+    so a role change, deactivation or password change takes effect within
+    `token_versions.TOKEN_VERSION_TTL` seconds in every process.
+
+    Tokens issued before the claims existed fall back to the database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        if token_versions.current(user_id) != validated_token[VERSION_CLAIM]:
+            raise AuthenticationFailed('Token has been revoked.', code='token_revoked')
+        return claims_user(user_id, validated_token)
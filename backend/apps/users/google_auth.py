@@ -4,8 +4,8 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
+from .authentication import EmailTokenObtainPairSerializer
 
 User = get_user_model()
 
@@ -46,7 +46,7 @@ def google_auth(request):
         )
         
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = EmailTokenObtainPairSerializer.get_token(user)
         
         return Response({
             'access': str(refresh.access_token),
@@ -0,0 +1,204 @@
+"""
+Password hashing off the request thread.
+
+PBKDF2 is CPU bound: run in the web process it holds the GIL for hundreds of
+milliseconds and stalls every other request (and, under ASGI, the event
+loop). Login and registration therefore hash through a small process pool of
+PASSWORD_HASH_WORKERS processes; their views are async and await the result
+(`acheck_password`, `amake_password`), so under ASGI no thread is held while
+a hash is queued or running. At most PASSWORD_HASH_QUEUE hashes may be in
+flight per web process; beyond that callers get `PasswordHashingBusy` (a 503
+with Retry-After) straight away instead of queueing behind a backlog.
+
+PASSWORD_HASH_WORKERS = 0 hashes inline, as Django normally does.
+
+`metrics()` reports the pool size, the current queue depth and recent
+latencies (queueing included) of this process, for sizing the pool.
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+LATENCY_SAMPLES = 512
+MP_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+_pool = None
+_pool_workers = 0
+_lock = threading.Lock()
+_in_flight = 0
+_completed = 0
+_rejected = 0
+_latencies = deque(maxlen=LATENCY_SAMPLES)
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'The server is busy, please try again shortly.'
+    default_code = 'password_hashing_busy'
+
+    def __init__(self, wait):
+        super().__init__()
+        self.wait = wait  # sent as Retry-After by DRF's exception handler
+
+
+def _setup_worker():
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def _check(raw_password, encoded):
+    return hashers.check_password(raw_password, encoded)
+
+
+def _make(raw_password):
+    return hashers.make_password(raw_password)
+
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+    with _lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Not forked: the web process runs threads (log queue, audit
+            # writer) whose locks a forked child could inherit held
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, initializer=_setup_worker, mp_context=multiprocessing.get_context(MP_START_METHOD),
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def _admit():
+    """Take a place in the queue, or raise PasswordHashingBusy."""
+    global _in_flight, _rejected
+    with _lock:
+        if _in_flight >= settings.PASSWORD_HASH_QUEUE:
+            _rejected += 1
+            raise PasswordHashingBusy(wait=settings.PASSWORD_HASH_RETRY_AFTER)
+        _in_flight += 1
+
+
+def _leave():
+    global _in_flight
+    with _lock:
+        _in_flight -= 1
+
+
+def _timed_out(future):
+    global _rejected
+    future.cancel()
+    with _lock:
+        _rejected += 1
+    return PasswordHashingBusy(wait=settings.PASSWORD_HASH_RETRY_AFTER)
+
+
+def _done(started):
+    global _completed
+    with _lock:
+        _completed += 1
+        _latencies.append(time.perf_counter() - started)
+
+
+def _run(function, *args):
+    workers = settings.PASSWORD_HASH_WORKERS
+    started = time.perf_counter()
+    if workers <= 0:
+        result = function(*args)
+    else:
+        _admit()
+        try:
+            future = _get_pool(workers).submit(function, *args)
+            try:
+                result = future.result(timeout=settings.PASSWORD_HASH_TIMEOUT)
+            except FutureTimeoutError:
+                raise _timed_out(future)
+        finally:
+            _leave()
+    _done(started)
+    return result
+
+
+async def _arun(function, *args):
+    """`_run()` for async views: the event loop awaits the pool, no thread waits on it."""
+    workers = settings.PASSWORD_HASH_WORKERS
+    started = time.perf_counter()
+    if workers <= 0:
+        result = await sync_to_async(function, thread_sensitive=False)(*args)
+    else:
+        _admit()
+        try:
+            future = _get_pool(workers).submit(function, *args)
+            try:
+                result = await asyncio.wait_for(asyncio.wrap_future(future), settings.PASSWORD_HASH_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise _timed_out(future)
+        finally:
+            _leave()
+    _done(started)
+    return result
+
+
+def check_password(user, raw_password):
+    """`user.check_password()` with the hash verified in the pool."""
+    if raw_password is None or not user.has_usable_password():
+        return False
+    valid = _run(_check, raw_password, user.password)
+    if valid and hashers.identify_hasher(user.password).must_update(user.password):
+        # Upgrade to the current hasher/iterations, as Django does on login
+        user.password = _run(_make, raw_password)
+        user.save(update_fields=['password'])
+    return valid
+
+
+async def acheck_password(user, raw_password):
+    if raw_password is None or not user.has_usable_password():
+        return False
+    valid = await _arun(_check, raw_password, user.password)
+    if valid and hashers.identify_hasher(user.password).must_update(user.password):
+        user.password = await _arun(_make, raw_password)
+        await user.asave(update_fields=['password'])
+    return valid
+
+
+def make_password(raw_password):
+    return _run(_make, raw_password)
+
+
+async def amake_password(raw_password):
+    return await _arun(_make, raw_password)
+
+
+def metrics():
+    with _lock:
+        latencies = sorted(_latencies)
+        in_flight = _in_flight
+        completed, rejected = _completed, _rejected
+    workers = settings.PASSWORD_HASH_WORKERS
+
+    def percentile(fraction):
+        if not latencies:
+            return None
+        return round(latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] * 1000, 1)
+
+    return {
+        'workers': workers,
+        'queue_limit': settings.PASSWORD_HASH_QUEUE if workers > 0 else None,
+        'in_flight': in_flight,
+        'queued': max(in_flight - workers, 0),
+        'completed': completed,
+        'rejected': rejected,
+        'latency_ms': {'p50': percentile(0.5), 'p95': percentile(0.95), 'max': percentile(1.0)},
+    }
@@ -0,0 +1,62 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import Client
+
+User = get_user_model()
+PASSWORD = 'bench-login-password'
+
+
+class Command(BaseCommand):
+    help = 'Measure login throughput of the token endpoint under concurrent logins'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=64, help='Logins per concurrency level')
+        parser.add_argument('--users', type=int, default=16)
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+        parser.add_argument(
+            '--double-check', action='store_true',
+            help='Also verify the password before posting, as the view used to (for comparison)',
+        )
+
+    def handle(self, *args, **options):
+        # Threads use their own connections, so the users are committed and deleted afterwards
+        prefix = f'login-bench-{time.time_ns()}'
+        password = make_password(PASSWORD)
+        users = User.objects.bulk_create([
+            User(email=f'{prefix}-{i}@example.com', username=f'{prefix}-{i}', password=password)
+            for i in range(options['users'])
+        ])
+        emails = [user.email for user in users]
+        try:
+            self.stdout.write(f"{'threads':>7} {'logins':>7} {'seconds':>8} {'logins/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+            for threads in options['concurrency']:
+                latencies, elapsed = self._run(emails, options['logins'], threads, options['double_check'])
+                latencies.sort()
+                self.stdout.write(
+                    f"{threads:>7} {len(latencies):>7} {elapsed:>8.2f} {len(latencies) / elapsed:>9.1f} "
+                    f"{latencies[len(latencies) // 2] * 1000:>8.0f} {latencies[int(len(latencies) * 0.95)] * 1000:>8.0f}"
+                )
+        finally:
+            User.objects.filter(email__startswith=prefix).delete()
+
+    def _run(self, emails, logins, threads, double_check):
+        def login(i):
+            email = emails[i % len(emails)]
+            started = time.perf_counter()
+            if double_check:
+                User.objects.get(email=email).check_password(PASSWORD)
+            response = Client().post(
+                '/api/auth/token/', {'email': email, 'password': PASSWORD}, content_type='application/json'
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f'Login failed with {response.status_code}')
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            latencies = list(pool.map(login, range(logins)))
+        return latencies, time.perf_counter() - started
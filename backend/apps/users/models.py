@@ -30,10 +30,50 @@ class User(AbstractUser):
     role = models.ForeignKey(Role, on_delete=models.PROTECT, null=True, blank=True, related_name='users')
     department = models.ForeignKey(Department, on_delete=models.PROTECT, null=True, blank=True, related_name='users')
     email_confirmed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Bumped when access decisions change; tokens issued with an older value are rejected
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
 
+    # Changing any of these revokes the user's tokens (as does set_password)
+    AUTH_FIELDS = ('role_id', 'department_id', 'is_active')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user._auth_state = user._current_auth_state()
+        return user
+
+    def _current_auth_state(self):
+        # Read from __dict__ so deferred fields are not loaded
+        return {name: self.__dict__[name] for name in self.AUTH_FIELDS if name in self.__dict__}
+
+    def _auth_changed(self):
+        if self._state.adding:
+            return False
+        # set_password() keeps the raw password until the save; hash upgrades made by
+        # check_password() clear it first and so do not revoke anything
+        if self._password is not None:
+            return True
+        stored = getattr(self, '_auth_state', None)
+        if stored is None:
+            return False
+        current = self._current_auth_state()
+        return any(current[name] != value for name, value in stored.items() if name in current)
+
+    def save(self, *args, **kwargs):
+        if getattr(self, 'from_claims', False):
+            raise ValueError('Users built from token claims are partial and cannot be saved.')
+        if self._auth_changed():
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._auth_state = self._current_auth_state()
+
     def __str__(self):
         return f"{self.username} ({self.email})"
 
@@ -1,17 +1,19 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
+from .principal import get_principal
 
 class IsAdmin(BasePermission):
     def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and request.user.role and request.user.role.name == 'Admin')
+        return get_principal(request).is_admin
 
 class IsDepartmentManager(BasePermission):
     def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and request.user.role and request.user.role.name in ['Admin','Department Manager'])
+        return get_principal(request).is_manager
 
 class IsSelfOrAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
-        if request.user.is_anonymous:
+        principal = get_principal(request)
+        if not principal.is_authenticated:
             return False
-        if request.user.role and request.user.role.name == 'Admin':
+        if principal.is_admin:
             return True
-        return obj.id == request.user.id
+        return obj.id == principal.user_id
@@ -0,0 +1,92 @@
+"""
+Request-scoped principal: who is calling, as far as authorization cares.
+
+`get_principal(request)` builds a small immutable Principal (user id,
+department id, role name and derived flags) once per request and caches it
+on the request, so permission classes, serializers and views never touch
+`request.user.role` / `request.user.department`. Those are lazy foreign keys
+and would otherwise each cost a query. Role names come from a per-process
+id -> name map refreshed at most every ROLE_NAMES_TTL seconds (and at once
+in the process that saves or deletes a Role, via `apps.signals`).
+"""
+import threading
+import time
+from dataclasses import dataclass
+
+ADMIN = 'Admin'
+DEPARTMENT_MANAGER = 'Department Manager'
+MANAGER_ROLES = (ADMIN, DEPARTMENT_MANAGER)
+ROLE_NAMES_TTL = 300
+
+_role_names = {}
+_role_names_loaded_at = None
+_role_names_lock = threading.Lock()
+
+
+def role_name(role_id):
+    """Name of the role with `role_id`, without a query once the map is warm."""
+    global _role_names, _role_names_loaded_at
+    if role_id is None:
+        return None
+    now = time.monotonic()
+    stale = _role_names_loaded_at is None or now - _role_names_loaded_at > ROLE_NAMES_TTL
+    if stale or role_id not in _role_names:
+        from .models import Role
+        with _role_names_lock:
+            _role_names = dict(Role.objects.values_list('id', 'name'))
+            _role_names_loaded_at = now
+    return _role_names.get(role_id)
+
+
+def clear_role_names():
+    global _role_names_loaded_at
+    with _role_names_lock:
+        _role_names_loaded_at = None
+
+
+@dataclass(frozen=True)
+class Principal:
+    user_id: int = None
+    dept_id: int = None
+    role_name: str = None
+    is_authenticated: bool = False
+    is_active: bool = False
+
+    @property
+    def is_admin(self):
+        return self.role_name == ADMIN
+
+    @property
+    def is_manager(self):
+        """Admins and department managers."""
+        return self.role_name in MANAGER_ROLES
+
+    def in_department(self, dept_id):
+        return self.dept_id is not None and self.dept_id == dept_id
+
+
+ANONYMOUS = Principal()
+
+
+def principal_for_user(user):
+    if user is None or not user.is_authenticated:
+        return ANONYMOUS
+    return Principal(
+        user_id=user.pk,
+        dept_id=user.department_id,
+        role_name=role_name(user.role_id),
+        is_authenticated=True,
+        is_active=user.is_active,
+    )
+
+
+def get_principal(request):
+    """The Principal of `request` (a DRF Request or a Django HttpRequest), built once."""
+    http_request = getattr(request, '_request', request)
+    user = getattr(request, 'user', None)
+    cached = getattr(http_request, '_principal', None)
+    if cached is not None and cached[0] is user:
+        return cached[1]
+    principal = principal_for_user(user)
+    http_request._principal = (user, principal)
+    return principal
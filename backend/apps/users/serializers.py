@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from . import hashing
 from .models import Role, Department
 
 User = get_user_model()
@@ -37,6 +38,13 @@ class UserSerializer(serializers.ModelSerializer):
             return obj.profile_picture.url
         return None
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Compact, read-only user reference for list payloads (no role/department joins)."""
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'first_name', 'last_name', 'email']
+        read_only_fields = fields
+
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
     password_confirmation = serializers.CharField(write_only=True)
@@ -94,8 +102,10 @@ class RegisterSerializer(serializers.ModelSerializer):
         except Role.DoesNotExist:
             pass  # If Staff role doesn't exist, user will have no role
         
+        # The async register view hashes before saving and passes the result in
+        encoded = validated_data.pop('password_hash', None) or hashing.make_password(password)
         user = User(username=username, **validated_data)
-        user.set_password(password)
+        user.password = encoded
         user.save()
         return user
 
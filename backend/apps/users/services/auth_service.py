@@ -1,19 +1,47 @@
 import logging
 from django.contrib.auth import get_user_model
+from apps.users import hashing
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
 def authenticate_user(email, password):
-    try:
-        user = User.objects.get(email=email)
-        if not user.check_password(password):
-            logger.warning(f"Invalid password for user: {email}")
-            return None
-        return user
-    except User.DoesNotExist:
-        logger.warning(f"No user found with email: {email}")
-        return None
-    except Exception as e:
-        logger.error(f"Authentication error: {str(e)}", exc_info=True)
-        raise e
+    """
+    The single login check shared by the token view and EmailBackend: one
+    lookup on the unique email index and one password hash, run in the hashing
+    pool (may raise hashing.PasswordHashingBusy). Returns the user, or None
+    for an unknown email, a wrong password or an inactive account.
+    """
+    if not email or not password:
+        return None
+    user = User.objects.filter(email=email).first()
+    if user is None:
+        # Hash anyway so unknown emails take as long as wrong passwords
+        hashing.make_password(password)
+        logger.info("Login failed: unknown email")
+        return None
+    if not hashing.check_password(user, password):
+        logger.info("Login failed: wrong password for user %s", user.pk)
+        return None
+    if not user.is_active:
+        logger.info("Login failed: user %s is inactive", user.pk)
+        return None
+    return user
+
+
+async def aauthenticate_user(email, password):
+    """`authenticate_user()` for the async login view: the hash is awaited (hashing.acheck_password)."""
+    if not email or not password:
+        return None
+    user = await User.objects.filter(email=email).afirst()
+    if user is None:
+        await hashing.amake_password(password)
+        logger.info("Login failed: unknown email")
+        return None
+    if not await hashing.acheck_password(user, password):
+        logger.info("Login failed: wrong password for user %s", user.pk)
+        return None
+    if not user.is_active:
+        logger.info("Login failed: user %s is inactive", user.pk)
+        return None
+    return user
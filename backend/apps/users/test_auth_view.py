@@ -1,4 +1,7 @@
-from django.test import TestCase, Client
+from unittest import mock
+
+from django.contrib.auth import hashers
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
@@ -46,3 +49,24 @@ class TestAuthViews(TestCase):
             content_type='application/json'
         )
         self.assertEqual(response.status_code, 401)
+
+    @override_settings(PASSWORD_HASH_WORKERS=0)
+    def test_login_hashes_the_password_once(self):
+        """One user lookup and one password verification per login"""
+        for password, expected_status in (('testpass123', 200), ('wrongpass', 401)):
+            with mock.patch('django.contrib.auth.hashers.check_password', wraps=hashers.check_password) as check:
+                with self.assertNumQueries(1):
+                    response = self.client.post(
+                        self.login_url,
+                        {'email': 'testuser@example.com', 'password': password},
+                        content_type='application/json'
+                    )
+            self.assertEqual(response.status_code, expected_status)
+            self.assertEqual(check.call_count, 1)
+
+    def test_login_missing_fields(self):
+        """Test login without a password"""
+        response = self.client.post(
+            self.login_url, {'email': 'testuser@example.com'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,99 @@
+from unittest import mock
+
+from django.test import AsyncClient, TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from . import hashing
+from .models import Department, Role
+
+User = get_user_model()
+
+
+@override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=4)
+class TestPasswordHashingPool(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='staff@example.com', username='staff', password='testpass123',
+        )
+        self.client = APIClient()
+
+    def _login(self, password):
+        return self.client.post(
+            '/api/auth/token/', {'email': 'staff@example.com', 'password': password}, format='json'
+        )
+
+    def test_login_and_registration_hash_in_the_pool(self):
+        self.assertEqual(self._login('testpass123').status_code, 200)
+        self.assertEqual(self._login('wrongpass').status_code, 401)
+
+        dept = Department.objects.create(name='Engineering')
+        response = self.client.post('/api/users/register/', {
+            'department_id': dept.id, 'email': 'new@example.com', 'first_name': 'New', 'last_name': 'User',
+            'password': 'NewPass12345!', 'password_confirmation': 'NewPass12345!', 'agree_terms': True,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertTrue(User.objects.get(email='new@example.com').check_password('NewPass12345!'))
+
+    def test_saturated_pool_answers_503(self):
+        with override_settings(PASSWORD_HASH_QUEUE=0):
+            response = self._login('testpass123')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_metrics_for_admins(self):
+        self._login('testpass123')
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get('/api/users/password-hashing/metrics/').status_code, 403)
+
+        self.user.role = Role.objects.create(name='Admin')
+        self.user.save()
+        response = self.client.get('/api/users/password-hashing/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['workers'], 1)
+        self.assertEqual(response.data['in_flight'], 0)
+        self.assertGreater(response.data['completed'], 0)
+        self.assertIsNotNone(response.data['latency_ms']['p95'])
+
+    def test_inline_when_no_workers(self):
+        with override_settings(PASSWORD_HASH_WORKERS=0):
+            self.assertTrue(hashing.check_password(self.user, 'testpass123'))
+            self.assertFalse(hashing.check_password(self.user, 'wrongpass'))
+
+    def test_pool_does_not_fork_the_web_process(self):
+        self.assertIn(hashing._get_pool(1)._mp_context.get_start_method(), ('forkserver', 'spawn'))
+
+    async def test_asgi_login_and_registration_await_the_pool(self):
+        client = AsyncClient()
+        dept = await Department.objects.acreate(name='Engineering')
+        # Nothing may wait for a hash on a thread
+        with mock.patch.object(hashing, '_run', side_effect=AssertionError('blocking hash')):
+            login = await client.post(
+                '/api/auth/token/', {'email': 'staff@example.com', 'password': 'testpass123'},
+                content_type='application/json',
+            )
+            wrong = await client.post(
+                '/api/auth/token/', {'email': 'staff@example.com', 'password': 'wrongpass'},
+                content_type='application/json',
+            )
+            missing = await client.post('/api/auth/token/', {'email': 'staff@example.com'}, content_type='application/json')
+            register = await client.post('/api/users/register/', {
+                'department_id': dept.id, 'email': 'new@example.com', 'first_name': 'New', 'last_name': 'User',
+                'password': 'NewPass12345!', 'password_confirmation': 'NewPass12345!', 'agree_terms': True,
+            }, content_type='application/json')
+            with override_settings(PASSWORD_HASH_QUEUE=0):
+                busy = await client.post(
+                    '/api/auth/token/', {'email': 'staff@example.com', 'password': 'testpass123'},
+                    content_type='application/json',
+                )
+
+        self.assertEqual(login.status_code, 200)
+        self.assertEqual(login.json()['user_id'], self.user.pk)
+        self.assertEqual(wrong.status_code, 401)
+        self.assertEqual(wrong['WWW-Authenticate'], 'Bearer realm="api"')
+        self.assertEqual(missing.status_code, 400)
+        self.assertIn('password', missing.json())
+        self.assertEqual(register.status_code, 201, register.content)
+        user = await User.objects.aget(email='new@example.com')
+        self.assertTrue(user.check_password('NewPass12345!'))
+        self.assertEqual((busy.status_code, busy['Retry-After']), (503, '1'))
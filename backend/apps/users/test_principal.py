@@ -0,0 +1,47 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.tasks.models import Task
+from .models import Department, Role
+from .principal import clear_role_names, get_principal
+
+User = get_user_model()
+
+
+class TestPrincipal(TestCase):
+    def setUp(self):
+        clear_role_names()
+        self.dept = Department.objects.create(name='Engineering')
+        self.manager = User.objects.create_user(
+            email='manager@example.com', username='manager', password='testpass123',
+            role=Role.objects.create(name='Department Manager'), department=self.dept,
+        )
+        self.task = Task.objects.create(task_title='Review', dept=self.dept, assigned_by=self.manager)
+        self.client = APIClient()
+
+    def _authorization_queries(self, method, url, data=None):
+        # A fresh user row, as the authentication class hands it over (no select_related)
+        self.client.force_authenticate(User.objects.get(pk=self.manager.pk))
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertLess(response.status_code, 400)
+        tables = [connection.ops.quote_name(table) for table in ('users_role', 'users_department')]
+        return [q['sql'] for q in queries.captured_queries if any(f'FROM {table} ' in q['sql'] for table in tables)]
+
+    def test_authorization_does_not_load_role_or_department(self):
+        get_principal(type('Request', (), {'user': self.manager})())  # warm the role names
+        self.assertEqual(self._authorization_queries('get', f'/api/tasks/{self.task.id}/comments/'), [])
+        self.assertEqual(
+            self._authorization_queries('post', f'/api/tasks/{self.task.id}/change_status/', {'status': 'completed'}),
+            [],
+        )
+
+    def test_role_rename_is_picked_up(self):
+        request = type('Request', (), {'user': self.manager})()
+        self.assertTrue(get_principal(request).is_manager)
+        Role.objects.filter(pk=self.manager.role_id).update(name='Staff')
+        Role.objects.get(pk=self.manager.role_id).save()
+        self.assertFalse(get_principal(type('Request', (), {'user': self.manager})()).is_manager)
@@ -0,0 +1,88 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import token_versions
+from .authentication import EmailTokenObtainPairSerializer
+from .models import Department, Role
+from .principal import clear_role_names
+
+User = get_user_model()
+
+
+class TestClaimsAuthentication(TestCase):
+    def setUp(self):
+        clear_role_names()
+        token_versions.clear()
+        self.dept = Department.objects.create(name='Engineering')
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='testpass123',
+            role=Role.objects.create(name='Admin'), department=self.dept,
+        )
+        self.user = User.objects.create_user(
+            email='staff@example.com', username='staff', password='testpass123',
+            role=Role.objects.create(name='Staff'), department=self.dept, phone_number='0700000000',
+        )
+        self.client = APIClient()
+
+    def _bearer(self, user):
+        token = EmailTokenObtainPairSerializer.get_token(User.objects.get(pk=user.pk))
+        return f'Bearer {token.access_token}'
+
+    def _get(self, url, authorization):
+        return self.client.get(url, HTTP_AUTHORIZATION=authorization)
+
+    def test_requests_need_no_auth_queries(self):
+        authorization = self._bearer(self.user)
+        self.assertEqual(self._get('/api/notifications/', authorization).status_code, 200)
+        # Versions and role names are warm: no query touches the users or roles
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self._get('/api/notifications/', authorization).status_code, 200)
+        tables = [connection.ops.quote_name(table) for table in ('users_user', 'users_role', 'users_department')]
+        self.assertEqual([q['sql'] for q in queries.captured_queries if any(t in q['sql'] for t in tables)], [])
+
+    def test_me_loads_the_whole_user(self):
+        response = self._get('/api/users/me/', self._bearer(self.user))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['phone_number'], '0700000000')
+        self.assertEqual(response.data['role']['name'], 'Staff')
+
+    def test_role_change_revokes_tokens(self):
+        authorization = self._bearer(self.user)
+        self.assertEqual(self._get('/api/notifications/', authorization).status_code, 200)
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(
+            f'/api/users/manage/{self.user.id}/assign_role/', {'role_id': self.admin.role_id}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.client.force_authenticate(None)
+
+        self.assertEqual(self._get('/api/notifications/', authorization).status_code, 401)
+        self.assertEqual(self._get('/api/notifications/', self._bearer(self.user)).status_code, 200)
+
+    def test_password_change_and_deactivation_revoke_tokens(self):
+        authorization = self._bearer(self.user)
+        self.user.set_password('newpass12345')
+        self.user.save()
+        self.assertEqual(self._get('/api/notifications/', authorization).status_code, 401)
+
+        authorization = self._bearer(self.user)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self._get('/api/notifications/', authorization).status_code, 401)
+
+    def test_unrelated_saves_keep_tokens(self):
+        authorization = self._bearer(self.user)
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Amina'
+        user.save()
+        user.check_password('testpass123')
+        self.assertEqual(self._get('/api/notifications/', authorization).status_code, 200)
+
+    def test_tokens_without_claims_still_work(self):
+        authorization = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        self.assertEqual(self._get('/api/notifications/', authorization).status_code, 200)
@@ -0,0 +1,56 @@
+"""
+Per-user token versions, as seen by this process.
+
+Access tokens carry the user's `token_version` from the moment they were
+issued (see `EmailTokenObtainPairSerializer.get_token`). The version is
+bumped whenever the role, department, active flag or password of a user
+changes, which revokes every token issued before. `ClaimsJWTAuthentication`
+compares the claim with `current(user_id)` instead of loading the user.
+
+Versions are kept in a small LRU map for at most TOKEN_VERSION_TTL seconds,
+so a revocation made by another process is honoured within that window. The
+process that saves a user updates its own entry at once (via `apps.signals`).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+TOKEN_VERSION_TTL = 30
+MAX_ENTRIES = 10000
+
+_versions = OrderedDict()       # user id -> (version or None if unusable, loaded at)
+_lock = threading.Lock()
+
+
+def current(user_id):
+    """Token version of `user_id`, or None for unknown and inactive users."""
+    now = time.monotonic()
+    with _lock:
+        entry = _versions.get(user_id)
+        if entry is not None and now - entry[1] <= TOKEN_VERSION_TTL:
+            _versions.move_to_end(user_id)
+            return entry[0]
+
+    from django.contrib.auth import get_user_model
+    row = get_user_model().objects.filter(pk=user_id).values_list('token_version', 'is_active').first()
+    version = row[0] if row and row[1] else None
+    remember(user_id, version, now)
+    return version
+
+
+def remember(user_id, version, now=None):
+    with _lock:
+        _versions[user_id] = (version, time.monotonic() if now is None else now)
+        _versions.move_to_end(user_id)
+        while len(_versions) > MAX_ENTRIES:
+            _versions.popitem(last=False)
+
+
+def forget(user_id):
+    with _lock:
+        _versions.pop(user_id, None)
+
+
+def clear():
+    with _lock:
+        _versions.clear()
@@ -1,6 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import RegisterView, MeView, UserViewSet, RoleViewSet, DepartmentViewSet, upload_profile_picture
+from .views import (
+    MeView, UserViewSet, RoleViewSet, DepartmentViewSet, upload_profile_picture,
+    password_hashing_metrics,
+)
+from .views_auth import RegisterView
 from .test_views import test_login, list_users
 from .google_auth import google_auth
 
@@ -13,6 +17,7 @@ urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('me/', MeView.as_view(), name='me'),
     path('me/upload-profile-picture/', upload_profile_picture, name='upload_profile_picture'),
+    path('password-hashing/metrics/', password_hashing_metrics, name='password_hashing_metrics'),
     path('google-auth/', google_auth, name='google_auth'),
     path('test-login/', test_login, name='test_login'),
     path('list-users/', list_users, name='list_users'),
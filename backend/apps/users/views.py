@@ -3,29 +3,28 @@ from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.contrib.auth import get_user_model
+from apps.conditional import ConditionalListMixin
+from .principal import get_principal
 from .models import Role, Department
 from .serializers import (
-    RegisterSerializer, 
     UserSerializer, 
     RoleSerializer, 
     DepartmentSerializer,
     ProfilePictureSerializer
 )
+from . import hashing
 from .permissions import IsAdmin
 from .validators import FileValidator
 
 User = get_user_model()
 
-class RegisterView(generics.CreateAPIView):
-    serializer_class = RegisterSerializer
-    permission_classes = [permissions.AllowAny]
-
 class MeView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     def get_object(self):
-        return self.request.user
+        # request.user only carries the token's claims; the profile needs the whole row
+        return User.objects.select_related('role', 'department').get(pk=self.request.user.pk)
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     queryset = User.objects.all().select_related('role','department')
     serializer_class = UserSerializer
     
@@ -38,14 +37,20 @@ class UserViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         # Regular users can only see users in their department
-        user = self.request.user
-        if hasattr(user, 'role') and user.role and user.role.name == 'Admin':
+        principal = get_principal(self.request)
+        if principal.is_admin:
             return User.objects.all().select_related('role', 'department')
         # Regular users see only their department members
-        if hasattr(user, 'department') and user.department:
-            return User.objects.filter(department=user.department).select_related('role', 'department')
+        if principal.dept_id:
+            return User.objects.filter(department_id=principal.dept_id).select_related('role', 'department')
         return User.objects.none()
     
+    def get_watermark_sources(self):
+        principal = get_principal(self.request)
+        if principal.is_admin:
+            return [('users', 'all', User.objects.all(), 'updated_at')]
+        return [('users', principal.dept_id, User.objects.filter(department_id=principal.dept_id), 'updated_at')]
+
     @action(detail=True, methods=['post'])
     def assign_role(self, request, pk=None):
         user = self.get_object()
@@ -74,10 +79,12 @@ class RoleViewSet(viewsets.ModelViewSet):
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
     permission_classes = [IsAdmin]
+    pagination_class = None  # reference data, always listed whole
 
 class DepartmentViewSet(viewsets.ModelViewSet):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
+    pagination_class = None  # reference data, always listed whole
     
     def get_permissions(self):
         # Allow anyone to list/retrieve departments (for registration)
@@ -108,7 +115,7 @@ def upload_profile_picture(request):
         )
     
     # Update the user's profile picture
-    user = request.user
+    user = User.objects.get(pk=request.user.pk)
     serializer = ProfilePictureSerializer(user, data=request.data, partial=True)
     
     if serializer.is_valid():
@@ -119,3 +126,13 @@ def upload_profile_picture(request):
         )
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def password_hashing_metrics(request):
+    """
+    Password hashing pool of this process: size, queue depth, rejections and
+    recent latencies (queueing included).
+    """
+    return Response(hashing.metrics())
@@ -1,85 +1,75 @@
-import logging
-from django.conf import settings
-from django.contrib.auth import get_user_model
-from rest_framework import status
+from asgiref.sync import sync_to_async
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+from . import hashing
 from .authentication import EmailTokenObtainPairSerializer
+from .serializers import RegisterSerializer
 
-# Setup logger
-logger = logging.getLogger(__name__)
 
-class EmailTokenObtainPairView(TokenObtainPairView):
+class AsyncPostView(View):
     """
-    Custom token obtain view that authenticates users by email instead of username.
-    Includes detailed logging for debugging and error tracking.
+    A POST-only JSON view run as a coroutine, for the endpoints that hash a
+    password (see apps.users.hashing): under ASGI they await the hashing pool
+    instead of holding Django's thread for synchronous code. DRF views are
+    synchronous, so the body is parsed and errors are rendered here the way
+    DRF would; database work goes through sync_to_async.
     """
-    serializer_class = EmailTokenObtainPairSerializer
+    http_method_names = ['post', 'options']
+    serializer_class = None
+    www_authenticate = None
 
-    def post(self, request, *args, **kwargs):
-        logger.info("🔐 Login request received")
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
 
-        # Log the request content type and data
-        logger.debug(f"Request content type: {request.content_type}")
-        logger.debug(f"Raw request data: {request.data}")
+    async def post(self, request, *args, **kwargs):
+        request = Request(request, parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES])
+        try:
+            response = await self.handle(self.serializer_class(data=request.data, context={'request': request}))
+        except exceptions.APIException as exc:
+            if isinstance(exc, exceptions.AuthenticationFailed) and self.www_authenticate:
+                exc.auth_header = self.www_authenticate
+            response = exception_handler(exc, {'request': request, 'view': self})
+        response.accepted_renderer = JSONRenderer()
+        response.accepted_media_type = JSONRenderer.media_type
+        response.renderer_context = {'request': request, 'view': self}
+        return response.render()
 
-        # Handle both JSON and form-encoded requests
-        if request.content_type == 'application/x-www-form-urlencoded':
-            email = request.POST.get('email') or request.data.get('email')
-            password = request.POST.get('password') or request.data.get('password')
-        else:
-            email = request.data.get('email')
-            password = request.data.get('password')
+    async def handle(self, serializer):
+        raise NotImplementedError
 
-        logger.info(f"Login attempt for email: {email}")
 
-        # Validate that email and password were provided
-        if not email or not password:
-            logger.warning("Email or password not provided in request")
-            return Response(
-                {"detail": "Email and password are required"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+class EmailTokenObtainPairView(AsyncPostView):
+    """
+    Custom token obtain view that authenticates users by email instead of username.
+
+    The serializer does the whole login in one pass (one user lookup, one
+    password hash): a missing email or password is a 400, bad credentials or
+    an inactive account a 401. JSON and form-encoded bodies are both accepted.
+    """
+    serializer_class = EmailTokenObtainPairSerializer
+    www_authenticate = 'Bearer realm="api"'
 
-        User = get_user_model()
+    async def handle(self, serializer):
+        return Response(await serializer.alogin(), status=status.HTTP_200_OK)
 
-        try:
-            user = User.objects.get(email=email)
-            logger.debug(f"User found: {user.email}, active: {user.is_active}")
 
-            # Validate password
-            if not user.check_password(password):
-                logger.warning(f"Invalid password for user: {email}")
-                return Response(
-                    {"detail": "Invalid email or password"},
-                    status=status.HTTP_401_UNAUTHORIZED
-                )
+class RegisterView(AsyncPostView):
+    serializer_class = RegisterSerializer
 
-        except User.DoesNotExist:
-            logger.warning(f"No user found with email: {email}")
-            return Response(
-                {"detail": "Invalid email or password"},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-        except Exception as user_error:
-            logger.error(f"Unexpected error during user lookup: {user_error}", exc_info=True)
-            return Response(
-                {"detail": "Error during authentication process"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+    async def handle(self, serializer):
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        encoded = await hashing.amake_password(serializer.validated_data['password'])
 
-        # Try generating JWT token via SimpleJWT
-        try:
-            logger.info(f"Authenticating user {email} through SimpleJWT serializer...")
-            response = super().post(request, *args, **kwargs)
-            logger.info(f"✅ Authentication successful for user: {email}")
-            return response
+        def save():
+            serializer.save(password_hash=encoded)
+            return serializer.data
 
-        except Exception as e:
-            logger.error(f"JWT generation error for {email}: {e}", exc_info=True)
-            if getattr(settings, 'DEBUG', False):
-                raise
-            return Response(
-                {"detail": "An internal authentication error occurred"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        return Response(await sync_to_async(save)(), status=status.HTTP_201_CREATED)
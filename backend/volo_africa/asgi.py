@@ -1,14 +1,19 @@
 import os
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
-from django.urls import path
-from apps.notifications.consumers import NotificationConsumer
+from django.urls import path, re_path
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'volo_africa.settings')
 django_asgi_app = get_asgi_application()
 
+# The consumers use the models, so they are imported once Django is set up
+from apps.notifications.consumers import NotificationConsumer, UnreadCountConsumer  # noqa: E402
+
 application = ProtocolTypeRouter({
-    "http": django_asgi_app,
+    "http": URLRouter([
+        path("api/notifications/unread-count/watch/", UnreadCountConsumer.as_asgi()),
+        re_path(r"", django_asgi_app),
+    ]),
     "websocket": URLRouter([
         path("ws/notifications/", NotificationConsumer.as_asgi()),
     ]),
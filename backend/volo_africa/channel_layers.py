@@ -0,0 +1,342 @@
+"""
+A channel layer for several ASGI worker processes on one host, without a broker.
+
+`InMemoryChannelLayer` only reaches the sockets of its own process. This
+layer keeps messages and group memberships in a SQLite database (WAL mode)
+opened by every process, so a `group_send` from any of them, a worker or a
+management command, reaches the sockets held by all of them.
+
+- Each message is a row with an expiry time. A channel holding `capacity`
+  unexpired messages is full: `send` raises ChannelFull, `group_send` skips it.
+- Expired messages are swept, and the channels they were meant for leave
+  their groups, since nobody is reading them (e.g. their worker died).
+- Group memberships expire after `group_expiry` seconds.
+
+A process names its channels `<prefix>.<process id>!<random>` and takes the
+messages of all of them with one indexed query. Senders wake the receiving
+process through a Unix datagram socket named after its id, so delivery does
+not wait for the next poll; without Unix sockets, or if a wakeup is lost,
+receivers poll every `poll_interval` seconds.
+
+Messages are pickled: the database and socket directory must only be
+writable by the server's user.
+"""
+import asyncio
+import atexit
+import logging
+import os
+import pickle
+import socket
+import sqlite3
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channel_messages (
+    id INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    expires REAL NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS channel_messages_owner ON channel_messages (owner, expires);
+CREATE TABLE IF NOT EXISTS channel_groups (
+    name TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    joined REAL NOT NULL,
+    PRIMARY KEY (name, channel)
+);
+CREATE INDEX IF NOT EXISTS channel_groups_channel ON channel_groups (channel);
+"""
+# Older SQLite builds allow 999 parameters per statement
+MAX_PARAMS = 900
+SWEEP_INTERVAL = 5.0
+
+
+@contextmanager
+def _immediate(db):
+    """A write transaction, taking the database lock up front."""
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        yield
+    except BaseException:
+        db.execute('ROLLBACK')
+        raise
+    db.execute('COMMIT')
+
+
+def _chunks(items, size=MAX_PARAMS):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class _Listener:
+    """The receiving side of a layer in one event loop: buffered messages per channel."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queues = {}
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.sock = None
+
+
+class SQLiteChannelLayer(BaseChannelLayer):
+    extensions = ['groups', 'flush']
+
+    def __init__(
+        self, path=None, expiry=60, group_expiry=86400, capacity=100, channel_capacity=None,
+        poll_interval=0.5, socket_dir=None, **kwargs,
+    ):
+        super().__init__(expiry=expiry, capacity=capacity, **kwargs)
+        self.channel_capacity = self.compile_capacities(channel_capacity or {})
+        self.path = str(path or os.path.join(tempfile.gettempdir(), 'channels.sqlite3'))
+        self.group_expiry = group_expiry
+        self.poll_interval = poll_interval
+        self.socket_dir = str(socket_dir or tempfile.gettempdir())
+        self.client_id = uuid.uuid4().hex[:12]
+        # One thread owns the connection; database calls never block the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='channel-layer')
+        self._db = None
+        self._listener = None
+        self._waker = None
+        self._last_sweep = 0.0
+
+    # Channel layer API
+
+    async def send(self, channel, message):
+        assert isinstance(message, dict), 'message is not a dict'
+        assert self.valid_channel_name(channel), 'Channel name not valid'
+        assert '__asgi_channel__' not in message
+        if not await self._call(self._send, channel, pickle.dumps(message)):
+            raise ChannelFull(channel)
+        self._wake([channel])
+
+    async def receive(self, channel):
+        assert self.valid_channel_name(channel), 'Channel name not valid'
+        listener = self._get_listener()
+        queue = listener.queues.get(channel)
+        if queue is None:
+            # A new channel: fetch for it now rather than at the next poll
+            queue = listener.queues[channel] = asyncio.Queue()
+            listener.wakeup.set()
+        if listener.task is None or listener.task.done():
+            listener.task = asyncio.create_task(self._pump(listener))
+        try:
+            while True:
+                expires, message = await queue.get()
+                if expires >= time.time():
+                    return message
+        except asyncio.CancelledError:
+            # The consumer has gone: stop fetching for its channel
+            listener.queues.pop(channel, None)
+            raise
+
+    async def new_channel(self, prefix='specific'):
+        return f'{prefix}.{self.client_id}!{uuid.uuid4().hex}'
+
+    async def group_add(self, group, channel):
+        assert self.valid_group_name(group), 'Group name not valid'
+        assert self.valid_channel_name(channel), 'Channel name not valid'
+        await self._call(
+            self._execute, 'INSERT OR REPLACE INTO channel_groups (name, channel, joined) VALUES (?, ?, ?)',
+            (group, channel, time.time()),
+        )
+
+    async def group_discard(self, group, channel):
+        assert self.valid_group_name(group), 'Group name not valid'
+        assert self.valid_channel_name(channel), 'Channel name not valid'
+        await self._call(self._execute, 'DELETE FROM channel_groups WHERE name = ? AND channel = ?', (group, channel))
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), 'Message is not a dict'
+        assert self.valid_group_name(group), 'Group name not valid'
+        self._wake(await self._call(self._group_send, group, pickle.dumps(message)))
+
+    async def flush(self):
+        await self._call(self._flush)
+
+    # Database side, run on the layer's thread
+
+    def _connection(self):
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.executescript(SCHEMA)
+            self._db = db
+        return self._db
+
+    async def _call(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def _execute(self, sql, params):
+        self._connection().execute(sql, params)
+
+    def _send(self, channel, body):
+        db = self._connection()
+        with _immediate(db):
+            return self._insert(db, [channel], body)
+
+    def _group_send(self, group, body):
+        db = self._connection()
+        with _immediate(db):
+            channels = [
+                row[0] for row in db.execute(
+                    'SELECT channel FROM channel_groups WHERE name = ? AND joined >= ?',
+                    (group, time.time() - self.group_expiry),
+                )
+            ]
+            return self._insert(db, channels, body)
+
+    def _insert(self, db, channels, body):
+        """Add `body` for each of `channels` that is not full; returns the channels it was added for."""
+        now = time.time()
+        # Count through the owners' (normally short) backlogs, not per channel:
+        # the cost follows what is still unread, not the size of the group
+        owners = sorted({self.non_local_name(channel) for channel in channels})
+        smallest = min([self.capacity, *(capacity for _, capacity in self.channel_capacity)])
+        full = set()
+        for chunk in _chunks(owners):
+            rows = db.execute(
+                f"SELECT channel, COUNT(*) FROM channel_messages WHERE owner IN ({','.join('?' * len(chunk))}) "
+                f"AND expires >= ? GROUP BY channel HAVING COUNT(*) >= ?",
+                [*chunk, now, smallest],
+            )
+            full.update(channel for channel, queued in rows if queued >= self.get_capacity(channel))
+        accepted = [channel for channel in channels if channel not in full]
+        db.executemany(
+            'INSERT INTO channel_messages (owner, channel, expires, body) VALUES (?, ?, ?, ?)',
+            [(self.non_local_name(channel), channel, now + self.expiry, body) for channel in accepted],
+        )
+        return accepted
+
+    def _take(self, owners):
+        """Remove and return the unexpired messages of `owners`, oldest first."""
+        db = self._connection()
+        now = time.time()
+        where = f"owner IN ({','.join('?' * len(owners))}) AND expires >= ?"
+        # Cheap check first, so idle polls never take the write lock
+        if db.execute(f'SELECT 1 FROM channel_messages WHERE {where} LIMIT 1', [*owners, now]).fetchone() is None:
+            return []
+        with _immediate(db):
+            rows = db.execute(
+                f'SELECT channel, expires, body FROM channel_messages WHERE {where} ORDER BY id', [*owners, now]
+            ).fetchall()
+            db.execute(f'DELETE FROM channel_messages WHERE {where}', [*owners, now])
+        return rows
+
+    def _sweep(self):
+        db = self._connection()
+        now = time.time()
+        with _immediate(db):
+            dead = [row[0] for row in db.execute('SELECT DISTINCT channel FROM channel_messages WHERE expires < ?', (now,))]
+            for chunk in _chunks(dead):
+                db.execute(f"DELETE FROM channel_groups WHERE channel IN ({','.join('?' * len(chunk))})", chunk)
+            db.execute('DELETE FROM channel_messages WHERE expires < ?', (now,))
+            db.execute('DELETE FROM channel_groups WHERE joined < ?', (now - self.group_expiry,))
+
+    def _flush(self):
+        db = self._connection()
+        with _immediate(db):
+            db.execute('DELETE FROM channel_messages')
+            db.execute('DELETE FROM channel_groups')
+
+    # Receiving side
+
+    def _get_listener(self):
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.loop is not loop:
+            if self._listener is not None and self._listener.sock is not None:
+                self._listener.sock.close()
+            self._listener = _Listener(loop)
+            self._bind(self._listener)
+        return self._listener
+
+    async def _pump(self, listener):
+        """Fetch messages for the listening channels until none are left."""
+        while listener.queues:
+            listener.wakeup.clear()
+            owners = sorted({self.non_local_name(channel) for channel in listener.queues})
+            rows = []
+            try:
+                for chunk in _chunks(owners):
+                    rows += await self._call(self._take, chunk)
+                if time.monotonic() - self._last_sweep >= SWEEP_INTERVAL:
+                    self._last_sweep = time.monotonic()
+                    await self._call(self._sweep)
+            except sqlite3.Error:
+                logger.exception("Could not fetch channel layer messages")
+            for channel, expires, body in rows:
+                queue = listener.queues.get(channel)
+                if queue is not None:
+                    queue.put_nowait((expires, pickle.loads(body)))
+            if not rows:
+                try:
+                    await asyncio.wait_for(listener.wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    # Wakeups
+
+    def _socket_path(self, client_id):
+        return os.path.join(self.socket_dir, f'channels-{client_id}.sock')
+
+    def _bind(self, listener):
+        if not hasattr(socket, 'AF_UNIX'):
+            return
+        path = self._socket_path(self.client_id)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            sock.setblocking(False)
+            if os.path.exists(path):
+                os.unlink(path)
+            sock.bind(path)
+            listener.loop.add_reader(sock.fileno(), self._on_wakeup, sock, listener)
+        except (OSError, NotImplementedError):
+            # Polling only
+            sock.close()
+            return
+        listener.sock = sock
+        atexit.register(self._unlink, path)
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _on_wakeup(sock, listener):
+        try:
+            while True:
+                sock.recv(16)
+        except OSError:
+            pass
+        listener.wakeup.set()
+
+    def _wake(self, channels):
+        """Tell the processes owning `channels` to fetch now."""
+        if not hasattr(socket, 'AF_UNIX'):
+            return
+        client_ids = {channel.split('!', 1)[0].rsplit('.', 1)[-1] for channel in channels if '!' in channel}
+        if not client_ids:
+            return
+        if self._waker is None:
+            self._waker = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._waker.setblocking(False)
+        for client_id in client_ids:
+            try:
+                self._waker.sendto(b'1', self._socket_path(client_id))
+            except OSError:
+                # No such process any more, or its wakeups are already pending
+                pass
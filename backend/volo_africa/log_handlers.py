@@ -0,0 +1,83 @@
+"""
+Logging plumbing used by `settings.LOGGING`.
+
+`QueueingHandler` puts records on a bounded in-memory queue and returns; a
+`QueueListener` thread formats them and writes them to the real handlers
+(console, file), so request threads never wait on file or terminal I/O.
+When the queue is full records are dropped and counted rather than blocking.
+
+`SamplingFilter` keeps only one in N records below WARNING for chosen logger
+prefixes (e.g. `django.db.backends`), so a chatty logger can stay switched
+on without logging every call. Warnings and errors are always kept.
+"""
+import atexit
+import itertools
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueueingHandler(QueueHandler):
+    """
+    Hand records to a background listener that writes them to `handlers`.
+
+    In dictConfig, pass the targets as `cfg://handlers.<name>`; they must be
+    configured before this handler, i.e. their names must sort before its own.
+    """
+
+    def __init__(self, handlers, maxsize=10000):
+        # dictConfig only resolves cfg:// items of a list on indexing, not iteration
+        handlers = [handlers[i] for i in range(len(handlers))]
+        for handler in handlers:
+            if not isinstance(handler, logging.Handler):
+                raise ValueError(f'{handler!r} is not a configured handler')
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.stop_listener)
+
+    def prepare(self, record):
+        # Merge the message here, where its arguments are still current, but leave
+        # formatting (timestamps, tracebacks) to the listener thread
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop_listener(self):
+        """Write out everything queued so far and stop the listener thread."""
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def close(self):
+        self.stop_listener()
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep one in `every[prefix]` records below WARNING from loggers named
+    `prefix` or `prefix.*`; other loggers pass unsampled.
+    """
+
+    def __init__(self, every=None):
+        super().__init__()
+        # Longest prefix first, so the most specific rate wins
+        self.every = sorted((every or {}).items(), key=lambda item: -len(item[0]))
+        self._counters = {}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        for prefix, every in self.every:
+            if record.name == prefix or record.name.startswith(prefix + '.'):
+                counter = self._counters.setdefault(prefix, itertools.count())
+                return next(counter) % every == 0
+        return True
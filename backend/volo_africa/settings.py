@@ -28,6 +28,7 @@ INSTALLED_APPS = [
     'apps.messaging',
     'apps.notifications',
     'apps.adminpanel',
+    'apps.appsconfig.AppsConfig',  # connects the receivers in apps/signals.py
 ]
 
 AUTH_USER_MODEL = 'users.User'
@@ -77,6 +78,8 @@ CORS_ALLOWED_ORIGINS = [
     'http://localhost:3000',  # Common React dev server port
     'http://127.0.0.1:3000',
 ]
+# Keyset pagination sends next/previous page URLs in the Link header
+CORS_EXPOSE_HEADERS = ['Link']
 
 # CSRF settings
 CSRF_TRUSTED_ORIGINS = [
@@ -127,11 +130,13 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_PAGINATION_CLASS': 'apps.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', '100')),
 }
 
 SIMPLE_JWT = {
@@ -140,13 +145,73 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer"
+# Buffered audit log writes (see apps.adminpanel.audit); a buffer size of 0 writes synchronously
+AUDIT_LOG_BUFFER_SIZE = int(os.getenv('AUDIT_LOG_BUFFER_SIZE', '5000'))
+AUDIT_LOG_BATCH_SIZE = 500
+AUDIT_LOG_FLUSH_INTERVAL = 2.0
+# Raw audit rows older than this are rolled up and removed (manage.py prune_audit_logs)
+AUDIT_LOG_RETENTION_DAYS = int(os.getenv('AUDIT_LOG_RETENTION_DAYS', '90'))
+# Default window of GET /api/adminpanel/logs/, which reads only the recent partitions
+AUDIT_LOG_RECENT_DAYS = 31
+
+# Password hashing pool (see apps.users.hashing); 0 workers hashes inline
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', '16'))
+PASSWORD_HASH_TIMEOUT = 10
+PASSWORD_HASH_RETRY_AFTER = 1
+
+# Held unread-count requests (apps.notifications.consumers.UnreadCountConsumer)
+NOTIFICATION_WAIT_TIMEOUT = 25
+NOTIFICATION_STREAM_MAX_AGE = 300
+
+# Conditional GET watermarks (apps.conditional) are cached, and invalidated on
+# writes, through the default cache. The local-memory cache is per process:
+# with several workers set CACHE=database (after `manage.py createcachetable`)
+# so a write in one worker invalidates the watermarks of all of them (each
+# cache lookup is then a query on the cache table).
+if os.getenv('CACHE', 'memory') == 'database':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': os.getenv('CACHE_TABLE', 'django_cache'),
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# The in-memory layer only reaches sockets of its own process. With several
+# ASGI workers on one host, set CHANNEL_LAYER=sqlite: messages then go through
+# a SQLite file shared by the workers (volo_africa.channel_layers).
+if os.getenv('CHANNEL_LAYER', 'memory') == 'sqlite':
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "volo_africa.channel_layers.SQLiteChannelLayer",
+            "CONFIG": {
+                "path": os.getenv('CHANNEL_LAYER_PATH', str(BASE_DIR / 'channels.sqlite3')),
+                "capacity": int(os.getenv('CHANNEL_LAYER_CAPACITY', '100')),
+                "expiry": 60,
+            },
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels.layers.InMemoryChannelLayer"
+        }
     }
-}
 
 # Logging configuration
+# Records go through a queue to a background writer (volo_africa.log_handlers).
+# LOG_PROFILE=production logs INFO and above with SQL logging off; the
+# development profile (the default with DEBUG) keeps DEBUG logs and samples SQL.
+LOG_PROFILE = os.getenv('LOG_PROFILE', 'development' if DEBUG else 'production')
+_production_logging = LOG_PROFILE == 'production'
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -156,6 +221,13 @@ LOGGING = {
             'style': '{',
         },
     },
+    'filters': {
+        'sampling': {
+            '()': 'volo_africa.log_handlers.SamplingFilter',
+            # Keep 1 in N records below WARNING
+            'every': {'django.db.backends': int(os.getenv('LOG_SQL_SAMPLE_EVERY', '20'))},
+        },
+    },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
@@ -166,27 +238,37 @@ LOGGING = {
             'class': 'logging.FileHandler',
             'filename': 'debug.log',
             'formatter': 'verbose',
+            'delay': True,
+        },
+        # Named to sort after its targets, which dictConfig must build first
+        'queue': {
+            '()': 'volo_africa.log_handlers.QueueingHandler',
+            'handlers': ['cfg://handlers.console'] if _production_logging
+                        else ['cfg://handlers.console', 'cfg://handlers.file'],
+            'filters': ['sampling'],
         },
     },
     'loggers': {
         'django': {
-            'handlers': ['console', 'file'],
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': True,
         },
-        'apps.users': {
-            'handlers': ['console', 'file'],
-            'level': 'DEBUG',
+        'apps': {
+            'handlers': ['queue'],
+            'level': 'INFO' if _production_logging else 'DEBUG',
             'propagate': False,
         },
         'django.request': {
-            'handlers': ['console', 'file'],
-            'level': 'DEBUG',
+            'handlers': ['queue'],
+            'level': 'WARNING' if _production_logging else 'DEBUG',
             'propagate': False,
         },
         'django.db.backends': {
-            'level': 'DEBUG',
-            'handlers': ['console', 'file'],
+            # Only emits at all with DEBUG=True; never in production
+            'handlers': ['queue'],
+            'level': 'WARNING' if _production_logging else 'DEBUG',
+            'propagate': False,
         },
     },
 }
@@ -3,7 +3,7 @@ import { useAuth } from '../context/AuthContext';
 import { BsList, BsBell, BsSearch, BsChatSquareText, BsSun, BsMoon, BsCamera } from 'react-icons/bs';
 import { useTheme } from '../context/ThemeContext';
 import { useNavigate } from 'react-router-dom';
-import api from '../services/api';
+import api, { getAll } from '../services/api';
 
 const API_BASE_URL = 'http://localhost:8000'; // Update this with your backend URL
 
@@ -88,9 +88,9 @@ export default function Topbar({ onMenuToggle }) {
     try {
       // Search across tasks, messages, and users
       const [tasksRes, messagesRes, usersRes] = await Promise.all([
-        api.get('/tasks/').catch(() => ({ data: [] })),
+        getAll('/tasks/').catch(() => ({ data: [] })),
         api.get('/messaging/department/').catch(() => ({ data: [] })),
-        api.get('/users/manage/').catch(() => ({ data: [] }))
+        getAll('/users/manage/').catch(() => ({ data: [] }))
       ]);
       
       const tasks = tasksRes.data || [];
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../../context/AuthContext';
-import api from '../../services/api';
+import api, { getAll } from '../../services/api';
 import { 
   BsBuilding, BsPencil, BsTrash, BsPlus, BsCheckLg, BsXLg, 
   BsShieldLock, BsPeople, BsPersonPlus, BsPersonX 
@@ -27,7 +27,7 @@ export default function DepartmentManagement() {
         setLoading(true);
         const [deptsRes, usersRes] = await Promise.all([
           api.get('/departments/'),
-          api.get('/users/')
+          getAll('/users/')
         ]);
         
         setDepartments(deptsRes.data);
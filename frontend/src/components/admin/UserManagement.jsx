@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../../context/AuthContext';
-import api from '../../services/api';
+import api, { getAll } from '../../services/api';
 import { 
   BsPersonPlus, BsPencil, BsTrash, BsCheckLg, BsXLg, 
   BsShieldLock, BsBuilding, BsPeople, BsPersonCheck 
@@ -24,7 +24,7 @@ export default function UserManagement() {
       try {
         setLoading(true);
         const [usersRes, deptsRes] = await Promise.all([
-          api.get('/users/'),
+          getAll('/users/'),
           api.get('/departments/')
         ]);
         
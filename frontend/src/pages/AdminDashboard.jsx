@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../context/AuthContext';
 import { useTheme } from '../context/ThemeContext';
-import api from '../services/api';
+import api, { getAll } from '../services/api';
 
 export default function AdminDashboard() {
   const { user } = useAuth();
@@ -38,11 +38,11 @@ export default function AdminDashboard() {
     try {
       const [usersRes, tasksRes, messagesRes] = await Promise.all([
         selectedDepartment === 'all' 
-          ? api.get('/users/').catch(() => ({ data: [] }))
-          : api.get(`/users/?department=${selectedDepartment}`).catch(() => ({ data: [] })),
+          ? getAll('/users/').catch(() => ({ data: [] }))
+          : getAll(`/users/?department=${selectedDepartment}`).catch(() => ({ data: [] })),
         selectedDepartment === 'all'
-          ? api.get('/tasks/').catch(() => ({ data: [] }))
-          : api.get(`/tasks/?department=${selectedDepartment}`).catch(() => ({ data: [] })),
+          ? getAll('/tasks/').catch(() => ({ data: [] }))
+          : getAll(`/tasks/?department=${selectedDepartment}`).catch(() => ({ data: [] })),
         selectedDepartment === 'all'
           ? api.get('/messaging/department/').catch(() => ({ data: [] }))
           : api.get(`/messaging/department/?department=${selectedDepartment}`).catch(() => ({ data: [] }))
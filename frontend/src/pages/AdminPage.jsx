@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import { BsPeople, BsBuilding, BsShieldCheck, BsClipboardData, BsPencil, BsTrash, BsChatDots } from 'react-icons/bs';
-import api from '../services/api';
+import api, { getAll } from '../services/api';
 
 export default function AdminPage() {
   const [activeTab, setActiveTab] = useState('users');
@@ -23,7 +23,7 @@ export default function AdminPage() {
   const loadData = async () => {
     try {
       const [usersRes, deptsRes, rolesRes, logsRes] = await Promise.all([
-        api.get('/users/manage/').catch(() => ({ data: [] })),
+        getAll('/users/manage/').catch(() => ({ data: [] })),
         api.get('/departments/').catch(() => ({ data: [] })),
         api.get('/users/roles/').catch(() => ({ data: [] })),
         api.get('/adminpanel/logs/').catch(() => ({ data: [] }))
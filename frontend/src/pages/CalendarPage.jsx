@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { format, startOfMonth, endOfMonth, startOfWeek, endOfWeek, addDays, isSameMonth, isSameDay, isToday, parseISO } from 'date-fns';
 import { BsChevronLeft, BsChevronRight, BsCalendarPlus, BsCircleFill } from 'react-icons/bs';
-import api from '../services/api';
+import { getAll } from '../services/api';
 
 export default function CalendarPage() {
   const [currentMonth, setCurrentMonth] = useState(new Date());
@@ -15,7 +15,7 @@ export default function CalendarPage() {
 
   const loadTasks = async () => {
     try {
-      const response = await api.get('/tasks/');
+      const response = await getAll('/tasks/');
       setTasks(response.data);
     } catch (error) {
       console.error('Error loading tasks:', error);
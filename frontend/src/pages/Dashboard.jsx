@@ -3,7 +3,7 @@ import { useNavigate } from 'react-router-dom';
 import { format } from 'date-fns';
 import { BsClipboardCheck, BsClockHistory, BsChatDots } from 'react-icons/bs';
 import StatCard from '../components/StatCard';
-import api from '../services/api';
+import api, { getAll } from '../services/api';
 import { useAuth } from '../context/AuthContext';
 
 export default function Dashboard() {
@@ -19,7 +19,7 @@ export default function Dashboard() {
       try {
         setLoading(true);
         const [tasksRes, messagesRes] = await Promise.all([
-          api.get('/tasks/').catch(err => {
+          getAll('/tasks/').catch(err => {
             console.error('Error loading tasks:', err);
             return { data: [] };
           }),
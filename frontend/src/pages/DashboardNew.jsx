@@ -18,11 +18,15 @@ export default function Dashboard() {
     const fetchDashboardData = async () => {
       try {
         setLoading(true);
-        const [tasksRes, messagesRes] = await Promise.all([
-          api.get('/tasks/').catch(err => {
+        const [tasksRes, taskStatsRes, messagesRes] = await Promise.all([
+          api.get('/tasks/', { params: { page_size: 5 } }).catch(err => {
             console.error('Error loading tasks:', err);
             return { data: [] };
           }),
+          api.get('/tasks/stats/').catch(err => {
+            console.error('Error loading task stats:', err);
+            return { data: null };
+          }),
           api.get('/messaging/department/').catch(err => {
             console.error('Error loading messages:', err);
             return { data: [] };
@@ -30,11 +34,12 @@ export default function Dashboard() {
         ]);
 
         const tasks = tasksRes.data || [];
+        const taskStats = taskStatsRes.data;
         const messages = messagesRes.data || [];
 
         setStats({
-          tasks: tasks.length,
-          pending: tasks.filter(x => x.status === 'pending').length,
+          tasks: taskStats ? taskStats.total : tasks.length,
+          pending: taskStats ? taskStats.by_status.pending : tasks.filter(x => x.status === 'pending').length,
           messages: messages.length
         });
 
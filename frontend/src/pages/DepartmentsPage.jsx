@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../context/AuthContext';
-import api from '../services/api';
+import api, { getAll } from '../services/api';
 import { BsBuilding, BsPeople, BsClipboardCheck, BsChatDots } from 'react-icons/bs';
 import { useNavigate } from 'react-router-dom';
 
@@ -49,19 +49,19 @@ export default function DepartmentsPage() {
       // Load members - try multiple endpoints
       let members = [];
       try {
-        const usersRes = await api.get('/users/manage/');
+        const usersRes = await getAll('/users/manage/');
         members = usersRes.data.filter(u => u.department?.id === deptId);
       } catch (err) {
         console.log('Trying alternative user endpoint...');
         // Try alternative endpoint if manage fails
-        const usersRes = await api.get('/users/');
+        const usersRes = await getAll('/users/');
         members = usersRes.data.filter(u => u.department?.id === deptId);
       }
       setDeptMembers(members);
       console.log(`Loaded ${members.length} members for department ${deptId}`);
       
       // Load tasks
-      const tasksRes = await api.get('/tasks/').catch(() => ({ data: [] }));
+      const tasksRes = await getAll('/tasks/').catch(() => ({ data: [] }));
       const tasks = tasksRes.data.filter(t => t.department?.id === deptId || t.assigned_department?.id === deptId);
       setDeptTasks(tasks);
     } catch (error) {
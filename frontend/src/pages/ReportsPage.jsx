@@ -17,7 +17,7 @@ import { format, subDays, startOfWeek, endOfWeek, isWithinInterval } from 'date-
 import jsPDF from 'jspdf';
 import 'jspdf-autotable';
 import { Document, Packer, Paragraph, Table, TableCell, TableRow, TextRun, WidthType, AlignmentType, HeadingLevel } from 'docx';
-import api from '../services/api';
+import api, { getAll } from '../services/api';
 import { useAuth } from '../context/AuthContext';
 
 export default function ReportsPage() {
@@ -37,8 +37,8 @@ export default function ReportsPage() {
   const loadData = async () => {
     try {
       const [tasksRes, usersRes, deptRes] = await Promise.all([
-        api.get('/tasks/'),
-        api.get('/users/manage/').catch(() => ({ data: [] })),
+        getAll('/tasks/'),
+        getAll('/users/manage/').catch(() => ({ data: [] })),
         api.get('/departments/').catch(() => ({ data: [] })),
       ]);
       
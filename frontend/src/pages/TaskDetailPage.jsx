@@ -3,7 +3,7 @@ import { useParams, useNavigate, Link } from 'react-router-dom';
 import { format, parseISO } from 'date-fns';
 import { BsArrowLeft, BsPencil, BsSave, BsTrash, BsPerson, BsCalendarDate, BsTag, 
   BsChatSquareText, BsCheckCircle, BsXCircle, BsClock } from 'react-icons/bs';
-import api from '../services/api';
+import api, { getAll } from '../services/api';
 import { useAuth } from '../context/AuthContext';
 
 const statusOptions = [
@@ -47,7 +47,7 @@ export default function TaskDetailPage() {
         setLoading(true);
         const [taskRes, usersRes] = await Promise.all([
           api.get(`/tasks/${taskId}/`),
-          api.get('/users/manage/').catch(() => ({ data: [] })),
+          getAll('/users/manage/').catch(() => ({ data: [] })),
         ]);
         
         setTask(taskRes.data);
@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { BsPlusLg, BsThreeDotsVertical } from 'react-icons/bs';
 import { useAuth } from '../context/AuthContext';
-import api from '../services/api';
+import api, { getAll } from '../services/api';
 import CreateTaskModal from '../components/CreateTaskModal';
 
 export default function TasksPage() {
@@ -27,8 +27,8 @@ export default function TasksPage() {
       setError(null);
       
       const [tasksRes, usersRes, deptRes] = await Promise.all([
-        api.get('/tasks/').catch(() => ({ data: [] })),
-        api.get('/users/manage/').catch(() => ({ data: [] })),
+        getAll('/tasks/').catch(() => ({ data: [] })),
+        getAll('/users/manage/').catch(() => ({ data: [] })),
         api.get('/departments/').catch(() => ({ data: [] }))
       ]);
       
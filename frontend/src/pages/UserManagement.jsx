@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import api from '../services/api';
+import api, { getAll } from '../services/api';
 
 export default function UserManagement() {
   const [users, setUsers] = useState([]);
@@ -15,7 +15,7 @@ export default function UserManagement() {
   const fetchData = async () => {
     try {
       const [usersRes, rolesRes, deptsRes] = await Promise.all([
-        api.get('/users/manage/'),
+        getAll('/users/manage/'),
         api.get('/users/roles/'),
         api.get('/users/departments/')
       ]);
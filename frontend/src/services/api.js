@@ -118,4 +118,29 @@ api.interceptors.response.use(
   }
 );
 
+// List endpoints are cursor paginated: the URL of the next page comes in the
+// Link header (rel="next") and is absent on the last page
+const nextPageUrl = (response) => {
+  const match = /<([^>]+)>;\s*rel="next"/.exec(response.headers?.link || '');
+  return match ? match[1] : null;
+};
+
+// GET every page of a list endpoint; resolves like api.get, with the rows of
+// all pages in `data`
+export const getAll = async (url, config = {}) => {
+  const first = await api.get(url, config);
+  if (!Array.isArray(first.data)) {
+    return first;
+  }
+  const data = [...first.data];
+  let next = nextPageUrl(first);
+  while (next) {
+    // The next URL already carries the query string of the first request
+    const page = await api.get(next, { ...config, params: undefined });
+    data.push(...page.data);
+    next = nextPageUrl(page);
+  }
+  return { ...first, data };
+};
+
 export default api;